@@ -13,6 +13,12 @@
 2. python -m spacy download en_core_web_sm
 3. export OPENAI_API_KEY="your-api-key"
 4. python scripts/add_lemma_metadata.py
+
+原形・品詞は passage-parses（UD依存解析）のトークンを文字オフセットで
+セグメントに結合して再利用します（parse_join、upos / xpos も追加）。
+解析結果のないセグメントだけ、全ファイルの単語を先に集めて重複を除き、
+lemma_cache で一括処理します（spaCy の nlp.pipe でまとめて原形化。
+結果は tools/data/lemma_cache.json に保存され、次回以降は spaCy を呼びません）。
 """
 
 import json
@@ -22,9 +28,11 @@ from pathlib import Path
 from typing import Dict, List, Optional
 import re
 
-try:
-    import spacy
-except ImportError:
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lemma_cache import HAS_SPACY, LemmaCache, load_spacy  # noqa: E402
+from parse_join import ParseToken, join_passage, load_parse_for  # noqa: E402
+
+if not HAS_SPACY:
     print("Error: spaCy not installed. Run: pip install spacy")
     print("Then: python -m spacy download en_core_web_sm")
     sys.exit(1)
@@ -35,9 +43,9 @@ except ImportError:
     print("Error: OpenAI library not installed. Run: pip install openai")
     sys.exit(1)
 
-# spaCyモデルロード
+# spaCyモデルロード（原形化に不要な parser / ner などは無効化）
 try:
-    nlp = spacy.load("en_core_web_sm")
+    nlp = load_spacy()
 except OSError:
     print("Error: spaCy English model not found. Run: python -m spacy download en_core_web_sm")
     sys.exit(1)
@@ -51,18 +59,61 @@ if not api_key:
 else:
     client = OpenAI(api_key=api_key)
 
+# 単語 → 原形（passage-parses・spaCy の結果を永続キャッシュ）
+lemma_cache = LemmaCache.load()
+_lemmas: Dict[str, str] = {}
+
+def prepare_lemmas(words: List[str]):
+    """単語をまとめて原形化（未登録語だけを nlp.pipe で一括処理）"""
+    _lemmas.update(lemma_cache.lemmatize(words, nlp))
+
 def get_lemma(word: str) -> str:
-    """spaCyを使って英単語の原形を取得"""
+    """英単語の原形を取得（prepare_lemmas 済みならキャッシュから）"""
     # 記号や数字はそのまま返す
     if not word.isalpha():
         return word
     
-    doc = nlp(word.lower())
-    if len(doc) > 0:
-        return doc[0].lemma_
-    return word.lower()
+    if word not in _lemmas:
+        prepare_lemmas([word])
+    return _lemmas[word]
+
+def parse_lemma(token: ParseToken) -> str:
+    """UD解析トークンの原形（固有名詞以外は小文字）"""
+    return token.lemma if token.upos == 'PROPN' else token.lemma.lower()
+
+def join_parse_tokens(passages: List[dict], file_path: Path) -> Dict[int, ParseToken]:
+    """passage-parses のトークンをセグメントに結合（id(segment) → トークン）"""
+    joined = {}
+    for passage in passages:
+        index = load_parse_for(passage.get('id') or file_path.stem)
+        if index is None:
+            continue
+        for phrase, tokens in zip(passage.get('phrases', []), join_passage(passage, index)):
+            for segment, token in zip(phrase.get('segments', []), tokens):
+                if token is not None:
+                    joined[id(segment)] = token
+    return joined
+
+def collect_words(passages: List[dict], joined: Optional[Dict[int, ParseToken]] = None) -> List[str]:
+    """パッセージ内のセグメントの単語を収集（英字のみ、重複なし。joined に含まれるセグメントは除外）"""
+    words = set()
+    for passage in passages:
+        for phrase in passage.get('phrases', []):
+            for segment in phrase.get('segments', []):
+                if joined and id(segment) in joined:
+                    continue
+                word = segment.get('word', '')
+                if word and word.isalpha():  # アルファベットのみ
+                    words.add(word)
+    return sorted(words)
 
-def estimate_difficulty(word: str) -> str:
+def load_passages(file_path: Path) -> List[dict]:
+    """passage JSONを読み込み（単一パッセージ・リストのどちらも可）"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return [data] if isinstance(data, dict) else data
+
+def estimate_difficulty(word: str, lemma: Optional[str] = None) -> str:
     """単語の難易度を推定（簡易版）"""
     # 基本単語リスト（中学レベル）
     beginner_words = {
@@ -73,7 +124,8 @@ def estimate_difficulty(word: str) -> str:
         'time', 'year', 'day', 'thing', 'man', 'world', 'life', 'hand', 'part'
     }
     
-    lemma = get_lemma(word)
+    if lemma is None:
+        lemma = get_lemma(word)
     
     # 中学レベルの基本語
     if lemma in beginner_words:
@@ -166,15 +218,13 @@ def process_passage_file(file_path: Path, use_ai: bool = True):
     passages = [data] if is_single_passage else data
     
     # 全単語を収集（重複なし）
-    all_words = set()
-    for passage in passages:
-        for phrase in passage.get('phrases', []):
-            for segment in phrase.get('segments', []):
-                word = segment.get('word', '')
-                if word and word.isalpha():  # アルファベットのみ
-                    all_words.add(word)
+    all_words = collect_words(passages)
+    
+    # UD解析トークンを結合し、結合できなかった単語だけを原形化
+    parse_tokens = join_parse_tokens(passages, file_path)
+    prepare_lemmas(collect_words(passages, parse_tokens))
     
-    print(f"  Found {len(all_words)} unique words")
+    print(f"  Found {len(all_words)} unique words ({len(parse_tokens)} segments joined to passage-parses)")
     
     # AI APIでメタデータ生成
     ai_metadata = {}
@@ -194,22 +244,31 @@ def process_passage_file(file_path: Path, use_ai: bool = True):
                 if 'lemma' in segment:
                     continue
                 
+                # UD解析があれば文脈を考慮した原形・品詞を使う
+                token = parse_tokens.get(id(segment))
+                if token is not None:
+                    lemma = parse_lemma(token)
+                    segment['upos'] = token.upos
+                    segment['xpos'] = token.xpos
+                else:
+                    lemma = get_lemma(word)
+                
                 # meaningがオブジェクトの場合、展開する
                 if isinstance(meaning, dict):
                     # 既存のmeaningオブジェクトから値を取得
-                    segment['lemma'] = meaning.get('word', get_lemma(word))
+                    segment['lemma'] = meaning.get('word', lemma)
                     segment['reading'] = meaning.get('reading', '')
                     segment['etymology'] = meaning.get('etymology', '')
                     segment['relatedWords'] = meaning.get('relatedWords', '')
                     segment['relatedFields'] = meaning.get('category', '日常生活')
-                    segment['difficulty'] = meaning.get('difficulty', estimate_difficulty(word))
+                    segment['difficulty'] = meaning.get('difficulty', estimate_difficulty(word, lemma))
                     
                     # meaningを文字列に変換（意味のみ残す）
                     segment['meaning'] = meaning.get('meaning', '')
                 else:
                     # meaningが文字列の場合、新規追加
-                    segment['lemma'] = get_lemma(word)
-                    segment['difficulty'] = estimate_difficulty(word)
+                    segment['lemma'] = lemma
+                    segment['difficulty'] = estimate_difficulty(word, lemma)
                     
                     # AI生成メタデータ追加
                     if word in ai_metadata:
@@ -250,6 +309,18 @@ def main():
     
     print(f"Found {len(json_files)} JSON files")
     
+    # UD解析と結合できない全ファイルの単語を、一度の nlp.pipe でまとめて原形化
+    all_words = set()
+    for json_file in json_files:
+        try:
+            passages = load_passages(json_file)
+            all_words.update(collect_words(passages, join_parse_tokens(passages, json_file)))
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"  ✗ Error reading {json_file.name}: {e}")
+    prepare_lemmas(sorted(all_words))
+    lemma_cache.save()
+    print(f"Lemmatized {len(all_words)} unique words (cache: {len(lemma_cache)} words)")
+    
     use_ai = client is not None
     if not use_ai:
         print("\n⚠️  AI metadata generation disabled (no API key)")
@@ -262,6 +333,7 @@ def main():
             print(f"  ✗ Error processing {json_file.name}: {e}")
             continue
     
+    lemma_cache.save()
     print("\n✅ All files processed")
 
 if __name__ == "__main__":
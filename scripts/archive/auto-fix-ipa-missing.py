@@ -6,10 +6,16 @@ IPA_MISSING エラーを自動的に修正します。
 カタカナのみの読みに、IPA発音記号を追加します。
 """
 
+import argparse
 import csv
-import re
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from reading_field import parse_reading
+from csv_patch import add_patch_arguments, dict_rows, recorder_from_args
+from data_store import write_csv_dicts
+
 # カタカナ→IPA発音の変換辞書（主要な単語）
 KATAKANA_TO_IPA = {
     'フェ́ブルアリー': 'ˈfɛbruɛri',
@@ -49,19 +55,21 @@ KATAKANA_TO_IPA = {
     'タ́イランド': 'ˈtaɪlænd',
 }
 
-def fix_ipa_missing(csv_file_path: Path, output_path: Path = None):
+def fix_ipa_missing(csv_file_path: Path, output_path: Path = None, recorder=None):
     """
     CSVファイル内のIPA欠損エラーを修正
 
     Args:
         csv_file_path: 修正対象のCSVファイルパス
         output_path: 出力先パス（Noneの場合は上書き）
+        recorder: 差分レコーダー（csv_patch.PatchRecorder、dry-run時はCSVを書き換えない）
     """
     if output_path is None:
         output_path = csv_file_path
 
     fixed_count = 0
     rows = []
+    original_rows = []
 
     # CSVファイルを読み込み
     with open(csv_file_path, 'r', encoding='utf-8') as f:
@@ -69,11 +77,12 @@ def fix_ipa_missing(csv_file_path: Path, output_path: Path = None):
         fieldnames = reader.fieldnames
 
         for row in reader:
+            original_rows.append(dict(row))
             original_reading = row.get('読み', '')
 
             if original_reading:
-                # カッコがない場合（IPAが欠損している場合）
-                if '(' not in original_reading or ')' not in original_reading:
+                # IPAが欠損している場合（カタカナのみ）
+                if not parse_reading(original_reading).has_ipa:
                     katakana_reading = original_reading.strip()
 
                     # カタカナ→IPA変換
@@ -89,18 +98,35 @@ def fix_ipa_missing(csv_file_path: Path, output_path: Path = None):
 
             rows.append(row)
 
-    # 修正後のデータを保存
-    with open(output_path, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+    try:
+        if recorder is not None and fixed_count:
+            key_index = fieldnames.index('語句') if '語句' in fieldnames else 0
+            recorder.record(csv_file_path, dict_rows(fieldnames, original_rows), dict_rows(fieldnames, rows),
+                            key_index)
+
+        if recorder is not None and recorder.dry_run:
+            print(f"\n🔍 修正予定（dry-run）: {fixed_count}件")
+            return fixed_count
+
+        # 修正がある場合だけ保存（修正なしの実行ではファイルに触れない。書き換え前の内容はバックアップストアへ）
+        if fixed_count:
+            write_csv_dicts(output_path, fieldnames, rows, label='ipa-missing')
+    except ValueError as e:
+        # ヘッダーより列の多い行があると、DictReader の余りの列を書き戻せない
+        print(f"\n❌ {csv_file_path.name}: {e}（書き込みを中止）")
+        return 0
 
     print(f"\n修正完了: {fixed_count}件")
     return fixed_count
 
 def main():
+    parser = argparse.ArgumentParser(description='IPA欠損自動修正ツール')
+    add_patch_arguments(parser)
+    args = parser.parse_args()
+    recorder = recorder_from_args(args)
+
     # 4つのCSVファイルを修正
-    base_dir = Path('public/data/vocabulary')
+    base_dir = Path(__file__).resolve().parent.parent.parent / 'public' / 'data' / 'vocabulary'
     csv_files = [
         base_dir / 'high-school-entrance-words.csv',
         base_dir / 'high-school-entrance-phrases.csv',
@@ -119,7 +145,7 @@ def main():
         print("=" * 60)
 
         # 修正実行
-        fixed = fix_ipa_missing(csv_file)
+        fixed = fix_ipa_missing(csv_file, recorder=recorder)
         total_fixed += fixed
 
         if fixed > 0:
@@ -127,7 +153,9 @@ def main():
         else:
             print(f"修正対象のエラーなし: {csv_file.name}")
 
-    print(f"\n📊 合計: {total_fixed}件のIPAを追加しました")
+    recorder.save()
+
+    print(f"\n📊 合計: {total_fixed}件のIPAを追加しました{'（dry-run、書き込みなし）' if recorder.dry_run else ''}")
 
 if __name__ == '__main__':
     main()
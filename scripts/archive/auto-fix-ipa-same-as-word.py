@@ -3,11 +3,21 @@
 IPA_SAME_AS_WORDエラーを自動修正するスクリプト
 
 IPA発音が単語と同じ場合、正しいIPA発音に変換
+
+IPA部分だけを置き換え、カタカナ括弧の入れ子や単語ごとの分割表記はそのまま残します。
+分割表記で新しいIPAを各区間に割り当てられない行は修正せずに報告します。
 """
 
+import argparse
 import csv
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from reading_field import parse_reading, replace_ipa
+from csv_patch import add_patch_arguments, recorder_from_args
+from data_store import write_csv
+
 # 単語→IPA発音のマッピング
 IPA_MAPPINGS = {
     'P.E.': 'piː iː',
@@ -24,12 +34,13 @@ IPA_MAPPINGS = {
     'send': 'sɛnd',
 }
 
-def fix_ipa_same_as_word(csv_path):
+def fix_ipa_same_as_word(csv_path, recorder=None):
     """
     CSVファイルのIPA_SAME_AS_WORDエラーを修正
 
     Args:
         csv_path: CSVファイルのパス
+        recorder: 差分レコーダー（csv_patch.PatchRecorder、dry-run時はCSVを書き換えない）
 
     Returns:
         int: 修正した行数
@@ -45,9 +56,12 @@ def fix_ipa_same_as_word(csv_path):
     if len(rows) < 2:
         return 0
 
+    original_rows = [list(row) for row in rows]
+
     header = rows[0]
     modified_count = 0
     modifications = []
+    skipped = []
 
     # 各行をチェック
     for i, row in enumerate(rows[1:], start=2):
@@ -58,22 +72,17 @@ def fix_ipa_same_as_word(csv_path):
         reading = row[1].strip()
 
         # IPA部分を抽出
-        if '(' in reading:
-            ipa_part = reading.split('(')[0].strip()
-            katakana_part = reading.split('(', 1)[1].rsplit(')', 1)[0] if ')' in reading else ''
-        else:
-            ipa_part = reading
-            katakana_part = ''
+        ipa_part = parse_reading(reading).ipa
 
         # IPAが単語と同じで、マッピングに存在する場合
         if ipa_part == word and word in IPA_MAPPINGS:
             correct_ipa = IPA_MAPPINGS[word]
 
-            # 新しいreading形式を構築
-            if katakana_part:
-                new_reading = f"{correct_ipa} ({katakana_part})"
-            else:
-                new_reading = correct_ipa
+            # IPA部分だけを置き換え（カタカナ部分のレイアウトは保持）
+            new_reading = replace_ipa(reading, correct_ipa)
+            if new_reading is None:
+                skipped.append({'line': i, 'word': word, 'reading': reading, 'new_ipa': correct_ipa})
+                continue
 
             rows[i-1][1] = new_reading
             modified_count += 1
@@ -85,30 +94,40 @@ def fix_ipa_same_as_word(csv_path):
             })
 
     if modified_count > 0:
-        # バックアップを作成
-        backup_file = csv_file.with_suffix('.csv.backup-ipa-same')
-        import shutil
-        shutil.copy(csv_file, backup_file)
-
-        # 修正後のCSVを書き込み
-        with open(csv_file, 'w', encoding='utf-8', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerows(rows)
+        if recorder is not None:
+            recorder.record(csv_file, original_rows, rows)
 
-        print(f"✅ {csv_file.name}: {modified_count}件修正")
+        if recorder is not None and recorder.dry_run:
+            print(f"🔍 {csv_file.name}: {modified_count}件修正予定（dry-run）")
+        else:
+            # 書き換え前の内容をバックアップストアに保存してからアトミックに書き込み
+            if write_csv(csv_file, rows, label='ipa-same'):
+                print(f"✅ {csv_file.name}: {modified_count}件修正")
+            else:
+                print(f"ℹ️  {csv_file.name}: 出力が同一のため書き込みをスキップ")
         print(f"📋 修正詳細:")
         for mod in modifications:
             print(f"  行{mod['line']}: {mod['word']}")
             print(f"    IPA: {mod['old_ipa']} → {mod['new_ipa']}")
-    else:
+    elif not skipped:
         print(f"ℹ️  {csv_file.name}: 修正不要")
 
+    if skipped:
+        print(f"⚠️  {csv_file.name}: 読みのレイアウトにIPAを割り当てられないため {len(skipped)}件をスキップ（手動で修正）")
+        for item in skipped:
+            print(f"  行{item['line']}: {item['word']}  {item['reading']}  → IPA: {item['new_ipa']}")
+
     return modified_count
 
 
 def main():
     """メイン処理"""
-    base_dir = Path(__file__).parent.parent
+    parser = argparse.ArgumentParser(description='IPA_SAME_AS_WORD自動修正ツール')
+    add_patch_arguments(parser)
+    args = parser.parse_args()
+    recorder = recorder_from_args(args)
+
+    base_dir = Path(__file__).resolve().parent.parent.parent
     vocab_dir = base_dir / 'public' / 'data' / 'vocabulary'
 
     csv_files = [
@@ -127,12 +146,14 @@ def main():
 
     for csv_file in csv_files:
         csv_path = vocab_dir / csv_file
-        fixed = fix_ipa_same_as_word(csv_path)
+        fixed = fix_ipa_same_as_word(csv_path, recorder)
         total_fixed += fixed
         print()
 
+    recorder.save()
+
     print("=" * 60)
-    print(f"✅ 完了: 合計 {total_fixed}件 修正")
+    print(f"✅ 完了: 合計 {total_fixed}件 修正{'予定（dry-run）' if recorder.dry_run else ''}")
     print("=" * 60)
 
 
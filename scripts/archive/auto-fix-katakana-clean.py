@@ -6,10 +6,16 @@ IPA部分の括弧（オプション音素）を適切に処理し、
 カタカナ部分からIPA記号を完全に除去
 """
 
+import argparse
 import csv
-import re
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from reading_field import normalize_reading, parse_reading
+from csv_patch import add_patch_arguments, recorder_from_args
+from data_store import write_csv
+
 
 def clean_ipa_katakana(reading):
     """
@@ -21,50 +27,16 @@ def clean_ipa_katakana(reading):
     Returns:
         tuple: (cleaned_reading, was_modified)
     """
-    if not reading or '(' not in reading:
-        return reading, False
-
-    original = reading
-
-    # カタカナ部分を抽出（最後の括弧）
-    # 形式: "IPA (カタカナ́)" から最後の括弧を見つける
-    parts = reading.rsplit('(', 1)
-    if len(parts) < 2:
-        return reading, False
-
-    ipa_with_brackets = parts[0].strip()
-    katakana_with_bracket = '(' + parts[1]
-
-    # カタカナ部分を取得
-    katakana_match = re.search(r'\(([^)]+)\)$', reading)
-    if not katakana_match:
-        return reading, False
-
-    katakana_part = katakana_match.group(1)
-
-    # カタカナ部分に英字や IPA記号が含まれているかチェック
-    has_english = re.search(r'[A-Za-z]', katakana_part)
-    has_ipa = re.search(r'[ɑæəɛɪʊʌɔɜʉɒɐɝɚɘɨäŏɵɞθðʃʒŋʔɹɡɾɫʍ]', katakana_part)
-
-    # 英字やIPA記号が含まれている場合は、カタカナのみを抽出
-    if has_english or has_ipa:
-        # カタカナとアクセント記号のみを抽出
-        cleaned_katakana = re.sub(r'[^ァ-ヴー・ ́]+', '', katakana_part)
+    return normalize_reading(reading)
 
-        if cleaned_katakana and cleaned_katakana != katakana_part:
-            # IPA部分を保持し、カタカナ部分を置換
-            new_reading = ipa_with_brackets + f' ({cleaned_katakana})'
-            return new_reading, True
 
-    return reading, False
-
-
-def fix_ipa_katakana_separation(csv_path):
+def fix_ipa_katakana_separation(csv_path, recorder=None):
     """
     CSVファイルのIPA/カタカナ分離を修正
 
     Args:
         csv_path: CSVファイルのパス
+        recorder: 差分レコーダー（csv_patch.PatchRecorder、dry-run時はCSVを書き換えない）
 
     Returns:
         int: 修正した行数
@@ -80,6 +52,8 @@ def fix_ipa_katakana_separation(csv_path):
     if len(rows) < 2:
         return 0
 
+    original_rows = [list(row) for row in rows]
+
     header = rows[0]
     modified_count = 0
     modifications = []
@@ -105,25 +79,25 @@ def fix_ipa_katakana_separation(csv_path):
             })
 
     if modified_count > 0:
-        # バックアップを作成
-        backup_file = csv_file.with_suffix('.csv.backup-katakana-clean')
-        import shutil
-        shutil.copy(csv_file, backup_file)
-
-        # 修正後のCSVを書き込み
-        with open(csv_file, 'w', encoding='utf-8', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerows(rows)
-
-        print(f"✅ {csv_file.name}: {modified_count}件修正")
+        if recorder is not None:
+            recorder.record(csv_file, original_rows, rows)
+
+        if recorder is not None and recorder.dry_run:
+            print(f"🔍 {csv_file.name}: {modified_count}件修正予定（dry-run）")
+        else:
+            # 書き換え前の内容をバックアップストアに保存してからアトミックに書き込み
+            if write_csv(csv_file, rows, label='katakana-clean'):
+                print(f"✅ {csv_file.name}: {modified_count}件修正")
+            else:
+                print(f"ℹ️  {csv_file.name}: 出力が同一のため書き込みをスキップ")
         print(f"📋 修正詳細:")
         for mod in modifications[:15]:  # 最初の15件のみ表示
             print(f"  行{mod['line']}: {mod['word']}")
             # 変更前後を比較
-            old_kata = re.search(r'\(([^)]+)\)$', mod['old'])
-            new_kata = re.search(r'\(([^)]+)\)$', mod['new'])
+            old_kata = parse_reading(mod['old']).accented_katakana
+            new_kata = parse_reading(mod['new']).accented_katakana
             if old_kata and new_kata:
-                print(f"    カタカナ: ({old_kata.group(1)}) → ({new_kata.group(1)})")
+                print(f"    カタカナ: ({old_kata}) → ({new_kata})")
 
         if len(modifications) > 15:
             print(f"  ... 他{len(modifications) - 15}件")
@@ -135,7 +109,12 @@ def fix_ipa_katakana_separation(csv_path):
 
 def main():
     """メイン処理"""
-    base_dir = Path(__file__).parent.parent
+    parser = argparse.ArgumentParser(description='IPA/カタカナ分離整理ツール')
+    add_patch_arguments(parser)
+    args = parser.parse_args()
+    recorder = recorder_from_args(args)
+
+    base_dir = Path(__file__).resolve().parent.parent.parent
     vocab_dir = base_dir / 'public' / 'data' / 'vocabulary'
 
     csv_files = [
@@ -154,12 +133,14 @@ def main():
 
     for csv_file in csv_files:
         csv_path = vocab_dir / csv_file
-        fixed = fix_ipa_katakana_separation(csv_path)
+        fixed = fix_ipa_katakana_separation(csv_path, recorder)
         total_fixed += fixed
         print()
 
+    recorder.save()
+
     print("=" * 60)
-    print(f"✅ 完了: 合計 {total_fixed}件 修正")
+    print(f"✅ 完了: 合計 {total_fixed}件 修正{'予定（dry-run）' if recorder.dry_run else ''}")
     print("=" * 60)
 
 
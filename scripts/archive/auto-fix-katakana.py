@@ -6,10 +6,16 @@ KATAKANA_ENGLISH_MIXED エラーを自動的に修正します。
 英語がそのまま入っているカタカナ部分を適切なカタカナに変換します。
 """
 
+import argparse
 import csv
 import re
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from csv_patch import add_patch_arguments, dict_rows, recorder_from_args
+from data_store import write_csv_dicts
+
 # 英語→カタカナの変換辞書
 ENGLISH_TO_KATAKANA = {
     'August': 'オーガ́スト',
@@ -27,19 +33,21 @@ ENGLISH_TO_KATAKANA = {
     # 注: 't' や 'k' は IPA記号の一部なので修正しない
 }
 
-def fix_katakana_english_mixed(csv_file_path: Path, output_path: Path = None):
+def fix_katakana_english_mixed(csv_file_path: Path, output_path: Path = None, recorder=None):
     """
     CSVファイル内のカタカナ英語混入エラーを修正
 
     Args:
         csv_file_path: 修正対象のCSVファイルパス
         output_path: 出力先パス（Noneの場合は上書き）
+        recorder: 差分レコーダー（csv_patch.PatchRecorder、dry-run時はCSVを書き換えない）
     """
     if output_path is None:
         output_path = csv_file_path
 
     fixed_count = 0
     rows = []
+    original_rows = []
 
     # CSVファイルを読み込み
     with open(csv_file_path, 'r', encoding='utf-8') as f:
@@ -47,6 +55,7 @@ def fix_katakana_english_mixed(csv_file_path: Path, output_path: Path = None):
         fieldnames = reader.fieldnames
 
         for row in reader:
+            original_rows.append(dict(row))
             original_reading = row.get('読み', '')
 
             if original_reading:
@@ -84,18 +93,35 @@ def fix_katakana_english_mixed(csv_file_path: Path, output_path: Path = None):
 
             rows.append(row)
 
-    # 修正後のデータを保存
-    with open(output_path, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+    try:
+        if recorder is not None and fixed_count:
+            key_index = fieldnames.index('語句') if '語句' in fieldnames else 0
+            recorder.record(csv_file_path, dict_rows(fieldnames, original_rows), dict_rows(fieldnames, rows),
+                            key_index)
+
+        if recorder is not None and recorder.dry_run:
+            print(f"\n🔍 修正予定（dry-run）: {fixed_count}件")
+            return fixed_count
+
+        # 修正がある場合だけ保存（修正なしの実行ではファイルに触れない。書き換え前の内容はバックアップストアへ）
+        if fixed_count:
+            write_csv_dicts(output_path, fieldnames, rows, label='katakana')
+    except ValueError as e:
+        # ヘッダーより列の多い行があると、DictReader の余りの列を書き戻せない
+        print(f"\n❌ {csv_file_path.name}: {e}（書き込みを中止）")
+        return 0
 
     print(f"\n修正完了: {fixed_count}件")
     return fixed_count
 
 def main():
+    parser = argparse.ArgumentParser(description='カタカナ英語混入自動修正ツール')
+    add_patch_arguments(parser)
+    args = parser.parse_args()
+    recorder = recorder_from_args(args)
+
     # 4つのCSVファイルを修正
-    base_dir = Path('public/data/vocabulary')
+    base_dir = Path(__file__).resolve().parent.parent.parent / 'public' / 'data' / 'vocabulary'
     csv_files = [
         base_dir / 'high-school-entrance-words.csv',
         base_dir / 'high-school-entrance-phrases.csv',
@@ -103,7 +129,6 @@ def main():
         base_dir / 'junior-high-intermediate-phrases.csv'
     ]
 
-    import shutil
     total_fixed = 0
 
     for csv_file in csv_files:
@@ -114,14 +139,8 @@ def main():
         print(f"\n修正対象: {csv_file}")
         print("=" * 60)
 
-        # バックアップ作成
-        backup_file = csv_file.with_suffix('.csv.backup-katakana')
-        shutil.copy2(csv_file, backup_file)
-        print(f"バックアップ作成: {backup_file}")
-        print()
-
         # 修正実行
-        fixed = fix_katakana_english_mixed(csv_file)
+        fixed = fix_katakana_english_mixed(csv_file, recorder=recorder)
         total_fixed += fixed
 
         if fixed > 0:
@@ -129,7 +148,9 @@ def main():
         else:
             print(f"修正対象のエラーなし: {csv_file.name}")
 
-    print(f"\n📊 合計: {total_fixed}件のエラーを修正しました")
+    recorder.save()
+
+    print(f"\n📊 合計: {total_fixed}件のエラーを修正しました{'（dry-run、書き込みなし）' if recorder.dry_run else ''}")
 
 if __name__ == '__main__':
     main()
@@ -5,9 +5,15 @@
 MEANING_NO_JAPANESEエラー修正: 数字のみの意味フィールドに日本語説明を追加
 """
 
+import argparse
 import csv
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from csv_patch import add_patch_arguments, recorder_from_args
+from data_store import write_csv
+
 # 数字→日本語のマッピング
 NUMBER_MEANINGS = {
     '0': '0（ゼロ、零）',
@@ -53,12 +59,13 @@ NUMBER_MEANINGS = {
 }
 
 
-def fix_number_meanings(csv_path):
+def fix_number_meanings(csv_path, recorder=None):
     """
     CSVファイルの数字の意味フィールドに日本語を追加
 
     Args:
         csv_path: CSVファイルのパス
+        recorder: 差分レコーダー（csv_patch.PatchRecorder、dry-run時はCSVを書き換えない）
 
     Returns:
         int: 修正した行数
@@ -74,6 +81,8 @@ def fix_number_meanings(csv_path):
     if len(rows) < 2:
         return 0
 
+    original_rows = [list(row) for row in rows]
+
     header = rows[0]
     modified_count = 0
     modifications = []
@@ -100,17 +109,17 @@ def fix_number_meanings(csv_path):
             })
 
     if modified_count > 0:
-        # バックアップを作成
-        backup_file = csv_file.with_suffix('.csv.backup-meaning')
-        import shutil
-        shutil.copy(csv_file, backup_file)
-
-        # 修正後のCSVを書き込み
-        with open(csv_file, 'w', encoding='utf-8', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerows(rows)
-
-        print(f"✅ {csv_file.name}: {modified_count}件修正")
+        if recorder is not None:
+            recorder.record(csv_file, original_rows, rows)
+
+        if recorder is not None and recorder.dry_run:
+            print(f"🔍 {csv_file.name}: {modified_count}件修正予定（dry-run）")
+        else:
+            # 書き換え前の内容をバックアップストアに保存してからアトミックに書き込み
+            if write_csv(csv_file, rows, label='meaning'):
+                print(f"✅ {csv_file.name}: {modified_count}件修正")
+            else:
+                print(f"ℹ️  {csv_file.name}: 出力が同一のため書き込みをスキップ")
         print(f"📋 修正詳細:")
         for mod in modifications[:10]:  # 最初の10件のみ表示
             print(f"  行{mod['line']}: {mod['word']}")
@@ -126,7 +135,12 @@ def fix_number_meanings(csv_path):
 
 def main():
     """メイン処理"""
-    base_dir = Path(__file__).parent.parent
+    parser = argparse.ArgumentParser(description='数字の意味フィールド日本語追加ツール')
+    add_patch_arguments(parser)
+    args = parser.parse_args()
+    recorder = recorder_from_args(args)
+
+    base_dir = Path(__file__).resolve().parent.parent.parent
     vocab_dir = base_dir / 'public' / 'data' / 'vocabulary'
 
     csv_files = [
@@ -145,12 +159,14 @@ def main():
 
     for csv_file in csv_files:
         csv_path = vocab_dir / csv_file
-        fixed = fix_number_meanings(csv_path)
+        fixed = fix_number_meanings(csv_path, recorder)
         total_fixed += fixed
         print()
 
+    recorder.save()
+
     print("=" * 60)
-    print(f"✅ 完了: 合計 {total_fixed}件 修正")
+    print(f"✅ 完了: 合計 {total_fixed}件 修正{'予定（dry-run）' if recorder.dry_run else ''}")
     print("=" * 60)
 
 
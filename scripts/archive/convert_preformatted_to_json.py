@@ -10,81 +10,164 @@
         --output public/data/passages-phrase-learning/intermediate-exchange-student-australia.json \
         --level intermediate \
         --theme "文化交流・学校生活"
+
+    # 辞書参照形式（セグメントは辞書キーのみ、エントリはパッセージ内テーブル）で出力
+    python3 convert_preformatted_to_json.py ... --normalized
+    # 共有辞書と同一のエントリは共有辞書を参照
+    python3 convert_preformatted_to_json.py ... --normalized --shared-dictionary
 """
 
 import json
 import re
+import sys
 import argparse
+from collections import Counter
 from pathlib import Path
+from typing import NamedTuple, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from dictionary_shards import open_dictionary, source_hash  # noqa: E402
+from phrase_align import align_phrases  # noqa: E402
+from phrase_json import normalize_passage  # noqa: E402
 
 
 def load_dictionary(filepath):
-    """辞書JSON読み込み"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    """
+    辞書読み込み
 
+    dictionary_shards.py で生成したシャードがあれば、参照された単語のシャードだけを
+    遅延読み込みする（なければ単一JSONを一度だけ読み込んでキャッシュ）
+    """
+    return open_dictionary(Path(filepath))
 
-def split_long_sentence(sentence):
-    """20語を超える文を接続詞・関係詞・前置詞句で分割"""
-    words = sentence.split()
-    if len(words) <= 20:
-        return [sentence]
-    
-    # 分割候補のパターン（優先度順）
-    
+
+# 1フレーズの最大語数
+MAX_PHRASE_WORDS = 20
+
+# 分割後の前半・後半の最小語数
+MIN_BEFORE_WORDS = 5
+MIN_AFTER_WORDS = 3
+
+# 分割候補の語 → カテゴリ優先度（小さいほど優先）
+SPLIT_CATEGORIES = (
     # 1. 従属接続詞（最優先）
-    subordinating_conjunctions = [
-        'when', 'because', 'although', 'while', 'since',
-        'after', 'before', 'unless', 'until', 'if', 'though', 
-        'whereas', 'whenever', 'wherever'
-    ]
-    
+    ('when', 'because', 'although', 'while', 'since',
+     'after', 'before', 'unless', 'until', 'if', 'though',
+     'whereas', 'whenever', 'wherever'),
     # 2. 関係詞
-    relative_pronouns = ['which', 'who', 'that', 'where', 'whose', 'whom']
-    
+    ('which', 'who', 'that', 'where', 'whose', 'whom'),
     # 3. 前置詞（句の開始位置として）
-    prepositions = [
-        'with', 'without', 'by', 'during', 'through', 'throughout',
-        'among', 'between', 'within', 'beyond', 'despite', 'regarding',
-        'concerning', 'including', 'excluding', 'except', 'besides'
-    ]
-    
-    # 全候補リスト
-    all_split_points = subordinating_conjunctions + relative_pronouns + prepositions
-    
-    # 分割を試みる
-    for keyword in all_split_points:
-        # 大文字小文字を区別しないパターン（単語境界で）
-        pattern = r'\b' + keyword + r'\b'
-        match = re.search(pattern, sentence, re.IGNORECASE)
-        
-        if match:
-            split_pos = match.start()
-            # キーワードの前で分割（キーワードは後半に含める）
-            before = sentence[:split_pos].rstrip(' ,')
-            after = sentence[split_pos:].strip()
-            
-            # 分割後の各部分の語数をチェック
-            before_words = len(before.split())
-            after_words = len(after.split())
-            
-            # 前半が5語以上、後半が3語以上なら分割
-            if before_words >= 5 and after_words >= 3:
-                # 前半末尾にカンマがない場合は追加
-                if not before.endswith(','):
-                    before += ','
-                return [before, after]
-    
-    # 分割できない場合はそのまま返す
-    return [sentence]
+    ('with', 'without', 'by', 'during', 'through', 'throughout',
+     'among', 'between', 'within', 'beyond', 'despite', 'regarding',
+     'concerning', 'including', 'excluding', 'except', 'besides'),
+)
+SPLIT_PRIORITY = {word: priority for priority, words in enumerate(SPLIT_CATEGORIES) for word in words}
 
+# 空白区切りの語（語数は sentence.split() と一致する）
+_WORD_SPAN_RE = re.compile(r'\S+')
 
-def load_phrases_from_preformatted_file(filepath):
-    """ファイルを読み込み、文単位で分割し、長文は節・句で分割"""
+# 語の先頭の英字部分（引用符・括弧などの前置記号を除く）
+_LEADING_WORD_RE = re.compile(r'^[^\w]*([A-Za-z]+)\b')
+
+
+def _split_candidates(words):
+    """各語の分割優先度（候補でない語はNone）"""
+    priorities = []
+    for match in words:
+        leading = _LEADING_WORD_RE.match(match.group())
+        priorities.append(SPLIT_PRIORITY.get(leading.group(1).lower()) if leading else None)
+    return priorities
+
+
+def _split_range(sentence, words, priorities, lo, hi, max_words):
+    """words[lo:hi] を再帰的に分割したチャンクのリスト"""
+    best = None
+    if hi - lo > max_words:
+        for i in range(lo + MIN_BEFORE_WORDS, hi - MIN_AFTER_WORDS + 1):
+            priority = priorities[i]
+            if priority is None:
+                continue
+            # カテゴリ優先度 → 前後の語数の釣り合い → 前方 の順に評価
+            rank = (priority, abs((i - lo) - (hi - i)), i)
+            if best is None or rank < best[0]:
+                best = (rank, i)
+
+    if best is None:
+        return [sentence[words[lo].start():words[hi - 1].end()]]
+
+    split = best[1]
+    before = _split_range(sentence, words, priorities, lo, split, max_words)
+    after = _split_range(sentence, words, priorities, split, hi, max_words)
+    # 前半末尾はカンマで終える
+    before[-1] = before[-1].rstrip(' ,') + ','
+    return before + after
+
+
+def split_long_sentence(sentence, max_words=MAX_PHRASE_WORDS):
+    """
+    max_words 語を超える文を接続詞・関係詞・前置詞句で再帰的に分割
+
+    文を一度だけトークン化して全分割候補を求め、カテゴリ優先度と前後の語数の釣り合いで
+    順位付けします。各チャンクが max_words 語以下になるか、候補がなくなるまで分割します。
+    分割位置の語は後半に含め、前半の末尾にはカンマを付けます。
+
+    Args:
+        sentence: 英文
+        max_words: 1フレーズの最大語数
+
+    Returns:
+        list: 分割後のフレーズ
+    """
+    words = list(_WORD_SPAN_RE.finditer(sentence))
+    if len(words) <= max_words:
+        return [sentence]
+
+    return _split_range(sentence, words, _split_candidates(words), 0, len(words), max_words)
+
+
+def split_statistics(sentences, max_words=MAX_PHRASE_WORDS):
+    """
+    分割後のチャンク長の統計
+
+    Args:
+        sentences: 英文のリスト
+        max_words: 1フレーズの最大語数
+
+    Returns:
+        dict: 文数・チャンク数・分割した文の数・上限超過チャンク数・
+              語数の平均/中央値/90パーセンタイル/最大・語数ごとの件数
+    """
+    lengths = []
+    split_count = 0
+    for sentence in sentences:
+        chunks = split_long_sentence(sentence, max_words)
+        if len(chunks) > 1:
+            split_count += 1
+        lengths.extend(len(chunk.split()) for chunk in chunks)
+
+    lengths.sort()
+    if not lengths:
+        return {'sentences': 0, 'chunks': 0}
+    return {
+        'maxWords': max_words,
+        'sentences': len(sentences),
+        'chunks': len(lengths),
+        'splitSentences': split_count,
+        'overLimit': sum(1 for n in lengths if n > max_words),
+        'mean': round(sum(lengths) / len(lengths), 2),
+        'median': lengths[len(lengths) // 2],
+        'p90': lengths[min(len(lengths) - 1, int(len(lengths) * 0.9))],
+        'max': lengths[-1],
+        'histogram': dict(sorted(Counter(lengths).items())),
+    }
+
+
+def load_sentences_from_preformatted_file(filepath):
+    """ファイルを読み込み、見出しを除いて文単位で分割（長文の分割前）"""
     with open(filepath, 'r', encoding='utf-8') as f:
         content = f.read()
     
-    phrases = []
+    sentences = []
     
     # 段落ごとに処理
     paragraphs = content.split('\n\n')
@@ -104,21 +187,20 @@ def load_phrases_from_preformatted_file(filepath):
             continue
         
         # 文ごとに分割（.!?で区切る）
-        sentences = re.split(r'(?<=[.!?])\s+', paragraph)
-        
-        for sentence in sentences:
+        for sentence in re.split(r'(?<=[.!?])\s+', paragraph):
             sentence = sentence.strip()
-            if not sentence:
-                continue
-            
-            # 20語を超える文は分割
-            word_count = len(sentence.split())
-            if word_count > 20:
-                split_phrases = split_long_sentence(sentence)
-                phrases.extend(split_phrases)
-            else:
-                phrases.append(sentence)
+            if sentence:
+                sentences.append(sentence)
     
+    return sentences
+
+
+def load_phrases_from_preformatted_file(filepath, max_words=MAX_PHRASE_WORDS):
+    """ファイルを読み込み、文単位で分割し、長文は節・句で分割"""
+    phrases = []
+    for sentence in load_sentences_from_preformatted_file(filepath):
+        # max_words 語を超える文は分割
+        phrases.extend(split_long_sentence(sentence, max_words))
     return phrases
 
 
@@ -170,72 +252,160 @@ def load_japanese_phrases(filepath):
     return japanese_phrases
 
 
-def create_segments_from_phrase(phrase, dictionary):
-    """フレーズを単語セグメントに分解"""
-    # 句読点を分離してトークン化
-    words = re.findall(r"\w+(?:'\w+)?|[.,!?;:—\"']", phrase)
-    
+# トークン: 単語（アポストロフィ付き短縮形を含む）または句読点
+TOKEN_RE = re.compile(r"\w+(?:'\w+)?|[.,!?;:—\"']")
+
+PUNCTUATION = ".,!?;:—\"'"
+
+
+class GrammarRule(NamedTuple):
+    """
+    トークン単位の文法ポイント検出ルール
+
+    label の "{words}" は検出した語（先頭大文字、出現順に "/" 区切り）に置き換える。
+    next_suffix を指定した場合、トリガー語の直後（空白のみを挟む）の語が
+    その語尾で終わるときだけ検出する（例: is + -ed → 受動態）。
+    """
+
+    label: str
+    words: frozenset
+    next_suffix: Optional[str] = None
+
+
+# 文法ポイント検出ルール（出力順）。検出器を増やしてもフレーズの走査は1回のまま
+GRAMMAR_RULES = (
+    GrammarRule("{words}節", frozenset({'when', 'if', 'because', 'although', 'while', 'since'})),
+    GrammarRule("that節", frozenset({'that'})),
+    GrammarRule("受動態", frozenset({'is', 'are', 'was', 'were', 'been'}), next_suffix='ed'),
+    GrammarRule("現在完了", frozenset({'have', 'has'}), next_suffix='ed'),
+)
+
+
+def _build_trigger_table(rules):
+    """トリガー語 → (ルール番号, ...) の表"""
+    table = {}
+    for index, rule in enumerate(rules):
+        for word in rule.words:
+            table.setdefault(word, []).append(index)
+    return {word: tuple(indices) for word, indices in table.items()}
+
+
+_TRIGGERS = _build_trigger_table(GRAMMAR_RULES)
+
+
+def analyze_phrase(phrase, dictionary, rules=GRAMMAR_RULES, triggers=None):
+    """
+    フレーズを1回の走査でトークン化し、辞書引きと文法ポイント検出を同時に行う
+
+    Args:
+        phrase: 英語フレーズ
+        dictionary: 単語辞書（小文字キー）
+        rules: 文法ポイント検出ルール
+        triggers: rules のトリガー表（省略時は GRAMMAR_RULES 用の表）
+
+    Returns:
+        tuple: (セグメントのリスト, 文法ポイント文字列またはNone)
+    """
+    if triggers is None:
+        triggers = _TRIGGERS if rules is GRAMMAR_RULES else _build_trigger_table(rules)
+
     segments = []
-    for word in words:
-        # 句読点はそのまま追加
-        if word in ".,!?;:—\"'":
-            segments.append({
-                "word": word,
-                "meaning": "",
-                "isUnknown": False
-            })
+    hits = [None] * len(rules)  # ルール番号 → 検出した語のリスト
+    pending = ()                # 直前の語で待機中の next_suffix ルール
+    previous_end = -1
+
+    for match in TOKEN_RE.finditer(phrase):
+        token = match.group()
+        if token in PUNCTUATION:
+            # 句読点はそのまま追加
+            segments.append({"word": token, "meaning": "", "isUnknown": False})
+            pending = ()
             continue
-        
-        # 単語の意味を辞書から検索
-        clean_word = word.lower()
-        meaning = dictionary.get(clean_word, "")
-        
+
+        lower = token.lower()
         segments.append({
-            "word": word,
-            "meaning": meaning,
+            "word": token,
+            "meaning": dictionary.get(lower, ""),
             "isUnknown": False
         })
-    
-    return segments
+
+        # 短縮形は "'" の前後を別の語として扱う（\b 境界と同じ）
+        parts = lower.split("'")
+
+        # 直前のトリガー語と空白だけで隔てられ、先頭の語が語尾条件を満たすか
+        if pending and phrase[previous_end:match.start()].isspace():
+            head = parts[0]
+            for index in pending:
+                suffix = rules[index].next_suffix
+                if len(head) > len(suffix) and head.endswith(suffix):
+                    hits[index] = hits[index] or []
+
+        pending = ()
+        for position, part in enumerate(parts):
+            for index in triggers.get(part, ()):
+                if rules[index].next_suffix is None:
+                    words = hits[index] if hits[index] is not None else []
+                    hits[index] = words
+                    capitalized = part.capitalize()
+                    if capitalized not in words:
+                        words.append(capitalized)
+                elif position == len(parts) - 1:
+                    pending += (index,)
+        previous_end = match.end()
+
+    grammar_points = [
+        rule.label.replace("{words}", "/".join(words))
+        for rule, words in zip(rules, hits) if words is not None
+    ]
+    return segments, " / ".join(grammar_points) if grammar_points else None
+
+
+def create_segments_from_phrase(phrase, dictionary):
+    """フレーズを単語セグメントに分解"""
+    return analyze_phrase(phrase, dictionary)[0]
 
 
 def detect_grammar_point(phrase):
-    """フレーズから文法ポイントを検出（簡易版）"""
-    grammar_points = []
-    
-    # 接続詞
-    if re.search(r'\b(when|if|because|although|while|since)\b', phrase, re.I):
-        conjunctions = re.findall(r'\b(when|if|because|although|while|since)\b', phrase, re.I)
-        grammar_points.append(f"{'/'.join(set([c.capitalize() for c in conjunctions]))}節")
-    
-    # that節
-    if re.search(r'\bthat\b', phrase, re.I):
-        grammar_points.append("that節")
-    
-    # 受動態
-    if re.search(r'\b(is|are|was|were|been)\s+\w+ed\b', phrase, re.I):
-        grammar_points.append("受動態")
-    
-    # 現在完了
-    if re.search(r'\b(have|has)\s+\w+ed\b', phrase, re.I):
-        grammar_points.append("現在完了")
-    
-    return " / ".join(grammar_points) if grammar_points else None
+    """フレーズから文法ポイントを検出"""
+    return analyze_phrase(phrase, {})[1]
 
 
-def convert_preformatted_to_json(passage_file, translation_file, dictionary_file, 
-                                  output_file, level, theme):
-    """改行済みファイルから直接JSON生成"""
-    
-    print(f"📖 読み込み中...")
-    print(f"  英文: {passage_file}")
-    print(f"  全訳: {translation_file}")
-    print(f"  辞書: {dictionary_file}")
-    
-    # 読み込み
+def align_passage(passage_file, translation_file):
+    """
+    英文・全訳ファイルのフレーズをアライメント
+
+    Returns:
+        Alignment: phrase_align.align_phrases の結果
+    """
     english_phrases = load_phrases_from_preformatted_file(passage_file)
-    dictionary = load_dictionary(dictionary_file)
     japanese_phrases = load_japanese_phrases(translation_file)
+    return align_phrases(english_phrases, japanese_phrases)
+
+
+def build_passage_data(passage_file, translation_file, dictionary, level, theme, verbose=True,
+                       alignment=None):
+    """
+    英文・全訳ファイルからフレーズ学習用のパッセージデータを生成（ファイル出力なし）
+
+    英文と和訳のフレーズは文字数比とアンカー（数字・話者ラベルなど）で対応付けます。
+    フレーズ数が異なる場合、和訳は対応する英文フレーズに結合されます。
+
+    Args:
+        passage_file: 英文パッセージファイル
+        translation_file: 全訳ファイル
+        dictionary: 単語辞書（load_dictionary の戻り値）
+        level: 難易度レベル
+        theme: テーマ
+        verbose: 進捗を表示するか
+        alignment: align_passage の結果（省略時はここで計算）
+
+    Returns:
+        dict: 従来形式のフレーズ学習JSON
+    """
+    if alignment is None:
+        alignment = align_passage(passage_file, translation_file)
+    english_count = sum(len(p.english_indices) for p in alignment.pairs)
+    japanese_count = sum(len(p.japanese_indices) for p in alignment.pairs)
     
     # タイトル抽出（最初の行）
     with open(passage_file, 'r', encoding='utf-8') as f:
@@ -244,21 +414,26 @@ def convert_preformatted_to_json(passage_file, translation_file, dictionary_file
     # パッセージID抽出（ファイル名から）
     passage_id = Path(passage_file).stem
     
-    print(f"\n📊 フレーズ数:")
-    print(f"  英語: {len(english_phrases)} フレーズ")
-    print(f"  日本語: {len(japanese_phrases)} フレーズ")
+    if verbose:
+        print(f"\n📊 フレーズ数:")
+        print(f"  英語: {english_count} フレーズ")
+        print(f"  日本語: {japanese_count} フレーズ")
+        print(f"  対応付け信頼度: {alignment.confidence:.2f}")
     
-    if len(english_phrases) != len(japanese_phrases):
-        print(f"\n⚠️  警告: フレーズ数が一致しません！")
-        print(f"  不足分は手動で調整が必要です")
+    if alignment.review and verbose:
+        print(f"\n⚠️  警告: 確認が必要な対応が {len(alignment.review)} 件あります")
+        for pair in alignment.review:
+            print(f"  [{len(pair.english_indices)}-{len(pair.japanese_indices)}] "
+                  f"{pair.english[:50]} ↔ {pair.japanese[:30]}")
     
     # フレーズデータ作成
-    print(f"\n🔧 フレーズJSON生成中...")
+    if verbose:
+        print(f"\n🔧 フレーズJSON生成中...")
     phrases_data = []
     
-    for i, (en, ja) in enumerate(zip(english_phrases, japanese_phrases), 1):
-        segments = create_segments_from_phrase(en, dictionary)
-        grammar_point = detect_grammar_point(en)
+    aligned_phrases = alignment.merged()
+    for i, (en, ja) in enumerate(aligned_phrases, 1):
+        segments, grammar_point = analyze_phrase(en, dictionary)
         
         phrase_obj = {
             "id": i,
@@ -274,17 +449,16 @@ def convert_preformatted_to_json(passage_file, translation_file, dictionary_file
         
         phrases_data.append(phrase_obj)
         
-        if i % 10 == 0:
-            print(f"  {i}/{len(english_phrases)} フレーズ処理完了")
+        if i % 10 == 0 and verbose:
+            print(f"  {i}/{len(aligned_phrases)} フレーズ処理完了")
     
     # 総単語数計算（句読点除く）
     total_words = sum(
-        len([s for s in p["segments"] if s["word"] not in ".,!?;:—\"'"])
+        len([s for s in p["segments"] if s["word"] not in PUNCTUATION])
         for p in phrases_data
     )
     
-    # JSON出力
-    passage_data = {
+    return {
         "id": passage_id,
         "title": first_line.replace('—', ' - '),
         "level": level,
@@ -292,26 +466,78 @@ def convert_preformatted_to_json(passage_file, translation_file, dictionary_file
         "actualWordCount": total_words,
         "phrases": phrases_data
     }
+
+
+def find_missing_words(passage_data):
+    """
+    辞書未登録単語を出現回数付きで返す
+
+    Returns:
+        Counter: 小文字化した単語 → 出現回数
+    """
+    missing_words = Counter()
+    for phrase in passage_data["phrases"]:
+        for segment in phrase["segments"]:
+            word = segment["word"]
+            if word not in PUNCTUATION and not segment["meaning"]:
+                missing_words[word.lower()] += 1
+    return missing_words
+
+
+def render_passage_json(passage_data, dictionary, dictionary_file, normalized=False,
+                        shared_dictionary=False):
+    """
+    出力用のJSON文字列を生成
+
+    Args:
+        normalized: Trueの場合、辞書参照形式（phrase_json.normalize_passage）で出力
+        shared_dictionary: normalized時、辞書と同一のエントリは辞書ファイルを参照する
+    """
+    output_data = passage_data
+    if normalized:
+        shared = dictionary if shared_dictionary else None
+        shared_sha256 = source_hash(dictionary_file) if shared_dictionary else None
+        output_data = normalize_passage(passage_data, shared, Path(dictionary_file).name, shared_sha256)
+    return json.dumps(output_data, ensure_ascii=False, indent=2)
+
+
+def convert_preformatted_to_json(passage_file, translation_file, dictionary_file, 
+                                  output_file, level, theme, normalized=False,
+                                  shared_dictionary=False):
+    """
+    改行済みファイルから直接JSON生成
+
+    Args:
+        normalized: Trueの場合、辞書参照形式（phrase_json.normalize_passage）で出力
+        shared_dictionary: normalized時、辞書と同一のエントリは辞書ファイルを参照する
+    """
     
+    print(f"📖 読み込み中...")
+    print(f"  英文: {passage_file}")
+    print(f"  全訳: {translation_file}")
+    print(f"  辞書: {dictionary_file}")
+    
+    dictionary = load_dictionary(dictionary_file)
+    passage_data = build_passage_data(passage_file, translation_file, dictionary, level, theme)
+    
+    text = render_passage_json(passage_data, dictionary, dictionary_file,
+                               normalized, shared_dictionary)
     with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(passage_data, f, ensure_ascii=False, indent=2)
+        f.write(text)
     
     print(f"\n✅ 生成完了!")
     print(f"  出力: {output_file}")
-    print(f"  フレーズ数: {len(phrases_data)}")
-    print(f"  総単語数: {total_words}")
+    print(f"  フレーズ数: {len(passage_data['phrases'])}")
+    print(f"  総単語数: {passage_data['actualWordCount']}")
+    if normalized:
+        print(f"  形式: 辞書参照")
     
     # 辞書未登録単語の確認
-    missing_words = set()
-    for phrase in phrases_data:
-        for segment in phrase["segments"]:
-            word = segment["word"]
-            if word not in ".,!?;:—\"'" and not segment["meaning"]:
-                missing_words.add(word.lower())
+    missing_words = find_missing_words(passage_data)
     
     if missing_words:
         print(f"\n⚠️  辞書未登録単語: {len(missing_words)}語")
-        print(f"  {', '.join(sorted(list(missing_words))[:10])}...")
+        print(f"  {', '.join(sorted(missing_words)[:10])}...")
     
     return passage_data
 
@@ -327,6 +553,10 @@ def main():
     parser.add_argument('--level', required=True, choices=['beginner', 'intermediate', 'advanced'], 
                        help='難易度レベル')
     parser.add_argument('--theme', default='', help='テーマ（任意）')
+    parser.add_argument('--normalized', action='store_true',
+                       help='辞書参照形式で出力（セグメントは辞書キーのみ）')
+    parser.add_argument('--shared-dictionary', action='store_true',
+                       help='--normalized時、辞書と同一のエントリは辞書ファイルを参照')
     
     args = parser.parse_args()
     
@@ -336,7 +566,9 @@ def main():
         args.dictionary,
         args.output,
         args.level,
-        args.theme
+        args.theme,
+        normalized=args.normalized,
+        shared_dictionary=args.shared_dictionary
     )
 
 
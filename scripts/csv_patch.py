@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+CSV修正スクリプト用のドライラン差分エンジン
+
+修正パスの前後の行データからセル単位の差分（行キー・列・旧値・新値）をメモリ上で計算し、
+JSONL形式またはunified diff形式で保存します。保存したJSONLパッチは、修正ロジックを
+再実行せずに後から適用できます（unified diff形式はレビュー用で、git apply で適用）。
+
+JSONLの1行（key_index は行キーの列番号）:
+    {"file": "public/data/vocabulary/x.csv", "line": 12, "key": "able",
+     "column": "読み", "old": "...", "new": "...", "key_index": 0}
+
+使用例:
+    # 修正スクリプト側
+    recorder = PatchRecorder(dry_run=True, patch_path=Path('fixes.jsonl'))
+    recorder.record(csv_file, original_rows, rows)
+    recorder.save()
+
+    # 保存したパッチの確認・適用
+    python3 scripts/csv_patch.py show fixes.jsonl
+    python3 scripts/csv_patch.py apply fixes.jsonl
+    python3 scripts/csv_patch.py apply fixes.jsonl --dry-run
+"""
+
+import argparse
+import csv
+import difflib
+import io
+import json
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from data_store import detect_lineterminator, dict_table, write_csv
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+class CellChange(NamedTuple):
+    """セル単位の変更"""
+
+    file: str
+    line: int
+    key: str
+    column: str
+    old: str
+    new: str
+    key_index: int = 0  # key の列（key_index のない古いパッチは語句列）
+
+
+def display_path(path: Path) -> str:
+    """リポジトリルートからの相対パス（ルート外は絶対パス）"""
+    resolved = Path(path).resolve()
+    if resolved.is_relative_to(BASE_DIR):
+        return resolved.relative_to(BASE_DIR).as_posix()
+    return str(resolved)
+
+
+def diff_rows(file: str, before: Sequence[Sequence[str]], after: Sequence[Sequence[str]],
+              key_index: int = 0) -> List[CellChange]:
+    """
+    ヘッダー付き行リストの前後比較からセル単位の差分を計算
+
+    Args:
+        file: 差分に記録するファイルパス
+        before: 修正前の行リスト（1行目はヘッダー）
+        after: 修正後の行リスト（行数は修正前と同じであること）
+        key_index: 行キーとして使う列（既定は語句列）
+
+    Returns:
+        list: CellChangeのリスト
+    """
+    if len(before) != len(after):
+        raise ValueError(f"{file}: 行数が変化する修正はセル差分で表現できません "
+                         f"({len(before)} → {len(after)})")
+    if not before:
+        return []
+
+    header = before[0]
+    changes = []
+    for line, (old_row, new_row) in enumerate(zip(before[1:], after[1:]), start=2):
+        if old_row == new_row:
+            continue
+        key = old_row[key_index] if len(old_row) > key_index else ''
+        for col in range(max(len(old_row), len(new_row))):
+            old = old_row[col] if col < len(old_row) else ''
+            new = new_row[col] if col < len(new_row) else ''
+            if old != new:
+                column = header[col] if col < len(header) else str(col)
+                changes.append(CellChange(file, line, key, column, old, new, key_index))
+    return changes
+
+
+def dict_rows(fieldnames: Sequence[str], rows: Iterable[Dict[str, str]]) -> List[List[str]]:
+    """csv.DictReader の行をヘッダー付き行リストに変換（write_csv_dicts と同じ列順、余分な列は ValueError）"""
+    return dict_table(fieldnames, rows)
+
+
+def rows_to_csv_lines(rows: Sequence[Sequence[str]], lineterminator: str = '\r\n') -> List[str]:
+    """行リストをCSVテキスト行に変換（unified diff用）"""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator=lineterminator).writerows(rows)
+    return buffer.getvalue().splitlines(keepends=True)
+
+
+def unified_diff(file: str, before: Sequence[Sequence[str]],
+                 after: Sequence[Sequence[str]], lineterminator: str = '\r\n') -> str:
+    """git apply で適用可能なunified diffを生成"""
+    return ''.join(difflib.unified_diff(
+        rows_to_csv_lines(before, lineterminator),
+        rows_to_csv_lines(after, lineterminator),
+        fromfile=f'a/{file}',
+        tofile=f'b/{file}',
+        n=1
+    ))
+
+
+class PatchRecorder:
+    """
+    修正パスの差分を記録するレコーダー
+
+    dry_run=True の場合、修正スクリプトはCSVを書き換えず record() だけを呼びます。
+    patch_path の拡張子が .patch / .diff ならunified diff、それ以外はJSONLで保存します。
+    """
+
+    def __init__(self, dry_run: bool = False, patch_path: Optional[Path] = None):
+        self.dry_run = dry_run
+        self.patch_path = Path(patch_path) if patch_path else None
+        self.changes: List[CellChange] = []
+        self._snapshots: Dict[str, Tuple[list, list, str]] = {}
+
+    def record(self, csv_path: Path, before: Sequence[Sequence[str]],
+               after: Sequence[Sequence[str]], key_index: int = 0) -> List[CellChange]:
+        """1ファイル分の前後データを記録し、セル差分を返す（書き換え前に呼ぶこと）"""
+        file = display_path(csv_path)
+        changes = diff_rows(file, before, after, key_index)
+        if changes:
+            self.changes.extend(changes)
+            lineterminator = detect_lineterminator(csv_path) if Path(csv_path).exists() else '\r\n'
+            self._snapshots[file] = ([list(r) for r in before], [list(r) for r in after], lineterminator)
+        return changes
+
+    @property
+    def is_unified(self) -> bool:
+        return self.patch_path is not None and self.patch_path.suffix in ('.patch', '.diff')
+
+    def save(self) -> Optional[Path]:
+        """記録した差分を patch_path に保存（patch_path 未指定なら何もしない）"""
+        if self.patch_path is None:
+            return None
+
+        self.patch_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.patch_path, 'w', encoding='utf-8', newline='') as f:
+            if self.is_unified:
+                for file, (before, after, lineterminator) in self._snapshots.items():
+                    f.write(unified_diff(file, before, after, lineterminator))
+            else:
+                for change in self.changes:
+                    f.write(json.dumps(change._asdict(), ensure_ascii=False) + '\n')
+
+        print(f"💾 差分を保存: {self.patch_path} ({len(self.changes)}セル)")
+        return self.patch_path
+
+
+def load_patch(patch_path: Path) -> List[CellChange]:
+    """JSONLパッチを読み込み"""
+    changes = []
+    with open(patch_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                changes.append(CellChange(**json.loads(line)))
+    return changes
+
+
+def _row_matches(row: List[str], change: CellChange, col: int) -> bool:
+    key = change.key_index
+    return (key < len(row) and row[key] == change.key
+            and col < len(row) and row[col] == change.old)
+
+
+def _locate_row(rows: List[List[str]], change: CellChange, col: int) -> Optional[int]:
+    """変更対象の行を特定（行番号優先、ずれていれば diff_rows と同じキー列と旧値で検索）"""
+    index = change.line - 1
+    if 0 < index < len(rows) and _row_matches(rows[index], change, col):
+        return index
+
+    for i, row in enumerate(rows[1:], start=1):
+        if _row_matches(row, change, col):
+            return i
+    return None
+
+
+def apply_patch(patch_path: Path, dry_run: bool = False) -> Tuple[int, List[CellChange]]:
+    """
+    保存したJSONLパッチをCSVに適用
+
+    旧値が一致しないセルは衝突として適用せずに返します。
+
+    Args:
+        patch_path: JSONLパッチのパス
+        dry_run: Trueの場合は適用可否の確認のみ
+
+    Returns:
+        tuple: (適用したセル数, 衝突したCellChangeのリスト)
+    """
+    by_file = defaultdict(list)
+    for change in load_patch(patch_path):
+        by_file[change.file].append(change)
+
+    applied = 0
+    conflicts = []
+    for file, changes in by_file.items():
+        csv_path = Path(file) if Path(file).is_absolute() else BASE_DIR / file
+        if not csv_path.exists():
+            conflicts.extend(changes)
+            continue
+
+        with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+            rows = list(csv.reader(f))
+        header = rows[0] if rows else []
+
+        file_applied = 0
+        for change in changes:
+            if change.column not in header:
+                conflicts.append(change)
+                continue
+            col = header.index(change.column)
+            index = _locate_row(rows, change, col)
+            if index is None:
+                conflicts.append(change)
+                continue
+            rows[index][col] = change.new
+            file_applied += 1
+
+        if file_applied and not dry_run:
+            write_csv(csv_path, rows, label='csv-patch')
+        applied += file_applied
+
+    return applied, conflicts
+
+
+def print_changes(changes: Sequence[CellChange], limit: Optional[int] = None):
+    """差分の一覧表示"""
+    shown = changes if limit is None else changes[:limit]
+    for change in shown:
+        print(f"  {Path(change.file).name}:{change.line} {change.key} [{change.column}]")
+        print(f"    {change.old} → {change.new}")
+    if limit is not None and len(changes) > limit:
+        print(f"  ... 他{len(changes) - limit}件")
+
+
+def add_patch_arguments(parser: argparse.ArgumentParser):
+    """修正スクリプト共通の --dry-run / --patch オプションを追加"""
+    parser.add_argument('--dry-run', action='store_true',
+                        help='CSVを書き換えずに差分のみ計算')
+    parser.add_argument('--patch', type=str,
+                        help='差分の保存先（.jsonl: 後から適用可能 / .patch: unified diff）')
+
+
+def recorder_from_args(args: argparse.Namespace) -> PatchRecorder:
+    """add_patch_arguments で追加したオプションからレコーダーを生成"""
+    return PatchRecorder(dry_run=args.dry_run, patch_path=Path(args.patch) if args.patch else None)
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='CSV修正パッチの確認・適用')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    show_parser = subparsers.add_parser('show', help='パッチの内容を表示')
+    show_parser.add_argument('patch', help='JSONLパッチ')
+
+    apply_parser = subparsers.add_parser('apply', help='パッチをCSVに適用')
+    apply_parser.add_argument('patch', help='JSONLパッチ')
+    apply_parser.add_argument('--dry-run', action='store_true', help='適用可否の確認のみ')
+
+    args = parser.parse_args()
+    patch_path = Path(args.patch)
+    if not patch_path.exists():
+        print(f"❌ パッチが見つかりません: {patch_path}", file=sys.stderr)
+        return 1
+
+    if args.command == 'show':
+        changes = load_patch(patch_path)
+        print(f"📋 {patch_path.name}: {len(changes)}セル / "
+              f"{len({c.file for c in changes})}ファイル")
+        print_changes(changes)
+        return 0
+
+    applied, conflicts = apply_patch(patch_path, dry_run=args.dry_run)
+    mode = '（dry-run）' if args.dry_run else ''
+    print(f"✅ 適用{mode}: {applied}セル")
+    if conflicts:
+        print(f"⚠️  衝突: {len(conflicts)}セル（旧値が一致しないため未適用）")
+        print_changes(conflicts, limit=15)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+データファイルのアトミック書き込み・重複排除バックアップ層
+
+修正スクリプトがCSV/JSONを書き換える際の共通処理:
+- 出力バイト列が既存ファイルと同一なら書き込み自体をスキップ（ビルドキャッシュを壊さない）
+- 同じディレクトリの一時ファイルに書いてから os.replace で置き換え（途中失敗で壊れない）
+- 書き換え前の内容を tools/data/backups/ のコンテンツアドレス型ストアに保存
+  （SHA-256で重複排除し、ファイルごとに保持世代数を制限）
+- Prettier で整形済みのJSON（文法問題データなど）は format_json で同じ形式に書き戻す
+
+バックアップストアの構成:
+    tools/data/backups/
+    ├── index.json          # 世代一覧（source, sha256, label, created）
+    └── objects/ab/abcd...  # 内容ハッシュ名のファイル本体
+
+使用例:
+    from data_store import write_csv
+
+    write_csv(csv_file, rows, label='katakana-clean')
+
+    python3 scripts/data_store.py list
+    python3 scripts/data_store.py restore public/data/vocabulary/x.csv
+    python3 scripts/data_store.py prune --keep 5
+"""
+
+import argparse
+import csv
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unicodedata
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+BACKUP_DIR = BASE_DIR / 'tools' / 'data' / 'backups'
+
+# ファイルごとに保持するバックアップ世代数
+DEFAULT_KEEP = 10
+
+# .prettierrc の printWidth / tabWidth
+PRINT_WIDTH = 80
+INDENT = '  '
+
+
+def _read_umask() -> int:
+    # os.umask は設定と取得を兼ねるため、読み取ったらすぐ元に戻す
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# 新規ファイルのパーミッション（open() で作成した場合と同じ 0o666 & ~umask）
+NEW_FILE_MODE = 0o666 & ~_read_umask()
+
+
+def content_hash(data: bytes) -> str:
+    """内容のSHA-256"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def detect_lineterminator(csv_path: Path) -> str:
+    """CSVファイルの改行コードを判定（CRLF / LF）"""
+    with open(csv_path, 'rb') as f:
+        first_line = f.readline()
+    return '\r\n' if first_line.endswith(b'\r\n') else '\n'
+
+
+def _source_key(path: Path) -> str:
+    resolved = Path(path).resolve()
+    if resolved.is_relative_to(BASE_DIR):
+        return resolved.relative_to(BASE_DIR).as_posix()
+    return str(resolved)
+
+
+class BackupStore:
+    """コンテンツアドレス型のバックアップストア"""
+
+    def __init__(self, root: Path = BACKUP_DIR, keep: int = DEFAULT_KEEP):
+        self.root = Path(root)
+        self.keep = keep
+        self.index_path = self.root / 'index.json'
+        self.objects_dir = self.root / 'objects'
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def load_index(self) -> List[Dict[str, str]]:
+        if not self.index_path.exists():
+            return []
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('backups', [])
+        except (json.JSONDecodeError, OSError):
+            return []
+
+    def _save_index(self, entries: List[Dict[str, str]]):
+        data = json.dumps({'backups': entries}, ensure_ascii=False, indent=2) + '\n'
+        atomic_write_bytes(self.index_path, data.encode('utf-8'), backup=False)
+
+    def backup(self, path: Path, data: Optional[bytes] = None, label: str = '') -> Optional[str]:
+        """
+        ファイル内容をストアに保存
+
+        同じ内容のオブジェクトが既にあれば本体はコピーせず、直前の世代と同じ内容なら
+        世代も追加しません。
+
+        Args:
+            path: バックアップ対象のファイル
+            data: ファイル内容（読み込み済みの場合）
+            label: 修正スクリプト名などの識別ラベル
+
+        Returns:
+            str: 内容ハッシュ（ファイルが存在しない場合はNone）
+        """
+        path = Path(path)
+        if data is None:
+            if not path.exists():
+                return None
+            data = path.read_bytes()
+
+        digest = content_hash(data)
+        object_path = self._object_path(digest)
+        if not object_path.exists():
+            atomic_write_bytes(object_path, data, backup=False)
+
+        source = _source_key(path)
+        entries = self.load_index()
+        history = [e for e in entries if e['source'] == source]
+        if history and history[-1]['sha256'] == digest:
+            return digest
+
+        entries.append({
+            'source': source,
+            'sha256': digest,
+            'label': label,
+            'created': datetime.now().isoformat(timespec='seconds'),
+        })
+        self._save_index(self._apply_retention(entries))
+        return digest
+
+    def _apply_retention(self, entries: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """ファイルごとに新しい keep 世代だけを残し、参照されないオブジェクトを削除"""
+        counts: Dict[str, int] = {}
+        kept = []
+        for entry in reversed(entries):
+            count = counts.get(entry['source'], 0)
+            if count < self.keep:
+                kept.append(entry)
+                counts[entry['source']] = count + 1
+        kept.reverse()
+
+        referenced = {e['sha256'] for e in kept}
+        for entry in entries:
+            digest = entry['sha256']
+            if digest not in referenced:
+                object_path = self._object_path(digest)
+                object_path.unlink(missing_ok=True)
+                if object_path.parent.exists() and not any(object_path.parent.iterdir()):
+                    object_path.parent.rmdir()
+                referenced.add(digest)  # 同じハッシュを二度削除しない
+        return kept
+
+    def prune(self, keep: Optional[int] = None) -> int:
+        """保持世代数を適用し、削除した世代数を返す"""
+        if keep is not None:
+            self.keep = keep
+        entries = self.load_index()
+        kept = self._apply_retention(entries)
+        if len(kept) != len(entries):
+            self._save_index(kept)
+        return len(entries) - len(kept)
+
+    def history(self, path: Optional[Path] = None) -> List[Dict[str, str]]:
+        """世代一覧（path指定時はそのファイルのみ）"""
+        entries = self.load_index()
+        if path is None:
+            return entries
+        source = _source_key(path)
+        return [e for e in entries if e['source'] == source]
+
+    def restore(self, path: Path, digest: Optional[str] = None) -> Optional[str]:
+        """
+        バックアップから復元（digest省略時は最新世代）
+
+        Returns:
+            str: 復元した内容ハッシュ（該当世代がない場合はNone）
+        """
+        history = self.history(path)
+        if digest:
+            history = [e for e in history if e['sha256'].startswith(digest)]
+        if not history:
+            return None
+
+        entry = history[-1]
+        data = self._object_path(entry['sha256']).read_bytes()
+        atomic_write_bytes(path, data, store=self, label='restore')
+        return entry['sha256']
+
+
+def atomic_write_bytes(path: Path, data: bytes, backup: bool = True,
+                       label: str = '', store: Optional[BackupStore] = None) -> bool:
+    """
+    バイト列をアトミックに書き込み
+
+    既存ファイルと内容が同じ場合は何もしません。
+
+    Args:
+        path: 書き込み先
+        data: 書き込む内容
+        backup: 既存ファイルをバックアップストアに保存するか
+        label: バックアップのラベル
+        store: 使用するバックアップストア（省略時は既定のストア）
+
+    Returns:
+        bool: 実際に書き込んだか
+    """
+    path = Path(path)
+    existing = path.read_bytes() if path.exists() else None
+    if existing == data:
+        return False
+
+    if backup and existing is not None:
+        (store or BackupStore()).backup(path, existing, label=label)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp の一時ファイルは 0600 なので、既存ファイルのモードか新規ファイルの既定モードに揃える
+        mode = path.stat().st_mode & 0o777 if existing is not None else NEW_FILE_MODE
+        os.chmod(tmp_name, mode)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return True
+
+
+def write_text(path: Path, text: str, label: str = '', backup: bool = True) -> bool:
+    """テキスト（UTF-8）をアトミックに書き込み"""
+    return atomic_write_bytes(path, text.encode('utf-8'), backup=backup, label=label)
+
+
+def write_json(path: Path, data, label: str = '', backup: bool = True, indent: int = 2) -> bool:
+    """JSONをアトミックに書き込み（json.dump(..., ensure_ascii=False, indent=2) と同じ出力）"""
+    text = json.dumps(data, ensure_ascii=False, indent=indent)
+    return write_text(path, text, label=label, backup=backup)
+
+
+def _display_width(text: str) -> int:
+    """表示幅（全角文字は2、結合文字は0）"""
+    return sum(0 if unicodedata.combining(char) else
+               2 if unicodedata.east_asian_width(char) in ('W', 'F') else 1
+               for char in text)
+
+
+def _format_value(value, depth: int, column: int, suffix: int) -> str:
+    # column: 値の開始位置、suffix: 値のあとに続く文字数（カンマ）
+    if isinstance(value, dict):
+        if not value:
+            return '{}'
+        inner = INDENT * (depth + 1)
+        lines = []
+        for number, (key, item) in enumerate(value.items(), 1):
+            prefix = inner + json.dumps(key, ensure_ascii=False) + ': '
+            comma = ',' if number < len(value) else ''
+            lines.append(prefix + _format_value(item, depth + 1, _display_width(prefix), len(comma)) + comma)
+        return '{\n' + '\n'.join(lines) + '\n' + INDENT * depth + '}'
+
+    if isinstance(value, list):
+        if not value:
+            return '[]'
+        if not any(isinstance(item, (dict, list)) for item in value):
+            inline = '[' + ', '.join(json.dumps(item, ensure_ascii=False) for item in value) + ']'
+            if column + _display_width(inline) + suffix <= PRINT_WIDTH:
+                return inline
+        inner = INDENT * (depth + 1)
+        lines = []
+        for number, item in enumerate(value, 1):
+            comma = ',' if number < len(value) else ''
+            lines.append(inner + _format_value(item, depth + 1, len(inner), len(comma)) + comma)
+        return '[\n' + '\n'.join(lines) + '\n' + INDENT * depth + ']'
+
+    return json.dumps(value, ensure_ascii=False)
+
+
+def format_json(data) -> str:
+    """
+    Prettier（.prettierrc）と同じ形式のJSON文字列
+
+    オブジェクトは常に展開し、スカラー値だけの配列は printWidth に収まれば1行で書きます。
+    キーの順序は data のまま保ちます。
+
+    Returns:
+        str: 末尾に改行を付けたJSON
+    """
+    return _format_value(data, 0, 0, 0) + '\n'
+
+
+def write_pretty_json(path: Path, data, label: str = '', backup: bool = True) -> bool:
+    """format_json の形式でアトミックに書き込み（Prettier で整形済みのデータファイル用）"""
+    return write_text(path, format_json(data), label=label, backup=backup)
+
+
+def serialize_csv(rows: Iterable[Sequence[str]], lineterminator: str = '\r\n') -> bytes:
+    """行リストをCSVバイト列に変換"""
+    buffer = io.StringIO()
+    csv.writer(buffer, lineterminator=lineterminator).writerows(rows)
+    return buffer.getvalue().encode('utf-8')
+
+
+def write_csv(path: Path, rows: Iterable[Sequence[str]], label: str = '',
+              backup: bool = True) -> bool:
+    """
+    行リストをCSVとしてアトミックに書き込み
+
+    既存ファイルの改行コードを維持し、出力が同一なら書き込みません。
+
+    Returns:
+        bool: 実際に書き込んだか
+    """
+    path = Path(path)
+    lineterminator = detect_lineterminator(path) if path.exists() else '\r\n'
+    return atomic_write_bytes(path, serialize_csv(rows, lineterminator),
+                              backup=backup, label=label)
+
+
+def dict_table(fieldnames: Sequence[str], rows: Iterable[Dict[str, str]]) -> List[List[str]]:
+    """
+    辞書の行をヘッダー付き行リストに変換（csv.DictWriter の extrasaction='raise' と同じ扱い）
+
+    fieldnames にないキー（csv.DictReader が列数の多い行の余りを入れる None キーを含む）が
+    ある行は、セルを黙って落とさないよう ValueError にします。
+
+    Raises:
+        ValueError: fieldnames にないキーを持つ行がある場合
+    """
+    names = list(fieldnames)
+    known = set(names)
+    table = [names]
+    for number, row in enumerate(rows, start=2):
+        extra = [key for key in row if key not in known]
+        if extra:
+            raise ValueError(f"{number}行目に fieldnames にない列があります: {', '.join(map(repr, extra))}")
+        table.append([row.get(name, '') for name in names])
+    return table
+
+
+def write_csv_dicts(path: Path, fieldnames: Sequence[str], rows: Iterable[Dict[str, str]],
+                    label: str = '', backup: bool = True) -> bool:
+    """
+    csv.DictWriter と同じ形式でアトミックに書き込み
+
+    Raises:
+        ValueError: fieldnames にないキーを持つ行がある場合（dict_table）
+    """
+    return write_csv(path, dict_table(fieldnames, rows), label=label, backup=backup)
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='データファイルのバックアップ管理')
+    parser.add_argument('--store', type=str, help='バックアップストアのディレクトリ')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = subparsers.add_parser('list', help='バックアップ世代を一覧表示')
+    list_parser.add_argument('file', nargs='?', help='対象ファイル（省略時は全件）')
+
+    restore_parser = subparsers.add_parser('restore', help='バックアップから復元')
+    restore_parser.add_argument('file', help='復元するファイル')
+    restore_parser.add_argument('--sha', help='復元する世代のハッシュ（先頭一致、省略時は最新）')
+
+    prune_parser = subparsers.add_parser('prune', help='保持世代数を超えたバックアップを削除')
+    prune_parser.add_argument('--keep', type=int, default=DEFAULT_KEEP, help='ファイルごとの保持世代数')
+
+    args = parser.parse_args()
+    store = BackupStore(Path(args.store)) if args.store else BackupStore()
+
+    if args.command == 'list':
+        entries = store.history(Path(args.file) if args.file else None)
+        for entry in entries:
+            print(f"  {entry['created']}  {entry['sha256'][:12]}  {entry['source']}"
+                  f"{'  [' + entry['label'] + ']' if entry.get('label') else ''}")
+        print(f"📦 {len(entries)}世代")
+        return 0
+
+    if args.command == 'restore':
+        digest = store.restore(Path(args.file), args.sha)
+        if digest is None:
+            print(f"❌ バックアップが見つかりません: {args.file}", file=sys.stderr)
+            return 1
+        print(f"✅ 復元: {args.file} ← {digest[:12]}")
+        return 0
+
+    removed = store.prune(args.keep)
+    print(f"🧹 {removed}世代を削除（保持: {args.keep}世代/ファイル）")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
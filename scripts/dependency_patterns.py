@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+passage-parses（UD依存解析）に対する依存パターン検索と文法ポイント索引
+
+本文の正規表現ではなく依存構造から文法ポイントを検出します。パターンは小さな
+記法からマッチャーにコンパイルし、全パッセージの全文を1回の走査で照合します。
+
+パターン記法:
+    node (('>' | '<') node)*
+
+    node       := 条件 ('&' 条件)*
+    条件       := field '=' 値 ('|' 値)*      # いずれかに一致
+                | field '^=' 接頭辞           # 接頭辞で一致
+    field      := text / lemma / upos / xpos / deprel
+
+    最初の node が起点のトークン（アンカー）です。
+    '> X' はアンカーが X に一致する子を持つこと、'< X' はアンカーの親が X に一致することを表します。
+
+例:
+    'deprel=aux:pass < xpos=VBN'                  # 受動態（aux:pass の親が過去分詞）
+    'deprel=acl:relcl'                            # 関係詞節
+    'deprel=advcl > deprel=mark&lemma=because'    # because節
+    'upos=VERB > deprel=iobj > deprel=obj'        # SVOO（子に iobj と obj の両方）
+
+照合の高速化:
+- 文ごとに 親 → 子 の索引を一度だけ作成
+- アンカーの等値条件（deprel=..., xpos=... など）でパターンを振り分け、
+  各トークンでは該当しうるパターンだけを検査
+
+出力（tools/data/grammar_point_index.json）:
+    {"patterns": {"受動態": {"pattern": "...", "count": 3,
+                             "passages": {"J_2022_5": [4, 12]}}}}   # パターン → 文ID
+
+使用例:
+    python3 scripts/dependency_patterns.py                       # 索引を生成
+    python3 scripts/dependency_patterns.py --show 受動態          # 該当文を表示
+    python3 scripts/dependency_patterns.py --query 'deprel=advcl > deprel=mark&lemma=if'
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from data_store import write_json
+from passage_parse_store import load_parse
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+PARSES_DIR = BASE_DIR / 'public' / 'data' / 'passage-parses'
+INDEX_PATH = BASE_DIR / 'tools' / 'data' / 'grammar_point_index.json'
+
+FIELDS = ('text', 'lemma', 'upos', 'xpos', 'deprel')
+
+# アンカーの振り分けに使うフィールド（優先順）
+DISPATCH_FIELDS = ('deprel', 'xpos', 'lemma', 'upos', 'text')
+
+# 文法ポイント → パターン（表示名は convert_preformatted_to_json の grammarPoint に合わせる）
+GRAMMAR_PATTERNS: Dict[str, str] = {
+    '受動態': 'deprel=aux:pass < xpos=VBN',
+    '現在完了': 'xpos=VBN > deprel=aux&lemma=have',
+    '進行形': 'xpos=VBG > deprel=aux&lemma=be',
+    '助動詞': 'deprel=aux&xpos=MD',
+    '不定詞': 'deprel=mark&lemma=to&xpos=TO',
+    '関係代名詞節': 'deprel=acl:relcl',
+    'that節': 'deprel=ccomp > deprel=mark&lemma=that',
+    'when節': 'deprel=advcl > deprel=advmod|mark&lemma=when',
+    'if節': 'deprel=advcl > deprel=mark&lemma=if',
+    'because節': 'deprel=advcl > deprel=mark&lemma=because',
+    '比較級': 'xpos=JJR|RBR',
+    '最上級': 'xpos=JJS|RBS',
+    'there構文': 'deprel=expl&lemma=there',
+    '間接疑問文': 'deprel=ccomp > xpos=WRB|WP|WDT',
+    'SVOO': 'upos=VERB > deprel=iobj > deprel=obj',
+    'SVOC': 'upos=VERB > deprel=obj > deprel=xcomp',
+}
+
+_CONDITION_RE = re.compile(r'^(\w+)\s*(\^?=)\s*(.+)$')
+
+# トークン: (text, lemma, upos, xpos, deprel, head)
+Token = Tuple[str, str, str, str, str, int]
+NodeMatcher = Callable[[Token], bool]
+
+
+class Condition(NamedTuple):
+    """1つのフィールド条件"""
+
+    field: int
+    values: frozenset
+    prefix: bool
+
+
+class CompiledPattern(NamedTuple):
+    """コンパイル済みパターン"""
+
+    label: str
+    source: str
+    anchor: NodeMatcher
+    children: Tuple[NodeMatcher, ...]
+    head: Optional[NodeMatcher]
+    dispatch: Optional[Tuple[int, frozenset]]
+
+
+def _compile_node(text: str) -> Tuple[NodeMatcher, List[Condition]]:
+    conditions = []
+    for part in text.split('&'):
+        match = _CONDITION_RE.match(part.strip())
+        if not match:
+            raise ValueError(f"条件の形式が不正です: {part!r}")
+        field, operator, values = match.groups()
+        if field not in FIELDS:
+            raise ValueError(f"未対応のフィールドです: {field}（{', '.join(FIELDS)}）")
+        conditions.append(Condition(FIELDS.index(field),
+                                    frozenset(v.strip() for v in values.split('|')),
+                                    operator == '^='))
+
+    def matcher(token: Token) -> bool:
+        for condition in conditions:
+            value = token[condition.field]
+            if condition.prefix:
+                if not any(value.startswith(v) for v in condition.values):
+                    return False
+            elif value not in condition.values:
+                return False
+        return True
+
+    return matcher, conditions
+
+
+def compile_pattern(label: str, source: str) -> CompiledPattern:
+    """
+    パターン記法をマッチャーにコンパイル
+
+    Args:
+        label: 文法ポイント名
+        source: パターン（例: 'deprel=advcl > deprel=mark&lemma=because'）
+
+    Returns:
+        CompiledPattern: コンパイル済みパターン
+    """
+    parts = re.split(r'\s*([<>])\s*', source.strip())
+    anchor, anchor_conditions = _compile_node(parts[0])
+    children = []
+    head = None
+    for relation, node in zip(parts[1::2], parts[2::2]):
+        matcher, _ = _compile_node(node)
+        if relation == '>':
+            children.append(matcher)
+        elif head is not None:
+            raise ValueError(f"親の条件（<）は1つだけ指定できます: {source}")
+        else:
+            head = matcher
+
+    dispatch = None
+    for field in DISPATCH_FIELDS:
+        index = FIELDS.index(field)
+        equal = [c for c in anchor_conditions if c.field == index and not c.prefix]
+        if equal:
+            dispatch = (index, equal[0].values)
+            break
+    return CompiledPattern(label, source, anchor, tuple(children), head, dispatch)
+
+
+class PatternSet:
+    """コンパイル済みパターンの集合（アンカー条件で振り分けて照合）"""
+
+    def __init__(self, patterns: Dict[str, str] = GRAMMAR_PATTERNS):
+        self.patterns = [compile_pattern(label, source) for label, source in patterns.items()]
+        self._dispatch: Dict[Tuple[int, str], List[CompiledPattern]] = {}
+        self._always: List[CompiledPattern] = []
+        for pattern in self.patterns:
+            if pattern.dispatch is None:
+                self._always.append(pattern)
+                continue
+            field, values = pattern.dispatch
+            for value in values:
+                self._dispatch.setdefault((field, value), []).append(pattern)
+        self._fields = sorted({field for field, _ in self._dispatch})
+
+    def match_sentence(self, tokens: List[Token]) -> Dict[str, List[int]]:
+        """
+        1文の全パターンを照合
+
+        Args:
+            tokens: トークン列（head は 1 始まりのトークンID、0 は根）
+
+        Returns:
+            dict: 文法ポイント → アンカーのトークンID
+        """
+        children: List[List[int]] = [[] for _ in range(len(tokens) + 1)]
+        for i, token in enumerate(tokens):
+            head = token[5]
+            if 0 <= head <= len(tokens):
+                children[head].append(i)
+
+        hits: Dict[str, List[int]] = {}
+        for i, token in enumerate(tokens):
+            candidates = list(self._always)
+            for field in self._fields:
+                candidates.extend(self._dispatch.get((field, token[field]), ()))
+            for pattern in candidates:
+                if not pattern.anchor(token):
+                    continue
+                if pattern.head is not None:
+                    head = token[5]
+                    if not 1 <= head <= len(tokens) or not pattern.head(tokens[head - 1]):
+                        continue
+                kids = children[i + 1]
+                if all(any(child(tokens[k]) for k in kids) for child in pattern.children):
+                    hits.setdefault(pattern.label, []).append(i + 1)
+        return hits
+
+
+def sentence_tokens(sentence) -> List[Token]:
+    """解析JSONの文（dict / SentenceView）を照合用のタプル列に変換"""
+    tokens = []
+    for token in sentence.get('tokens', []):
+        head = token.get('head')
+        tokens.append((
+            token.get('text', '') or '',
+            (token.get('lemma', '') or '').lower(),
+            token.get('upos', '') or '',
+            token.get('xpos', '') or '',
+            token.get('deprel', '') or '',
+            head if isinstance(head, int) else -1,
+        ))
+    return tokens
+
+
+def build_index(patterns: PatternSet, parses_dir: Path = PARSES_DIR) -> Tuple[dict, Dict[str, dict]]:
+    """
+    全パッセージの全文を照合して文法ポイント索引を作成
+
+    Returns:
+        tuple: (索引, パッセージID → {文ID: 文の本文})
+    """
+    result = {p.label: {'pattern': p.source, 'count': 0, 'passages': {}} for p in patterns.patterns}
+    texts: Dict[str, dict] = {}
+    for parse_path in sorted(parses_dir.glob('*.json')):
+        parse = load_parse(parse_path)
+        passage_id = parse.passage_id or parse_path.stem
+        texts[passage_id] = {}
+        for sentence in parse.sentences:
+            sentence_id = sentence.get('id')
+            texts[passage_id][sentence_id] = sentence.get('text', '')
+            for label, anchors in patterns.match_sentence(sentence_tokens(sentence)).items():
+                entry = result[label]
+                entry['count'] += len(anchors)
+                entry['passages'].setdefault(passage_id, []).append(sentence_id)
+    return {'patterns': result}, texts
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='依存パターンによる文法ポイント索引')
+    parser.add_argument('--parses-dir', type=str, help='UD依存解析JSONのディレクトリ')
+    parser.add_argument('--output', type=str, help='索引の出力先')
+    parser.add_argument('--show', nargs='+', metavar='LABEL', help='文法ポイントの該当文を表示')
+    parser.add_argument('--query', type=str, help='任意のパターンで検索（索引は書き出さない）')
+
+    args = parser.parse_args()
+    parses_dir = Path(args.parses_dir) if args.parses_dir else PARSES_DIR
+    output_path = Path(args.output) if args.output else INDEX_PATH
+
+    try:
+        patterns = PatternSet({'query': args.query} if args.query else GRAMMAR_PATTERNS)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    index, texts = build_index(patterns, parses_dir)
+    labels = ['query'] if args.query else (args.show or [])
+    if not args.query:
+        write_json(output_path, index, backup=False)
+        print(f"✅ 文法ポイント索引: {len(texts)}パッセージ / {len(patterns.patterns)}パターン")
+        print(f"  出力: {output_path}")
+        for label, entry in index['patterns'].items():
+            sentences = sum(len(ids) for ids in entry['passages'].values())
+            print(f"  {label:12s} {entry['count']:4d}件 / {sentences:4d}文")
+
+    for label in labels:
+        entry = index['patterns'].get(label)
+        if entry is None:
+            print(f"❓ {label}: 未定義の文法ポイント")
+            continue
+        print(f"\n🔍 {label}（{entry['pattern']}）")
+        for passage_id, sentence_ids in entry['passages'].items():
+            for sentence_id in sentence_ids:
+                print(f"  {passage_id}#{sentence_id}: {texts[passage_id][sentence_id]}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
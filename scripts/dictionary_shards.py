@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+長文読解辞書のシャード分割と遅延ロード
+
+reading-passages-dictionary.json（約3MB・7,000語超）をキーの先頭文字ごとの
+シャードに分割し、小さなマニフェストと各シャードの内容ハッシュを出力します。
+エントリ数が多い先頭文字は先頭2文字でさらに分割します。
+
+出力構成（辞書ファイル名の拡張子を除いたディレクトリ）:
+    public/data/dictionaries/reading-passages-dictionary/
+    ├── manifest.json   # {"sourceSha256", "count", "shards": {"a": {"file", "sha256", "count"}}}
+    ├── a.json
+    ├── ca.json
+    └── _.json          # 英字以外で始まるキー
+
+検索APIは必要なシャードだけを読み込み、プロセス内でキャッシュします
+（同じシャードは内容ハッシュが変わらない限り再解析しません）。
+
+使用例:
+    from dictionary_shards import open_dictionary
+
+    dictionary = open_dictionary(DICTIONARY_PATH)   # シャードがなければ単一JSONを読み込み
+    dictionary.get('morning')
+
+    python3 scripts/dictionary_shards.py              # シャードを生成（辞書が未変更ならスキップ）
+    python3 scripts/dictionary_shards.py --force      # 強制的に再生成
+    python3 scripts/dictionary_shards.py --lookup morning routine
+"""
+
+import argparse
+import json
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+from data_store import content_hash, write_text
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DICTIONARY_PATH = BASE_DIR / 'public' / 'data' / 'dictionaries' / 'reading-passages-dictionary.json'
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 1
+
+# 1シャードあたりの目安エントリ数（超える先頭文字は先頭2文字で分割）
+DEFAULT_MAX_ENTRIES = 400
+
+# 英字以外で始まるキーのシャード
+OTHER_SHARD = '_'
+
+# (シャードファイル, 内容ハッシュ) → エントリ（プロセス内キャッシュ）
+_SHARD_CACHE: Dict[Tuple[str, str], Dict[str, dict]] = {}
+
+
+def shard_dir_for(dictionary_path: Path) -> Path:
+    """辞書ファイルに対応するシャードディレクトリ"""
+    dictionary_path = Path(dictionary_path)
+    return dictionary_path.parent / dictionary_path.stem
+
+
+def _first_letter(key: str) -> str:
+    head = key[:1].lower()
+    return head if 'a' <= head <= 'z' else OTHER_SHARD
+
+
+def shard_for_key(key: str, shard_names: Iterable[str]) -> str:
+    """キーが属するシャード名（先頭2文字 → 先頭1文字 → その他 の順に一致を探す）"""
+    names = shard_names if isinstance(shard_names, (set, frozenset, dict)) else set(shard_names)
+    head = _first_letter(key)
+    if head == OTHER_SHARD:
+        return OTHER_SHARD
+    prefix = key[:2].lower()
+    if prefix in names:
+        return prefix
+    return head
+
+
+def plan_shards(keys: Iterable[str], max_entries: int = DEFAULT_MAX_ENTRIES) -> Dict[str, list]:
+    """
+    キーをシャードに振り分け
+
+    Args:
+        keys: 辞書キー
+        max_entries: 先頭1文字のシャードがこの数を超えたら先頭2文字で分割
+
+    Returns:
+        dict: シャード名 → キーのリスト（辞書の出現順）
+    """
+    by_letter: Dict[str, list] = {}
+    for key in keys:
+        by_letter.setdefault(_first_letter(key), []).append(key)
+
+    shards: Dict[str, list] = {}
+    for letter, letter_keys in by_letter.items():
+        if letter == OTHER_SHARD or len(letter_keys) <= max_entries:
+            shards[letter] = letter_keys
+            continue
+        for key in letter_keys:
+            # 1文字だけのキー（"a" など）は先頭1文字のシャードに残す
+            name = key[:2].lower() if len(key) > 1 else letter
+            shards.setdefault(name, []).append(key)
+    return dict(sorted(shards.items()))
+
+
+def _serialize(data) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def load_manifest(shard_dir: Path) -> Optional[dict]:
+    """マニフェストを読み込み（存在しない・形式が古い場合はNone）"""
+    manifest_path = Path(shard_dir) / MANIFEST_NAME
+    if not manifest_path.exists():
+        return None
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return None
+    return manifest if manifest.get('version') == MANIFEST_VERSION else None
+
+
+def build_shards(dictionary_path: Path = DICTIONARY_PATH, shard_dir: Optional[Path] = None,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, force: bool = False) -> Tuple[dict, bool]:
+    """
+    辞書をシャードに分割して書き出し
+
+    辞書の内容ハッシュがマニフェストと同じで、シャードが揃っていれば何もしません。
+
+    Args:
+        dictionary_path: 単一JSONの辞書
+        shard_dir: 出力先（省略時は辞書ファイル名の拡張子を除いたディレクトリ）
+        max_entries: 1シャードあたりの目安エントリ数
+        force: Trueの場合は常に再生成
+
+    Returns:
+        tuple: (マニフェスト, 再生成したか)
+    """
+    dictionary_path = Path(dictionary_path)
+    shard_dir = Path(shard_dir) if shard_dir else shard_dir_for(dictionary_path)
+
+    source_bytes = dictionary_path.read_bytes()
+    source_hash = content_hash(source_bytes)
+    manifest = load_manifest(shard_dir)
+    if (not force and manifest
+            and manifest.get('sourceSha256') == source_hash
+            and manifest.get('maxEntries') == max_entries
+            and all((shard_dir / s['file']).exists() for s in manifest['shards'].values())):
+        return manifest, False
+
+    dictionary = json.loads(source_bytes)
+    shards = {}
+    for name, keys in plan_shards(dictionary, max_entries).items():
+        text = _serialize({key: dictionary[key] for key in keys})
+        file_name = f'{name}.json'
+        write_text(shard_dir / file_name, text, backup=False)
+        shards[name] = {
+            'file': file_name,
+            'sha256': content_hash(text.encode('utf-8')),
+            'count': len(keys),
+        }
+
+    # 分割方針の変更で不要になったシャードを削除
+    expected = {s['file'] for s in shards.values()} | {MANIFEST_NAME}
+    for stale in shard_dir.glob('*.json'):
+        if stale.name not in expected:
+            stale.unlink()
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'source': dictionary_path.name,
+        'sourceSha256': source_hash,
+        'count': len(dictionary),
+        'maxEntries': max_entries,
+        'shards': shards,
+    }
+    write_text(shard_dir / MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2) + '\n',
+               backup=False)
+    return manifest, True
+
+
+class ShardedDictionary:
+    """
+    シャード分割された辞書の遅延ロード
+
+    dict と同じ get / in / [] で参照でき、必要なシャードだけを読み込みます。
+    読み込んだシャードはモジュールのキャッシュに内容ハッシュ付きで保持し、
+    別のインスタンスからも再利用します。
+    """
+
+    def __init__(self, shard_dir: Path, manifest: Optional[dict] = None):
+        self.shard_dir = Path(shard_dir)
+        self.manifest = manifest or load_manifest(self.shard_dir)
+        if self.manifest is None:
+            raise FileNotFoundError(f"シャードのマニフェストが見つかりません: {self.shard_dir / MANIFEST_NAME}")
+        self.shards = self.manifest['shards']
+
+    def __len__(self) -> int:
+        return self.manifest['count']
+
+    @property
+    def loaded_shards(self) -> list:
+        """このディレクトリで読み込み済みのシャード名"""
+        files = {str(self.shard_dir / s['file']): name for name, s in self.shards.items()}
+        return sorted(files[path] for path, _ in _SHARD_CACHE if path in files)
+
+    def _load_shard(self, name: str) -> Dict[str, dict]:
+        info = self.shards.get(name)
+        if info is None:
+            return {}
+        path = self.shard_dir / info['file']
+        cache_key = (str(path), info['sha256'])
+        cached = _SHARD_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
+        data = path.read_bytes()
+        if content_hash(data) != info['sha256']:
+            raise ValueError(f"シャードの内容ハッシュがマニフェストと一致しません: {path}"
+                             f"（dictionary_shards.py で再生成してください）")
+        entries = json.loads(data)
+        _SHARD_CACHE[cache_key] = entries
+        return entries
+
+    def get(self, key: str, default=None):
+        """キーのエントリを取得（該当シャードのみ読み込み）"""
+        return self._load_shard(shard_for_key(key, self.shards)).get(key, default)
+
+    def __getitem__(self, key: str) -> dict:
+        entry = self.get(key)
+        if entry is None:
+            raise KeyError(key)
+        return entry
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, dict]:
+        """複数キーをまとめて取得（見つからないキーは含めない）"""
+        result = {}
+        for key in keys:
+            entry = self.get(key)
+            if entry is not None:
+                result[key] = entry
+        return result
+
+
+@lru_cache(maxsize=None)
+def _source_hash(path: str, mtime_ns: int) -> str:
+    return content_hash(Path(path).read_bytes())
+
+
+@lru_cache(maxsize=None)
+def _load_monolith(path: str, mtime_ns: int) -> Dict[str, dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def source_hash(dictionary_path: Path) -> str:
+    """
+    辞書ファイルの内容ハッシュ（マニフェストの sourceSha256 と同じ値）
+
+    更新時刻が変わらない限り再計算しません。
+    """
+    dictionary_path = Path(dictionary_path)
+    return _source_hash(str(dictionary_path), dictionary_path.stat().st_mtime_ns)
+
+
+def open_dictionary(dictionary_path: Path = DICTIONARY_PATH):
+    """
+    辞書を開く
+
+    シャードディレクトリのマニフェストが辞書の内容と一致すれば ShardedDictionary、
+    そうでなければ単一JSONを読み込んだ dict を返します（どちらも get で参照可能）。
+    """
+    dictionary_path = Path(dictionary_path)
+    shard_dir = shard_dir_for(dictionary_path)
+    manifest = load_manifest(shard_dir)
+    if manifest is not None:
+        if not dictionary_path.exists():
+            return ShardedDictionary(shard_dir, manifest)
+        if manifest.get('sourceSha256') == source_hash(dictionary_path):
+            return ShardedDictionary(shard_dir, manifest)
+    return _load_monolith(str(dictionary_path), dictionary_path.stat().st_mtime_ns)
+
+
+def clear_cache():
+    """読み込み済みシャードのキャッシュを破棄"""
+    _SHARD_CACHE.clear()
+    _source_hash.cache_clear()
+    _load_monolith.cache_clear()
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='長文読解辞書のシャード分割')
+    parser.add_argument('--dictionary', type=str, help='辞書JSON（既定: reading-passages-dictionary.json）')
+    parser.add_argument('--output', type=str, help='シャードの出力先ディレクトリ')
+    parser.add_argument('--max-entries', type=int, default=DEFAULT_MAX_ENTRIES,
+                        help='1シャードあたりの目安エントリ数')
+    parser.add_argument('--force', action='store_true', help='辞書が未変更でも再生成')
+    parser.add_argument('--lookup', nargs='+', metavar='WORD', help='シャードから単語を検索')
+
+    args = parser.parse_args()
+    dictionary_path = Path(args.dictionary) if args.dictionary else DICTIONARY_PATH
+    shard_dir = Path(args.output) if args.output else shard_dir_for(dictionary_path)
+
+    if args.lookup:
+        dictionary = ShardedDictionary(shard_dir)
+        for word in args.lookup:
+            entry = dictionary.get(word.lower())
+            if entry is None:
+                print(f"  ❓ {word}: 未登録")
+            else:
+                print(f"  📖 {word}: {entry.get('meaning', '')}")
+        print(f"  読み込んだシャード: {', '.join(dictionary.loaded_shards) or 'なし'}")
+        return 0
+
+    manifest, rebuilt = build_shards(dictionary_path, shard_dir, args.max_entries, args.force)
+    sizes = sorted(s['count'] for s in manifest['shards'].values())
+    status = '✅ シャードを生成' if rebuilt else 'ℹ️  辞書が未変更のためスキップ'
+    print(f"{status}: {shard_dir}")
+    print(f"  {manifest['count']}語 / {len(sizes)}シャード（最小 {sizes[0]}・最大 {sizes[-1]}語）")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+explanation の品質向上（正答と具体的な説明の追加）
+
+文法用語だけの explanation に正答や文法事項の説明を追記します。
+正答（または verb）がすでに含まれている explanation は変更しません。
+
+照合の仕組み:
+- 文法用語のパターンをすべて名前付きグループの1つの正規表現（選択）にコンパイル
+- explanation を1回走査し、一致したパターンのうち優先順位の最も高いものの処理を使う
+  （GRAMMAR_EXPLANATIONS の用語が最優先で、一致した時点で走査を打ち切る）
+- パターンごとの適用回数を ExplanationMatcher.hits に集計
+
+問題タイプ:
+- verbForm / fillInBlank: 語の正答を「正答は…です。」などで追記
+- sentenceOrdering / paraphrase / conversation: 文の正答を「正しい語順は「…」です。」などで追記
+  （分かち書きの正答 "I like books ." は "I like books." に戻し、「。」の後に空白を入れない）
+- 段落（空行区切り）が複数ある explanation は、先頭の段落の末尾に追記
+
+使用例:
+    from explanation_quality import improve_explanation
+
+    improved, changed = improve_explanation(question)
+
+    python3 scripts/explanation_quality.py          # 全単元の適用パターンを集計（書き込みなし）
+"""
+
+import argparse
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# 文法用語の説明マップ
+GRAMMAR_EXPLANATIONS = {
+    "過去分詞": {
+        "pattern": r"過去分詞",
+        "expansion": "過去分詞形を使います"
+    },
+    "現在形": {
+        "pattern": r"現在形",
+        "expansion": "現在形を使います"
+    },
+    "過去形": {
+        "pattern": r"過去形",
+        "expansion": "過去形を使います"
+    },
+    "進行形": {
+        "pattern": r"進行形",
+        "expansion": "進行形(-ing形)を使います"
+    },
+    "三人称単数": {
+        "pattern": r"三人称単数|3単現",
+        "expansion": "三人称単数形(-s/-es)を使います"
+    },
+    "原形": {
+        "pattern": r"原形",
+        "expansion": "動詞の原形を使います"
+    }
+}
+
+RELATIVE_PRONOUN_EXPLANATIONS = {
+    "who": "人を指すときは関係代名詞whoを使います",
+    "which": "物を指すときは関係代名詞whichを使います",
+    "that": "人・物両方に使える関係代名詞thatを使います",
+    "whose": "所有を表すときは関係代名詞whoseを使います",
+    "whom": "人を指す目的格の関係代名詞whomを使います"
+}
+
+# 正答が文になる問題タイプの追記文（それ以外は「正答は…です。」）
+ANSWER_SENTENCES = {
+    'sentenceOrdering': '正しい語順は「{answer}」です。',
+    'paraphrase': '書きかえた文は「{answer}」です。',
+    'conversation': '正答は「{answer}」です。',
+}
+
+DEFAULT_PATTERN = 'その他'
+PARAGRAPH_SEPARATOR = '\n\n'
+JAPANESE_SENTENCE_ENDS = ('。', '！', '？')
+
+_SPACE_BEFORE_PUNCTUATION_RE = re.compile(r'\s+([.,?!])')
+
+
+def detokenize(sentence: str) -> str:
+    """分かち書きの文の句読点の前の空白を除く（"I like books ." → "I like books."）"""
+    return _SPACE_BEFORE_PUNCTUATION_RE.sub(r'\1', sentence).strip()
+
+
+class QuestionContext(NamedTuple):
+    """追記文の生成に使う問題の情報"""
+
+    answer: str
+    verb: Optional[str]
+    question_type: str
+
+    @property
+    def sentence_answer(self) -> bool:
+        return self.question_type in ANSWER_SENTENCES
+
+    def answer_sentence(self) -> str:
+        if self.sentence_answer:
+            return ANSWER_SENTENCES[self.question_type].format(answer=detokenize(self.answer))
+        return f'正答は{self.answer}です。'
+
+
+def _grammar_term(ctx: QuestionContext) -> str:
+    # パターン1: 文法用語のみの場合 → 具体的な正答を追加
+    if ctx.verb:
+        return f"{ctx.verb}の正答は{ctx.answer}です。"
+    return ctx.answer_sentence()
+
+
+def _comparison(ctx: QuestionContext) -> str:
+    # パターン2: 比較級・最上級
+    if not ctx.sentence_answer and any(s in ctx.answer for s in ("-er", "-est", "more", "most")):
+        return f"この問題では{ctx.answer}が正答です。"
+    return ctx.answer_sentence()
+
+
+def _relative_pronoun(ctx: QuestionContext) -> str:
+    # パターン3: 関係代名詞
+    if ctx.answer in RELATIVE_PRONOUN_EXPLANATIONS:
+        return f"{RELATIVE_PRONOUN_EXPLANATIONS[ctx.answer]}。"
+    return ctx.answer_sentence()
+
+
+def _have_has(ctx: QuestionContext) -> str:
+    # パターン4: have/has
+    if not ctx.sentence_answer:
+        if "have" in ctx.answer:
+            return "この主語にはhaveを使います。"
+        if "has" in ctx.answer:
+            return "この主語(三人称単数)にはhasを使います。"
+    return ctx.answer_sentence()
+
+
+def _passive(ctx: QuestionContext) -> str:
+    # パターン6: 受動態
+    if ctx.verb:
+        return f"{ctx.verb}の過去分詞は{ctx.answer}です。「〜される」という受け身の意味になります。"
+    if ctx.sentence_answer:
+        return f"{ctx.answer_sentence()}「〜される」という受け身の意味になります。"
+    return f"正答は{ctx.answer}で、「〜される」という受け身の意味になります。"
+
+
+def _answer_only(ctx: QuestionContext) -> str:
+    # パターン5: do/does・一般動詞 / パターン7: その他の場合 → 基本的な正答の明示
+    return ctx.answer_sentence()
+
+
+class ExplanationPattern(NamedTuple):
+    """文法用語のパターンと追記文の生成処理（priority が小さいほど優先）"""
+
+    name: str
+    pattern: str
+    priority: int
+    build: Callable[[QuestionContext], str]
+
+
+EXPLANATION_PATTERNS: List[ExplanationPattern] = [
+    *(ExplanationPattern(name, term['pattern'], 0, _grammar_term)
+      for name, term in GRAMMAR_EXPLANATIONS.items()),
+    ExplanationPattern('比較級・最上級', r'比較級|最上級', 1, _comparison),
+    ExplanationPattern('関係代名詞', r'関係代名詞', 2, _relative_pronoun),
+    ExplanationPattern('have/has', re.escape('have/has'), 3, _have_has),
+    ExplanationPattern('do/does・一般動詞', re.escape('do/does') + r'|一般動詞', 4, _answer_only),
+    ExplanationPattern('受動態', r'受動態', 5, _passive),
+]
+
+
+class ExplanationMatcher:
+    """文法用語のパターンを1つの正規表現にまとめた照合器"""
+
+    def __init__(self, patterns: List[ExplanationPattern] = EXPLANATION_PATTERNS):
+        self.patterns = list(patterns)
+        self.regex = re.compile('|'.join(f'(?P<p{number}>{pattern.pattern})'
+                                         for number, pattern in enumerate(self.patterns)))
+        self.top_priority = min(pattern.priority for pattern in self.patterns)
+        self.hits: Counter = Counter()
+
+    def match(self, explanation: str) -> Optional[ExplanationPattern]:
+        """explanation に一致する最優先のパターン（なければNone）"""
+        best = None
+        for match in self.regex.finditer(explanation):
+            pattern = self.patterns[int(match.lastgroup[1:])]
+            if best is None or pattern.priority < best.priority:
+                best = pattern
+                if pattern.priority == self.top_priority:
+                    break
+        return best
+
+    def improve(self, question: Dict, question_type: str = '') -> Tuple[str, bool]:
+        """
+        explanationを改善する
+
+        Args:
+            question: 問題（explanation / correctAnswer / verb を使用）
+            question_type: 問題タイプ（question の type を優先）
+
+        Returns:
+            (改善後のexplanation, 変更があったか)
+        """
+        explanation = question['explanation']
+        correct_answer = question.get('correctAnswer')
+        verb = question.get('verb', None)
+
+        ctx = QuestionContext(correct_answer, verb, question.get('type') or question_type)
+
+        # すでに正答が含まれている場合はスキップ（文の正答は句読点を詰めた形も確認）
+        if not correct_answer or correct_answer in explanation or (verb and verb in explanation):
+            return explanation, False
+        if ctx.sentence_answer and detokenize(correct_answer) in explanation:
+            return explanation, False
+
+        pattern = self.match(explanation)
+        self.hits[pattern.name if pattern else DEFAULT_PATTERN] += 1
+        addition = pattern.build(ctx) if pattern else ctx.answer_sentence()
+
+        lead, separator, rest = explanation.partition(PARAGRAPH_SEPARATOR)
+        if ctx.sentence_answer:
+            # 日本語の文末記号の後は空白なしで続け、それ以外は「。」で区切る
+            lead = f"{lead}{addition}" if not lead or lead.endswith(JAPANESE_SENTENCE_ENDS) else f"{lead}。{addition}"
+        elif pattern is None and not lead.endswith('。'):
+            # 文末に「。」がない場合は追加
+            lead = f"{lead}。{addition}"
+        else:
+            lead = f"{lead} {addition}"
+        return lead + separator + rest, True
+
+
+_matcher = ExplanationMatcher()
+
+
+def improve_explanation(question: Dict, question_type: str = '') -> Tuple[str, bool]:
+    """
+    explanationを改善する（既定の照合器を使用、適用回数は pattern_hits() で取得）
+
+    Returns:
+        (改善後のexplanation, 変更があったか)
+    """
+    return _matcher.improve(question, question_type)
+
+
+def pattern_hits() -> Counter:
+    """既定の照合器でパターンごとに適用した回数"""
+    return _matcher.hits
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='explanation の改善パターンを集計（書き込みなし）')
+    parser.add_argument('--grammar-dir', type=str, help='文法問題ディレクトリ')
+    parser.add_argument('--show', type=int, default=0, metavar='N', help='改善例をN件表示')
+
+    args = parser.parse_args()
+
+    from explanation_templates import GRAMMAR_DIR, load_unit, unit_files
+
+    units = [load_unit(path) for path in unit_files(Path(args.grammar_dir) if args.grammar_dir else GRAMMAR_DIR)]
+    matcher = ExplanationMatcher()
+    start = time.perf_counter()
+    types = Counter()
+    examples = []
+    total = 0
+    for unit in units:
+        for question in unit.get('questions', []):
+            if not isinstance(question.get('explanation'), str):
+                continue
+            total += 1
+            improved, changed = matcher.improve(question)
+            if changed:
+                types[question.get('type')] += 1
+                if len(examples) < args.show:
+                    examples.append((question.get('id'), improved.partition(PARAGRAPH_SEPARATOR)[0]))
+    elapsed = time.perf_counter() - start
+
+    print(f"📊 {total}問を照合（{elapsed * 1000:.1f} ms）: 改善対象 {sum(types.values())}問")
+    for question_type, count in types.most_common():
+        print(f"  {question_type:18s} {count:5d}問")
+    print("\n  パターン別:")
+    for pattern in [*(p.name for p in matcher.patterns), DEFAULT_PATTERN]:
+        print(f"  {pattern:18s} {matcher.hits[pattern]:5d}")
+    for question_id, lead in examples:
+        print(f"\n  {question_id}: {lead[:120]}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
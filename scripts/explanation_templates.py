@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+文法問題の explanation テンプレート圧縮と展開
+
+public/data/grammar/grade*/unit*.json の explanation には、区切り線・
+「📚 選択肢の詳細解説」・選択肢ごとの「✗ 不正解理由: 日本語訳「…」に合いません。」
+などの定型ブロックが問題ごとに繰り返されます。このモジュールは explanation を
+段落（空行区切り）単位のテンプレート参照に置き換え、テンプレートは各ファイルに
+一度だけ保存します。
+
+圧縮形式:
+    {
+      ...,
+      "explanationTemplates": ["✅ 【{0}】 ← 正解\\n  ✓ 正解理由: 日本語訳「{1}」から、この形が適切です。", ...],
+      "questions": [
+        {..., "explanation": [
+          "「何」と尋ねるときはWhatを使います。",      # 定型でない段落はそのまま
+          [0, "correctAnswer", "japanese"],            # テンプレート番号 + スロットの参照先フィールド
+          [1, "choices.1", "japanese"]
+        ]}
+      ]
+    }
+
+- スロットは 【…】 / 「…」 の中身が問題のフィールド値（correctAnswer, japanese,
+  choices.N など）と一致する部分です。値は問題自身から取り出すため保存しません
+  （同じフィールドが複数回現れる場合は同じ番号のスロットを使います）
+- 連続するテンプレート段落は、コーパス全体で繰り返される並びなら1つのテンプレートに結合
+- テンプレート中の { } は {{ }} とエスケープ
+- 展開結果は元の explanation とバイト単位で一致します（compact_unit → expand_unit）
+
+テンプレートの検出（オフライン）はコーパス全体の段落の出現回数から行います。
+
+使用例:
+    from explanation_templates import load_unit
+
+    data = load_unit(path)       # 圧縮形式でも explanation を文字列に展開して返す
+
+    python3 scripts/explanation_templates.py stats
+    python3 scripts/explanation_templates.py compact --output-dir /tmp/grammar-compact
+    python3 scripts/explanation_templates.py expand /tmp/grammar-compact/grade1/unit0.json -o unit0.json
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from data_store import format_json, write_text
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+GRAMMAR_DIR = BASE_DIR / 'public' / 'data' / 'grammar'
+
+# 単元ファイルの問題タイプ（questionTypes・集計での正規の順序）
+QUESTION_TYPES = ('fillInBlank', 'sentenceOrdering', 'paraphrase', 'verbForm', 'conversation')
+
+TEMPLATES_KEY = 'explanationTemplates'
+PARAGRAPH_SEPARATOR = '\n\n'
+
+# コーパス全体でこの回数以上現れる段落・並びをテンプレートにする
+MIN_TEMPLATE_COUNT = 3
+# これより短い段落はテンプレート参照の方が大きくなるため対象外（UTF-8バイト数）
+MIN_TEMPLATE_BYTES = 12
+
+# スロット候補のフィールド（同じ値が複数ある場合は先に挙げたものを参照）
+SLOT_FIELDS = ('correctAnswer', 'japanese', 'sentence', 'hint', 'originalSentence',
+               'targetSentence', 'original', 'question', 'verb', 'baseForm')
+SLOT_LIST_FIELDS = ('choices',)
+
+_BRACKET_RE = re.compile(r'([【「])([^【】「」\n]+)([】」])')
+_PLACEHOLDER_RE = re.compile(r'\{\{|\}\}|\{(\d+)\}')
+
+
+def unit_files(grammar_dir: Path = GRAMMAR_DIR) -> List[Path]:
+    """学年ディレクトリ直下の単元ファイル（archive は除く）"""
+    return sorted(grammar_dir.glob('grade*/unit*.json'))
+
+
+def is_compact(data: dict) -> bool:
+    """explanation がテンプレート圧縮されている単元か"""
+    return TEMPLATES_KEY in data
+
+
+def slot_values(question: dict) -> Dict[str, str]:
+    """
+    スロットに使えるフィールド値
+
+    Returns:
+        dict: 値 → 参照先フィールド（"choices.1" など）
+    """
+    values: Dict[str, str] = {}
+    for field in SLOT_FIELDS:
+        value = question.get(field)
+        if isinstance(value, str) and value:
+            values.setdefault(value, field)
+    for field in SLOT_LIST_FIELDS:
+        items = question.get(field)
+        if isinstance(items, list):
+            for i, value in enumerate(items):
+                if isinstance(value, str) and value:
+                    values.setdefault(value, f'{field}.{i}')
+    return values
+
+
+def resolve_slot(question: dict, ref: str) -> str:
+    """スロットの参照先フィールドの値"""
+    field, _, index = ref.partition('.')
+    value = question.get(field)
+    if index:
+        value = value[int(index)]
+    return value
+
+
+def _escape(text: str) -> str:
+    return text.replace('{', '{{').replace('}', '}}')
+
+
+def templatize(paragraph: str, values: Dict[str, str]) -> Tuple[str, List[str]]:
+    """
+    段落のスロットをプレースホルダーに置き換え
+
+    Returns:
+        tuple: (テンプレート, スロットの参照先フィールド)
+    """
+    refs: List[str] = []
+    parts: List[str] = []
+    last = 0
+    for match in _BRACKET_RE.finditer(paragraph):
+        ref = values.get(match.group(2))
+        if ref is None:
+            continue
+        if ref not in refs:
+            refs.append(ref)
+        parts.append(_escape(paragraph[last:match.start(2)]))
+        parts.append('{%d}' % refs.index(ref))
+        last = match.end(2)
+    parts.append(_escape(paragraph[last:]))
+    return ''.join(parts), refs
+
+
+def render_template(template: str, values: List[str]) -> str:
+    """テンプレートにスロット値を埋め込む"""
+    def replace(match):
+        if match.group(1) is not None:
+            return values[int(match.group(1))]
+        return match.group(0)[0]
+    return _PLACEHOLDER_RE.sub(replace, template)
+
+
+def _renumber_placeholders(template: str, numbers: List[int]) -> str:
+    return _PLACEHOLDER_RE.sub(
+        lambda m: '{%d}' % numbers[int(m.group(1))] if m.group(1) is not None else m.group(0),
+        template)
+
+
+def _paragraphs(question: dict) -> Optional[List[Tuple[str, List[str]]]]:
+    explanation = question.get('explanation')
+    if not isinstance(explanation, str):
+        return None
+    values = slot_values(question)
+    return [templatize(p, values) for p in explanation.split(PARAGRAPH_SEPARATOR)]
+
+
+def _join_run(run: List[Tuple[str, List[str]]]) -> Tuple[str, List[str]]:
+    texts = []
+    refs: List[str] = []
+    for template, template_refs in run:
+        for ref in template_refs:
+            if ref not in refs:
+                refs.append(ref)
+        texts.append(_renumber_placeholders(template, [refs.index(ref) for ref in template_refs]))
+    return PARAGRAPH_SEPARATOR.join(texts), refs
+
+
+class TemplateTable:
+    """コーパス全体から検出したテンプレート"""
+
+    def __init__(self, paragraphs: Counter, runs: Counter):
+        self.paragraphs = {t for t, count in paragraphs.items()
+                           if count >= MIN_TEMPLATE_COUNT and len(t.encode('utf-8')) >= MIN_TEMPLATE_BYTES}
+        self.runs = {t for t, count in runs.items() if count >= MIN_TEMPLATE_COUNT}
+
+    def __len__(self) -> int:
+        return len(self.paragraphs) + len(self.runs)
+
+    def _template_runs(self, paragraphs):
+        """段落を (テンプレート段落の連続 or 通常段落) のグループに分ける"""
+        run = []
+        for paragraph, (template, refs) in paragraphs:
+            if template in self.paragraphs:
+                run.append((template, refs))
+                continue
+            if run:
+                yield 'run', run
+                run = []
+            yield 'literal', paragraph
+        if run:
+            yield 'run', run
+
+    def encode(self, question: dict, local: Dict[str, int]) -> Optional[list]:
+        """
+        explanation を圧縮形式（文字列とテンプレート参照のリスト）に変換
+
+        Args:
+            question: 問題
+            local: 単元内のテンプレート → 番号（新しいテンプレートは追加される）
+
+        Returns:
+            list: 圧縮形式（テンプレートを1つも使わない場合はNone）
+        """
+        paragraphs = _paragraphs(question)
+        if paragraphs is None:
+            return None
+        originals = question['explanation'].split(PARAGRAPH_SEPARATOR)
+
+        parts: list = []
+        used = False
+        for kind, group in self._template_runs(zip(originals, paragraphs)):
+            if kind == 'literal':
+                # 連続する通常段落は1つの文字列にまとめる
+                if parts and isinstance(parts[-1], str):
+                    parts[-1] += PARAGRAPH_SEPARATOR + group
+                else:
+                    parts.append(group)
+                continue
+
+            joined = _join_run(group)
+            pieces = [joined] if len(group) > 1 and joined[0] in self.runs else group
+            for template, refs in pieces:
+                number = local.setdefault(template, len(local))
+                parts.append([number, *refs])
+                used = True
+        return parts if used else None
+
+
+def build_templates(files: List[Path]) -> TemplateTable:
+    """コーパス全体の段落・テンプレート段落の並びの出現回数からテンプレートを検出"""
+    questions = []
+    paragraph_counts = Counter()
+    for path in files:
+        data = load_unit(path)
+        for question in data.get('questions', []):
+            paragraphs = _paragraphs(question)
+            if paragraphs is not None:
+                questions.append(paragraphs)
+                paragraph_counts.update(t for t, _ in paragraphs)
+
+    table = TemplateTable(paragraph_counts, Counter())
+    run_counts = Counter()
+    for paragraphs in questions:
+        run = []
+        for template, refs in paragraphs + [('', [])]:
+            if template in table.paragraphs:
+                run.append((template, refs))
+                continue
+            if len(run) > 1:
+                run_counts[_join_run(run)[0]] += 1
+            run = []
+    table.runs = {t for t, count in run_counts.items() if count >= MIN_TEMPLATE_COUNT}
+    return table
+
+
+def compact_unit(data: dict, table: TemplateTable) -> dict:
+    """単元の explanation をテンプレート圧縮"""
+    if is_compact(data):
+        return data
+    local: Dict[str, int] = {}
+    questions = []
+    for question in data.get('questions', []):
+        parts = table.encode(question, local)
+        questions.append({**question, 'explanation': parts} if parts is not None else question)
+
+    result = {}
+    for key, value in data.items():
+        if key == 'questions':
+            result[TEMPLATES_KEY] = list(local)
+            result['questions'] = questions
+        else:
+            result[key] = value
+    return result
+
+
+def expand_explanation(question: dict, templates: List[str]) -> str:
+    """圧縮形式の explanation を文字列に展開"""
+    parts = question.get('explanation')
+    if not isinstance(parts, list):
+        return parts
+    rendered = []
+    for part in parts:
+        if isinstance(part, str):
+            rendered.append(part)
+        else:
+            number, *refs = part
+            rendered.append(render_template(templates[number],
+                                            [resolve_slot(question, ref) for ref in refs]))
+    return PARAGRAPH_SEPARATOR.join(rendered)
+
+
+def expand_unit(data: dict) -> dict:
+    """テンプレート圧縮された単元を従来形式に戻す"""
+    if not is_compact(data):
+        return data
+    templates = data[TEMPLATES_KEY]
+    result = {k: v for k, v in data.items() if k != TEMPLATES_KEY}
+    result['questions'] = [
+        {**q, 'explanation': expand_explanation(q, templates)} if isinstance(q.get('explanation'), list) else q
+        for q in data.get('questions', [])
+    ]
+    return result
+
+
+def load_unit(path: Path) -> dict:
+    """単元JSONを読み込み（圧縮形式は explanation を展開）"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return expand_unit(json.load(f))
+
+
+def serialize_unit(data: dict, compact: bool = False) -> str:
+    """単元JSONの文字列（従来形式は Prettier と同じ形式、圧縮形式は空白なし）"""
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    return format_json(data)
+
+
+def _relative(path: Path, grammar_dir: Path) -> Path:
+    try:
+        return path.resolve().relative_to(grammar_dir.resolve())
+    except ValueError:
+        return Path(path.name)
+
+
+def print_stats(files: List[Path], table: TemplateTable, grammar_dir: Path) -> int:
+    """圧縮前後のサイズ・読み込み時間を表示し、展開結果が元と一致するかを検証"""
+    before = after = 0
+    load_before = load_after = 0.0
+    mismatches = 0
+    for path in files:
+        original_text = path.read_text(encoding='utf-8')
+        original = json.loads(original_text)
+        compact_text = serialize_unit(compact_unit(original, table), compact=True)
+
+        started = time.perf_counter()
+        json.loads(original_text)
+        load_before += time.perf_counter() - started
+        started = time.perf_counter()
+        json.loads(compact_text)
+        load_after += time.perf_counter() - started
+
+        restored = expand_unit(json.loads(compact_text))
+        if serialize_unit(restored) != serialize_unit(original):
+            mismatches += 1
+            print(f"  ❌ 展開結果が一致しません: {_relative(path, grammar_dir)}")
+        before += len(original_text.encode('utf-8'))
+        after += len(compact_text.encode('utf-8'))
+
+    print(f"📊 {len(files)}単元 / テンプレート {len(table.paragraphs)}段落 + {len(table.runs)}並び")
+    print(f"  サイズ: {before / 1024:.0f} KB → {after / 1024:.0f} KB ({before / after:.1f}倍)")
+    print(f"  JSON読み込み: {load_before * 1000:.1f} ms → {load_after * 1000:.1f} ms")
+    print(f"  {'✅ 展開結果はすべて元のexplanationと一致' if not mismatches else f'❌ 不一致 {mismatches}単元'}")
+    return 1 if mismatches else 0
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='文法問題 explanation のテンプレート圧縮')
+    parser.add_argument('--grammar-dir', type=str, help='文法データのディレクトリ')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('stats', help='圧縮率と読み込み時間を表示（展開結果も検証）')
+
+    compact_parser = subparsers.add_parser('compact', help='全単元をテンプレート圧縮')
+    compact_parser.add_argument('--output-dir', type=str, required=True,
+                                help='出力先（grade*/unit*.json の構成で書き出す）')
+
+    expand_parser = subparsers.add_parser('expand', help='圧縮形式を従来形式に戻す')
+    expand_parser.add_argument('input', nargs='+', help='圧縮形式の単元JSON')
+    expand_parser.add_argument('-o', '--output', help='出力先（入力が1ファイルの場合のみ、省略時は上書き）')
+
+    args = parser.parse_args()
+    grammar_dir = Path(args.grammar_dir) if args.grammar_dir else GRAMMAR_DIR
+
+    if args.command == 'expand':
+        if args.output and len(args.input) > 1:
+            print("❌ --output は入力が1ファイルの場合のみ指定できます", file=sys.stderr)
+            return 1
+        for input_name in args.input:
+            input_path = Path(input_name)
+            output_path = Path(args.output) if args.output else input_path
+            written = write_text(output_path, serialize_unit(load_unit(input_path)),
+                                 label='grammar-expand')
+            print(f"{'✅' if written else 'ℹ️ '} {input_path} → {output_path}")
+        return 0
+
+    files = unit_files(grammar_dir)
+    table = build_templates(files)
+    if args.command == 'stats':
+        return print_stats(files, table, grammar_dir)
+
+    output_dir = Path(args.output_dir)
+    for path in files:
+        output_path = output_dir / _relative(path, grammar_dir)
+        write_text(output_path, serialize_unit(compact_unit(load_unit(path), table), compact=True),
+                   backup=False)
+    print(f"✅ {len(files)}単元を圧縮: {output_dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
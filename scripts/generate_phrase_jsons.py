@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+フレーズ学習用JSONの一括生成
+
+public/data/passages/ の英文（3_passages-for-phrase-work）と全訳
+（5_passages-for-phrase-work-ja）をファイル名で対応付け、
+convert_preformatted_to_json の変換をプロセスプールで並列実行します。
+
+- 英文・全訳・辞書・変換処理のモジュール（PIPELINE_MODULES）・オプションの内容ハッシュが前回と同じで、
+  出力も前回のまま残っているパッセージはスキップ
+- 全パッセージの辞書未登録単語を集計してJSONに保存
+- 英文と和訳のフレーズ対応付け（phrase_align）の信頼度と要確認の対応を表示
+
+レベル・テーマは index.json のメタデータ（level, topics）を優先し、
+なければファイル名の接頭辞（beginner_ など）、それもなければ --default-level を使います。
+
+使用例:
+    python3 scripts/generate_phrase_jsons.py
+    python3 scripts/generate_phrase_jsons.py --force --workers 4
+    python3 scripts/generate_phrase_jsons.py --only J_2020_4 --normalized
+    python3 scripts/generate_phrase_jsons.py --split-stats 15 20 25   # 長文分割の語数上限の比較
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+import data_store
+import dictionary_shards
+import phrase_align
+import phrase_json
+from data_store import content_hash, write_json, write_text
+
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'archive'))
+import convert_preformatted_to_json as converter  # noqa: E402
+
+# 出力に影響するモジュール（変換・整列・正規化・辞書の読み込み・JSONの書き出し）。
+# いずれかのソースが変わるとキャッシュのキーが変わり、全パッセージを再生成する
+PIPELINE_MODULES = (converter, phrase_align, phrase_json, dictionary_shards, data_store)
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+PASSAGES_DIR = BASE_DIR / 'public' / 'data' / 'passages'
+INDEX_PATH = PASSAGES_DIR / 'index.json'
+ENGLISH_DIR = PASSAGES_DIR / '3_passages-for-phrase-work'
+JAPANESE_DIR = PASSAGES_DIR / '5_passages-for-phrase-work-ja'
+OUTPUT_DIR = PASSAGES_DIR / '6_passages-phrase-learning'
+DICTIONARY_PATH = BASE_DIR / 'public' / 'data' / 'dictionaries' / 'reading-passages-dictionary.json'
+CACHE_PATH = BASE_DIR / 'tools' / 'data' / 'phrase_json_cache.json'
+MISSING_WORDS_PATH = BASE_DIR / 'tools' / 'data' / 'phrase_missing_words.json'
+
+CACHE_VERSION = 2
+LEVELS = ('beginner', 'intermediate', 'advanced')
+
+
+class PassageJob(NamedTuple):
+    """1パッセージ分の変換ジョブ"""
+
+    passage_id: str
+    passage_file: Path
+    translation_file: Path
+    output_file: Path
+    level: str
+    theme: str
+
+
+def load_index(index_path: Path = INDEX_PATH) -> Dict[str, dict]:
+    """index.json のメタデータ（ファイル名の stem → エントリ）"""
+    if not index_path.exists():
+        return {}
+    with open(index_path, 'r', encoding='utf-8') as f:
+        passages = json.load(f).get('passages', [])
+    return {Path(p.get('fileName', p.get('id', ''))).stem: p for p in passages}
+
+
+def infer_level(stem: str, meta: dict, default_level: str) -> str:
+    """レベルを index.json → ファイル名の接頭辞 → 既定値 の順に決定"""
+    if meta.get('level') in LEVELS:
+        return meta['level']
+    prefix = stem.split('_', 1)[0].split('-', 1)[0].lower()
+    return prefix if prefix in LEVELS else default_level
+
+
+def find_jobs(english_dir: Path = ENGLISH_DIR, japanese_dir: Path = JAPANESE_DIR,
+              output_dir: Path = OUTPUT_DIR, index_path: Path = INDEX_PATH,
+              default_level: str = 'intermediate') -> List[PassageJob]:
+    """
+    英文と全訳をファイル名で対応付けて変換ジョブを作成
+
+    Returns:
+        list: PassageJobのリスト（全訳がない英文は警告して除外）
+    """
+    index = load_index(index_path)
+    jobs = []
+    for passage_file in sorted(english_dir.glob('*.txt')):
+        stem = passage_file.stem
+        translation_file = japanese_dir / passage_file.name
+        if not translation_file.exists():
+            print(f"⚠️  全訳が見つかりません: {translation_file.relative_to(BASE_DIR)}")
+            continue
+        meta = index.get(stem, {})
+        jobs.append(PassageJob(
+            passage_id=stem,
+            passage_file=passage_file,
+            translation_file=translation_file,
+            output_file=output_dir / f'{stem}.json',
+            level=infer_level(stem, meta, default_level),
+            theme='・'.join(meta.get('topics', [])),
+        ))
+    return jobs
+
+
+def job_key(job: PassageJob, dictionary_hash: str, pipeline_hash: str, options: dict) -> str:
+    """入力ファイル・辞書・変換スクリプト・オプションから入力ハッシュを計算"""
+    digest = hashlib.sha256()
+    for part in (
+        content_hash(job.passage_file.read_bytes()),
+        content_hash(job.translation_file.read_bytes()),
+        dictionary_hash,
+        pipeline_hash,
+        json.dumps({'level': job.level, 'theme': job.theme, **options}, sort_keys=True),
+    ):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def load_cache(cache_path: Path) -> Dict[str, dict]:
+    if not cache_path.exists():
+        return {}
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return {}
+    return data.get('passages', {}) if data.get('version') == CACHE_VERSION else {}
+
+
+# ワーカープロセスごとの辞書（initializer で一度だけ読み込む）
+_worker_dictionary = None
+_worker_options: dict = {}
+
+
+def _init_worker(dictionary_path: str, options: dict):
+    global _worker_dictionary, _worker_options
+    _worker_dictionary = converter.load_dictionary(dictionary_path)
+    _worker_options = dict(options, dictionary_path=dictionary_path)
+
+
+def _convert_job(job: PassageJob) -> dict:
+    """1パッセージを変換して出力（ワーカープロセスで実行）"""
+    alignment = converter.align_passage(job.passage_file, job.translation_file)
+    passage_data = converter.build_passage_data(
+        job.passage_file, job.translation_file, _worker_dictionary,
+        job.level, job.theme, verbose=False, alignment=alignment
+    )
+    text = converter.render_passage_json(
+        passage_data, _worker_dictionary, _worker_options['dictionary_path'],
+        normalized=_worker_options['normalized'],
+        shared_dictionary=_worker_options['shared_dictionary'],
+    )
+    written = write_text(job.output_file, text, label='phrase-json')
+    return {
+        'passage_id': job.passage_id,
+        'written': written,
+        'phrases': len(passage_data['phrases']),
+        'words': passage_data['actualWordCount'],
+        'missing': dict(converter.find_missing_words(passage_data)),
+        'alignment': {
+            'confidence': round(alignment.confidence, 3),
+            'review': [
+                {'shape': f'{len(p.english_indices)}-{len(p.japanese_indices)}',
+                 'confidence': p.confidence, 'english': p.english, 'japanese': p.japanese}
+                for p in alignment.review
+            ],
+        },
+        'output_sha256': content_hash(text.encode('utf-8')),
+    }
+
+
+def summarize_missing(entries: Dict[str, dict]) -> dict:
+    """パッセージごとの未登録単語を単語単位に集計"""
+    totals = Counter()
+    passages: Dict[str, List[str]] = {}
+    for passage_id, entry in sorted(entries.items()):
+        for word, count in entry.get('missing', {}).items():
+            totals[word] += count
+            passages.setdefault(word, []).append(passage_id)
+
+    return {
+        'totalWords': len(totals),
+        'words': [
+            {'word': word, 'count': count, 'passages': passages[word]}
+            for word, count in sorted(totals.items(), key=lambda item: (-item[1], item[0]))
+        ],
+    }
+
+
+def generate_all(jobs: List[PassageJob], dictionary_path: Path = DICTIONARY_PATH,
+                 cache_path: Path = CACHE_PATH, workers: Optional[int] = None,
+                 force: bool = False, normalized: bool = False,
+                 shared_dictionary: bool = False) -> Dict[str, dict]:
+    """
+    変換ジョブを並列実行（入力ハッシュが未変更のパッセージはスキップ）
+
+    Returns:
+        dict: パッセージID → キャッシュエントリ（input, output, missing など）
+    """
+    options = {'normalized': normalized, 'shared_dictionary': shared_dictionary}
+    dictionary_hash = content_hash(Path(dictionary_path).read_bytes())
+    pipeline_hash = content_hash(b''.join(
+        Path(module.__file__).read_bytes() for module in PIPELINE_MODULES))
+
+    cache = load_cache(cache_path)
+    results: Dict[str, dict] = {}
+    pending = []
+    keys = {}
+    for job in jobs:
+        key = job_key(job, dictionary_hash, pipeline_hash, options)
+        keys[job.passage_id] = key
+        entry = cache.get(job.passage_id)
+        if (not force and entry and entry.get('input') == key and job.output_file.exists()
+                and content_hash(job.output_file.read_bytes()) == entry.get('output')):
+            results[job.passage_id] = entry
+            print(f"  ⏭️  {job.passage_id}: 入力が未変更のためスキップ")
+            continue
+        pending.append(job)
+
+    if pending:
+        workers = min(workers or os.cpu_count() or 1, len(pending))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(str(dictionary_path), options)) as executor:
+            for job, result in zip(pending, executor.map(_convert_job, pending)):
+                status = '✅' if result['written'] else 'ℹ️ '
+                alignment = result['alignment']
+                print(f"  {status} {job.passage_id}: {result['phrases']}フレーズ / "
+                      f"{result['words']}語 / 未登録 {len(result['missing'])}語 / "
+                      f"対応付け {alignment['confidence']:.2f}（要確認 {len(alignment['review'])}）")
+                results[job.passage_id] = {
+                    'input': keys[job.passage_id],
+                    'output': result['output_sha256'],
+                    'missing': result['missing'],
+                    'alignment': alignment,
+                }
+
+    # 今回のジョブ以外（--only 指定時など）のキャッシュも保持する
+    merged = {**cache, **results}
+    write_text(cache_path, json.dumps({'version': CACHE_VERSION, 'passages': merged},
+                                      ensure_ascii=False, separators=(',', ':')), backup=False)
+    return results
+
+
+def print_split_statistics(jobs: List[PassageJob], limits: List[int]):
+    """全パッセージの文について、語数上限ごとの分割後チャンク長の統計を表示"""
+    sentences = []
+    for job in jobs:
+        sentences.extend(converter.load_sentences_from_preformatted_file(job.passage_file))
+
+    print(f"📊 長文分割の統計: {len(jobs)}パッセージ / {len(sentences)}文")
+    for limit in limits:
+        stats = converter.split_statistics(sentences, limit)
+        print(f"  上限{limit:3d}語: チャンク {stats['chunks']} / 分割した文 {stats['splitSentences']} / "
+              f"上限超過 {stats['overLimit']} / 平均 {stats['mean']} / 中央値 {stats['median']} / "
+              f"p90 {stats['p90']} / 最大 {stats['max']}")
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='フレーズ学習用JSONの一括生成')
+    parser.add_argument('--dictionary', type=str, help='単語辞書（既定: reading-passages-dictionary.json）')
+    parser.add_argument('--output-dir', type=str, help='出力ディレクトリ（既定: 6_passages-phrase-learning）')
+    parser.add_argument('--only', nargs='+', metavar='ID', help='対象パッセージ（ファイル名の stem）')
+    parser.add_argument('--workers', type=int, help='並列プロセス数（既定: CPU数）')
+    parser.add_argument('--force', action='store_true', help='入力が未変更でも再生成')
+    parser.add_argument('--default-level', choices=LEVELS, default='intermediate',
+                        help='index.json・ファイル名からレベルを決められない場合のレベル')
+    parser.add_argument('--normalized', action='store_true', help='辞書参照形式で出力')
+    parser.add_argument('--shared-dictionary', action='store_true',
+                        help='--normalized時、辞書と同一のエントリは辞書ファイルを参照')
+    parser.add_argument('--missing-report', type=str, help='未登録単語の集計の出力先')
+    parser.add_argument('--split-stats', nargs='*', type=int, metavar='N',
+                        help='変換せず、語数上限ごとの長文分割の統計を表示（省略時は現在の上限）')
+
+    args = parser.parse_args()
+    dictionary_path = Path(args.dictionary) if args.dictionary else DICTIONARY_PATH
+    output_dir = Path(args.output_dir) if args.output_dir else OUTPUT_DIR
+    report_path = Path(args.missing_report) if args.missing_report else MISSING_WORDS_PATH
+
+    jobs = find_jobs(output_dir=output_dir, default_level=args.default_level)
+    if args.only:
+        jobs = [job for job in jobs if job.passage_id in set(args.only)]
+    if not jobs:
+        print("❌ 対象のパッセージがありません", file=sys.stderr)
+        return 1
+
+    if args.split_stats is not None:
+        print_split_statistics(jobs, args.split_stats or [converter.MAX_PHRASE_WORDS])
+        return 0
+
+    print(f"📖 {len(jobs)}パッセージを変換: {output_dir}")
+    results = generate_all(jobs, dictionary_path, workers=args.workers, force=args.force,
+                           normalized=args.normalized, shared_dictionary=args.shared_dictionary)
+
+    summary = summarize_missing(results)
+    write_json(report_path, summary, backup=False)
+    print(f"\n⚠️  辞書未登録単語: {summary['totalWords']}語（{report_path}）")
+    for item in summary['words'][:10]:
+        print(f"  {item['word']:16s} {item['count']:3d}回  {', '.join(item['passages'])}")
+
+    review = {pid: entry['alignment']['review'] for pid, entry in sorted(results.items())
+              if entry.get('alignment', {}).get('review')}
+    if review:
+        print(f"\n🔗 要確認の対応付け: {sum(len(r) for r in review.values())}件"
+              f"（詳細: python3 scripts/phrase_align.py <ID> --show）")
+        for passage_id, pairs in review.items():
+            print(f"  {passage_id}: {', '.join(p['shape'] for p in pairs)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
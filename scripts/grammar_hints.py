@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+文法問題のヒント生成（キーワード照合の Aho–Corasick オートマトン + ルール表）
+
+ヒントのルールは scripts/grammar_hint_rules.json にデータとして定義します。
+ルール表のキーワードから Aho–Corasick オートマトンを一度だけ構築し、文法項目の
+テキストを1回走査して一致したキーワードを求め、優先順位の最も高いルールを選びます。
+
+優先順位の解決:
+- キーワード同士の重なり: ほかのキーワードに完全に含まれる一致は捨てる（最長一致）
+  例: 「過去分詞」に一致した位置では「過去」「分詞」を数えない
+- ルール同士の競合: ルール表で先に書いたルールを使う
+
+照合するテキストは問題の grammarPoint と単元の grammar / title を連結したものです。
+同じテキストの照合結果はキャッシュするため、全問題のヒント生成は線形の走査になります。
+
+使用例:
+    from grammar_hints import HintRuleTable
+
+    table = HintRuleTable.load()
+    hint = table.generate(question, unit)
+
+    python3 scripts/grammar_hints.py --explain "be動詞の疑問文"
+    python3 scripts/grammar_hints.py --coverage     # 全単元の問題ごとに一致したルールを集計
+    python3 scripts/grammar_hints.py --rules        # ルール表を表示
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter, deque
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+RULES_PATH = Path(__file__).resolve().parent / 'grammar_hint_rules.json'
+GRAMMAR_DIR = BASE_DIR / 'public' / 'data' / 'grammar'
+
+ORDERING_TYPE = 'sentenceOrdering'
+
+
+class KeywordAutomaton:
+    """複数キーワードを1回の走査で検索する Aho–Corasick オートマトン"""
+
+    def __init__(self, keywords: List[str]):
+        self.keywords = list(keywords)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for index, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][char] = next_state
+                state = next_state
+            self._output[state].append(index)
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """一致を (開始位置, 終了位置, キーワード番号) で列挙"""
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for index in self._output[state]:
+                yield position + 1 - len(self.keywords[index]), position + 1, index
+
+    def longest_matches(self, text: str) -> List[int]:
+        """ほかの一致に完全に含まれる一致を除いたキーワード番号（出現順）"""
+        matches = sorted(self.finditer(text), key=lambda m: (m[0], -m[1]))
+        result = []
+        covered_end = -1
+        for start, end, index in matches:
+            if end <= covered_end:
+                continue
+            covered_end = end
+            result.append(index)
+        return result
+
+
+class HintRule(NamedTuple):
+    """ヒント生成ルール"""
+
+    name: str
+    any: Tuple[str, ...]
+    all: Tuple[str, ...]
+    first_words: Tuple[str, ...]
+    hint: str
+    ordering_hint: str
+
+
+def _render(template: str, first_word: str) -> str:
+    return template.replace('{first}', first_word)
+
+
+class HintRuleTable:
+    """コンパイル済みのヒントルール表"""
+
+    def __init__(self, data: dict):
+        self.data = data
+        self.no_words_hint = data['noWordsHint']
+        self.default_hint = data['defaultHint']
+        self.default_ordering_hint = data['defaultOrderingHint']
+        self.rules = [
+            HintRule(rule['name'], tuple(rule.get('any', [])), tuple(rule.get('all', [])),
+                     tuple(rule.get('firstWords', [])), rule['hint'],
+                     rule.get('orderingHint', rule['hint']))
+            for rule in data['rules']
+        ]
+
+        keywords = list(dict.fromkeys(k for rule in self.rules for k in rule.any + rule.all))
+        self.automaton = KeywordAutomaton(keywords)
+        # キーワード → それを any に含むルール番号、最初の語 → ルール番号
+        self._triggers: Dict[str, List[int]] = {}
+        self._first_words: Dict[str, List[int]] = {}
+        for number, rule in enumerate(self.rules):
+            for keyword in rule.any:
+                self._triggers.setdefault(keyword, []).append(number)
+            for word in rule.first_words:
+                self._first_words.setdefault(word, []).append(number)
+        self._keyword_cache: Dict[str, frozenset] = {}
+
+    @classmethod
+    def load(cls, path: Path = RULES_PATH) -> 'HintRuleTable':
+        """ルール表JSONを読み込んでコンパイル"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def keywords_in(self, text: str) -> frozenset:
+        """テキストに含まれるキーワード（最長一致、結果はキャッシュ）"""
+        found = self._keyword_cache.get(text)
+        if found is None:
+            found = frozenset(self.automaton.keywords[i] for i in self.automaton.longest_matches(text))
+            self._keyword_cache[text] = found
+        return found
+
+    def match(self, text: str, first_word: str = '') -> Optional[HintRule]:
+        """
+        テキストに一致する最優先のルール
+
+        Args:
+            text: 文法項目のテキスト
+            first_word: 語順問題の最初の語（firstWords の照合に使用）
+
+        Returns:
+            HintRule: 一致したルール（なければNone）
+        """
+        found = self.keywords_in(text)
+        candidates = {n for keyword in found for n in self._triggers.get(keyword, ())}
+        candidates.update(self._first_words.get(first_word, ()))
+        for number in sorted(candidates):
+            if all(keyword in found for keyword in self.rules[number].all):
+                return self.rules[number]
+        return None
+
+    def generate(self, question: dict, unit: Optional[dict] = None) -> str:
+        """
+        問題のヒントを生成
+
+        Args:
+            question: 問題（sentenceOrdering は words の最初の語を使った語順のヒント）
+            unit: 単元（grammar / title も照合テキストに含める）
+
+        Returns:
+            str: ヒント
+        """
+        ordering = (question.get('type') or ORDERING_TYPE) == ORDERING_TYPE
+        words = question.get('words') or []
+        if ordering and not words:
+            return self.no_words_hint
+        first_word = words[0] if ordering else ''
+
+        rule = self.match(match_text(question, unit), first_word)
+        if rule is None:
+            return _render(self.default_ordering_hint, first_word) if ordering else self.default_hint
+        return _render(rule.ordering_hint, first_word) if ordering else rule.hint
+
+
+def match_text(question: dict, unit: Optional[dict] = None) -> str:
+    """ルール照合に使うテキスト（問題の grammarPoint + 単元の grammar / title）"""
+    parts = [question.get('grammarPoint') or '']
+    if unit:
+        parts.extend((unit.get('grammar') or '', unit.get('title') or ''))
+    return ' / '.join(part for part in parts if part)
+
+
+def _rule_name(table: HintRuleTable, question: dict, unit: dict) -> str:
+    ordering = (question.get('type') or ORDERING_TYPE) == ORDERING_TYPE
+    first_word = (question.get('words') or [''])[0] if ordering else ''
+    rule = table.match(match_text(question, unit), first_word)
+    return rule.name if rule else '（既定）'
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='文法問題のヒント生成ルール')
+    parser.add_argument('--rules-file', type=str, help='ルール表JSON')
+    parser.add_argument('--rules', action='store_true', help='ルール表を表示')
+    parser.add_argument('--explain', nargs='+', metavar='TEXT', help='文法項目のテキストに一致するルールを表示')
+    parser.add_argument('--coverage', action='store_true', help='全単元の問題ごとに一致したルールを集計')
+
+    args = parser.parse_args()
+    table = HintRuleTable.load(Path(args.rules_file) if args.rules_file else RULES_PATH)
+
+    if args.rules:
+        for number, rule in enumerate(table.rules, 1):
+            condition = ' | '.join(rule.any + tuple(f'最初の語={w}' for w in rule.first_words))
+            if rule.all:
+                condition += f"  かつ {' & '.join(rule.all)}"
+            print(f"  {number:2d}. {rule.name:14s} {condition}")
+            print(f"      → {rule.hint}" + (f" / 語順: {rule.ordering_hint}" if rule.ordering_hint != rule.hint else ''))
+
+    for text in args.explain or []:
+        found = sorted(table.keywords_in(text))
+        rule = table.match(text)
+        print(f"🔍 {text}")
+        print(f"  キーワード: {', '.join(found) or 'なし'}")
+        print(f"  ルール: {rule.name if rule else '（既定）'} → {rule.hint if rule else table.default_hint}")
+
+    if args.coverage:
+        from explanation_templates import load_unit, unit_files
+
+        counts = Counter()
+        questions = 0
+        for path in unit_files(GRAMMAR_DIR):
+            unit = load_unit(path)
+            for question in unit.get('questions', []):
+                counts[_rule_name(table, question, unit)] += 1
+                questions += 1
+        print(f"📊 {questions}問 / 照合テキスト {len(table._keyword_cache)}種類")
+        for name, count in counts.most_common():
+            print(f"  {name:16s} {count:5d}問")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
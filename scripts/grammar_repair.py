@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+文法問題データの修復パイプライン（1回の読み込みで全パスを適用し、変化があるときだけ書き込み）
+
+対象:
+- public/data/grammar/grade*/unit*.json（単元ファイル）
+- public/data/{sentence-ordering,fill-in-blank-questions,verb-form-questions}-grade*.json（旧形式）
+
+各ファイルを1回だけ読み込み、登録された修復パスを順に適用してから、元と同じ形式
+（Prettier 整形、テンプレート圧縮された単元は圧縮形式）で直列化します。
+直列化したバイト列が元のファイルと異なる場合だけ書き込むため、修復のない
+ファイルは触らず、差分には実際の修正だけが現れます。
+
+キーの順序:
+- 既存のキーは元の順序のまま
+- パスが追加するキーは UNIT_KEY_ORDER / QUESTION_KEY_ORDER の位置に挿入
+
+修復パス（登録順に適用）:
+- hints: 空の hint を scripts/grammar_hint_rules.json のルール表で生成
+- explanations: 正答が含まれない explanation に正答を追記（explanation_quality、全問題タイプ）
+- counts: totalQuestions と questionTypes（問題タイプ別の問題数）を再計算
+
+使用例:
+    python3 scripts/grammar_repair.py --dry-run          # 書き込まずに修復内容を表示
+    python3 scripts/grammar_repair.py                    # 全ファイルを修復
+    python3 scripts/grammar_repair.py --passes counts    # 指定したパスだけ適用
+    python3 scripts/grammar_repair.py public/data/grammar/grade1/unit0.json
+    python3 scripts/grammar_repair.py --list-passes
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from data_store import format_json, write_text
+from explanation_quality import improve_explanation, pattern_hits
+from explanation_templates import QUESTION_TYPES, is_compact, serialize_unit, unit_files
+from grammar_hints import HintRuleTable
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / 'public' / 'data'
+GRAMMAR_DIR = DATA_DIR / 'grammar'
+
+LEGACY_PATTERNS = ('sentence-ordering-grade*.json', 'fill-in-blank-questions-grade*.json',
+                   'verb-form-questions-grade*.json')
+
+# 旧形式の units[] で問題リストを持つキー（キー名が問題タイプ）
+LEGACY_SECTIONS = ('sentenceOrdering', 'fillInBlank', 'verbForm')
+
+# パスが新しいキーを追加するときの位置
+UNIT_KEY_ORDER = ('unit', 'title', 'grammar', 'totalQuestions', 'questionTypes', 'questions')
+QUESTION_KEY_ORDER = ('id', 'type', 'japanese', 'sentence', 'verb', 'originalSentence', 'question',
+                      'targetSentence', 'situation', 'dialogue', 'words', 'choices', 'correctAnswer',
+                      'difficulty', 'explanation', 'hint', 'wordCount', 'passage', 'passageJapanese')
+
+
+class RepairPass(NamedTuple):
+    """修復パス（func はドキュメントを直接書き換え、修正内容のメッセージを返す）"""
+
+    name: str
+    description: str
+    func: Callable[['GrammarDocument'], List[str]]
+
+
+PASSES: List[RepairPass] = []
+
+
+def register_pass(name: str, description: str):
+    """修復パスを登録するデコレータ（登録順に適用）"""
+    def decorator(func):
+        PASSES.append(RepairPass(name, description, func))
+        return func
+    return decorator
+
+
+def set_field(obj: dict, key: str, value, order: Sequence[str]) -> bool:
+    """
+    フィールドを設定（既存のキーはその位置のまま、新しいキーは order の位置に挿入）
+
+    Returns:
+        bool: 値が変わったか
+    """
+    if key in obj:
+        if obj[key] == value:
+            return False
+        obj[key] = value
+        return True
+
+    later = set(order[order.index(key) + 1:]) if key in order else set()
+    items = list(obj.items())
+    position = next((i for i, (k, _) in enumerate(items) if k in later), len(items))
+    items.insert(position, (key, value))
+    obj.clear()
+    obj.update(items)
+    return True
+
+
+class GrammarDocument:
+    """読み込み済みの文法問題ファイル"""
+
+    def __init__(self, path: Path, text: str):
+        self.path = path
+        self.text = text
+        self.data = json.loads(text)
+        self.compact = is_compact(self.data)
+        self.legacy = 'units' in self.data and 'questions' not in self.data
+
+    def sections(self) -> Iterator[Tuple[dict, str, List[dict]]]:
+        """(単元, 既定の問題タイプ, 問題リスト) を列挙"""
+        if not self.legacy:
+            yield self.data, '', self.data.get('questions', [])
+            return
+        for unit in self.data.get('units', []):
+            for section in LEGACY_SECTIONS:
+                if section in unit:
+                    yield unit, section, unit[section]
+
+    def questions(self) -> Iterator[Tuple[dict, str, dict]]:
+        """(単元, 問題タイプ, 問題) を列挙"""
+        for unit, section, questions in self.sections():
+            for question in questions:
+                yield unit, question.get('type') or section, question
+
+    def serialize(self) -> str:
+        """元のファイルと同じ形式で直列化"""
+        if self.compact:
+            return serialize_unit(self.data, compact=True)
+        return format_json(self.data)
+
+    def label(self) -> str:
+        path = self.path.resolve()
+        return str(path.relative_to(DATA_DIR)) if path.is_relative_to(DATA_DIR) else str(self.path)
+
+
+def _question_label(unit: dict, question: dict) -> str:
+    return f"{unit.get('unit', '')} {question.get('id', 'no-id')}".strip()
+
+
+_hint_table: Optional[HintRuleTable] = None
+
+
+@register_pass('hints', '空の hint をルール表から生成')
+def repair_hints(document: GrammarDocument) -> List[str]:
+    global _hint_table
+    if _hint_table is None:
+        _hint_table = HintRuleTable.load()
+
+    fixes = []
+    for unit, question_type, question in document.questions():
+        if question.get('hint'):
+            continue
+        context = question if question.get('type') else dict(question, type=question_type)
+        hint = _hint_table.generate(context, unit)
+        set_field(question, 'hint', hint, QUESTION_KEY_ORDER)
+        fixes.append(f"{_question_label(unit, question)}: hint '{hint}'")
+    return fixes
+
+
+@register_pass('explanations', '正答が含まれない explanation に正答を追記')
+def repair_explanations(document: GrammarDocument) -> List[str]:
+    fixes = []
+    for unit, question_type, question in document.questions():
+        if not isinstance(question.get('explanation'), str):  # テンプレート圧縮済み
+            continue
+        improved, changed = improve_explanation(question, question_type)
+        if changed and set_field(question, 'explanation', improved, QUESTION_KEY_ORDER):
+            fixes.append(f"{_question_label(unit, question)}: explanation '{improved[:40]}'")
+    return fixes
+
+
+@register_pass('counts', 'totalQuestions / questionTypes を再計算')
+def repair_counts(document: GrammarDocument) -> List[str]:
+    data = document.data
+    counts = Counter(question_type for _, question_type, _ in document.questions())
+    total = sum(counts.values())
+    fixes = []
+
+    if not document.legacy or 'totalQuestions' in data:
+        old_total = data.get('totalQuestions')
+        if set_field(data, 'totalQuestions', total, UNIT_KEY_ORDER):
+            fixes.append(f"totalQuestions: {old_total} → {total}")
+
+    if not document.legacy:
+        # 既知のタイプは正規の順序、未知のタイプは出現順で後ろに並べる（0件は省略）
+        types = {t: counts[t] for t in QUESTION_TYPES if counts[t]}
+        types.update((t, n) for t, n in counts.items() if t not in types)
+        old_types = data.get('questionTypes')
+        # 件数が同じなら既存の並び順や 0 件の記載を保つ
+        declared = {t: n for t, n in (old_types or {}).items() if n}
+        if (old_types is None or declared != types) and set_field(data, 'questionTypes', types, UNIT_KEY_ORDER):
+            fixes.append(f"questionTypes: {old_types} → {types}")
+    return fixes
+
+
+def select_passes(names: Optional[Sequence[str]]) -> List[RepairPass]:
+    """名前で修復パスを選択（省略時は全パス、適用順は登録順）"""
+    if not names:
+        return list(PASSES)
+    known = {p.name for p in PASSES}
+    unknown = [name for name in names if name not in known]
+    if unknown:
+        raise ValueError(f"未知の修復パス: {', '.join(unknown)}（{', '.join(sorted(known))}）")
+    return [p for p in PASSES if p.name in names]
+
+
+class RepairResult(NamedTuple):
+    """1ファイルの修復結果"""
+
+    path: Path
+    label: str
+    fixes: Dict[str, List[str]]
+    changed: bool
+    written: bool
+
+
+def repair_file(path: Path, passes: Sequence[RepairPass], dry_run: bool = False) -> RepairResult:
+    """
+    1ファイルを読み込み、全パスを適用して、変化があれば書き込み
+
+    Args:
+        path: 文法問題ファイル（単元ファイルまたは旧形式）
+        passes: 適用する修復パス
+        dry_run: Trueの場合は書き込まない
+
+    Returns:
+        RepairResult: パスごとの修正内容と、出力が元のファイルと異なるか
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        document = GrammarDocument(path, f.read())
+
+    fixes = {}
+    for repair in passes:
+        messages = repair.func(document)
+        if messages:
+            fixes[repair.name] = messages
+
+    output = document.serialize()
+    changed = output != document.text
+    written = changed and not dry_run and write_text(path, output, label='grammar-repair')
+    return RepairResult(path, document.label(), fixes, changed, written)
+
+
+def default_files() -> List[Path]:
+    """全単元ファイル + 旧形式ファイル"""
+    files = unit_files(GRAMMAR_DIR)
+    for pattern in LEGACY_PATTERNS:
+        files.extend(sorted(DATA_DIR.glob(pattern)))
+    return files
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='文法問題データの修復パイプライン')
+    parser.add_argument('files', nargs='*', help='対象ファイル（省略時は全単元ファイル + 旧形式）')
+    parser.add_argument('--passes', type=str, help='適用する修復パス（カンマ区切り、省略時は全パス）')
+    parser.add_argument('--dry-run', action='store_true', help='書き込まずに修復内容を表示')
+    parser.add_argument('--verbose', '-v', action='store_true', help='修正内容を問題ごとに表示')
+    parser.add_argument('--list-passes', action='store_true', help='登録されている修復パスを表示')
+
+    args = parser.parse_args()
+
+    if args.list_passes:
+        for number, repair in enumerate(PASSES, 1):
+            print(f"  {number}. {repair.name:14s} {repair.description}")
+        return 0
+
+    try:
+        passes = select_passes(args.passes.split(',') if args.passes else None)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    files = [Path(f) for f in args.files] or default_files()
+    start = time.perf_counter()
+
+    print(f"🔧 文法問題の修復: {len(files)}ファイル / パス: {', '.join(p.name for p in passes)}"
+          f"{'（dry run）' if args.dry_run else ''}")
+
+    totals = Counter()
+    changed_files = 0
+    written_files = 0
+    for path in files:
+        result = repair_file(path, passes, args.dry_run)
+        changed_files += result.changed
+        written_files += result.written
+        for name, messages in result.fixes.items():
+            totals[name] += len(messages)
+
+        if not result.changed:
+            continue
+        summary = ', '.join(f"{name} {len(messages)}" for name, messages in result.fixes.items())
+        print(f"  ✏️  {result.label}: {summary or '整形のみ'}")
+        if args.verbose:
+            for name, messages in result.fixes.items():
+                for message in messages:
+                    print(f"      [{name}] {message}")
+
+    elapsed = time.perf_counter() - start
+    print(f"\n📊 修正: {', '.join(f'{p.name} {totals[p.name]}' for p in passes)}")
+    if args.verbose and totals['explanations']:
+        print(f"  explanation のパターン別: {', '.join(f'{n} {c}' for n, c in pattern_hits().most_common())}")
+    if args.dry_run:
+        print(f"✅ 変更が必要なファイル: {changed_files}/{len(files)}（{elapsed:.2f}秒、書き込みなし）")
+    else:
+        print(f"✅ 書き込み: {written_files}/{len(files)}ファイル（{elapsed:.2f}秒）")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
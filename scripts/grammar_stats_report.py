@@ -2,205 +2,612 @@
 """
 NEW HORIZON文法問題 統計レポート生成スクリプト
 
-文並び替え問題の詳細な統計情報を生成します。
+public/data/grammar/grade*/unit*.json の全単元（5つの問題タイプ）を対象に、
+学年・単元・問題タイプ・難易度・文法項目・語数の統計を生成します。
+
+集計の流れ:
+- 単元ファイルを自動検出し、変更されたファイルを学年ごとにまとめて ProcessPoolExecutor で並列に集計
+  （読み込み後の集計は純Pythonの CPU 処理のため、スレッドでは GIL で直列になる。
+  グループが1つだけ、または --workers 1 の場合はプロセスを起動せずに直列で集計）
+- 問題を QuestionRecord に変換し、Counter ベースの集計器に1回の走査で投入
+- ファイルごとの部分集計を内容ハッシュをキーにキャッシュし、全体は部分集計の和で求める
+  （Counter の加算は結合的なので、変更された単元だけ再集計して残りはキャッシュから合算）
+- コンソール表示・JSON・CSV（単元 × 問題タイプの表）を出力
+
+語数は wordCount があればそれを使い、なければ解答後の英文から数えます
+（sentenceOrdering は words、それ以外は空欄を正解で埋めた sentence / targetSentence /
+会話の行、空欄を含む英文がなければ correctAnswer）。
 
 使用方法:
     python3 scripts/grammar_stats_report.py
-    
-出力情報:
-- 学年別問題数・Unit数
-- 語数分布
-- 難易度分布
-- 文法項目別の問題数
-- Unit別の詳細情報
+    python3 scripts/grammar_stats_report.py --legacy        # sentence-ordering-grade*.json も集計
+    python3 scripts/grammar_stats_report.py --no-write      # 表示のみ
+    python3 scripts/grammar_stats_report.py --check         # pre-commit 用（要約のみ、不整合で終了コード1）
+
+出力:
+    tools/data/grammar_stats_report.json   # 全集計
+    tools/data/grammar_stats_report.csv    # 単元ごとの問題タイプ別問題数
+    tools/data/grammar_stats_cache.json    # ファイルごとの部分集計（内容ハッシュ → 部分集計）
 """
 
+import argparse
 import json
+import re
+import sys
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
 from pathlib import Path
-from collections import defaultdict
-
-
-def generate_stats_report():
-    """文法問題の統計レポート生成"""
-    
-    # スクリプトからの相対パスでデータディレクトリを特定
-    script_dir = Path(__file__).parent
-    data_dir = script_dir.parent / 'public' / 'data'
-    
-    files = [
-        data_dir / 'sentence-ordering-grade1.json',
-        data_dir / 'sentence-ordering-grade2.json',
-        data_dir / 'sentence-ordering-grade3.json',
-    ]
-    
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from data_store import content_hash, write_csv_dicts, write_json, write_text
+from explanation_templates import QUESTION_TYPES, load_unit
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / 'public' / 'data'
+GRAMMAR_DIR = DATA_DIR / 'grammar'
+JSON_OUTPUT = BASE_DIR / 'tools' / 'data' / 'grammar_stats_report.json'
+CSV_OUTPUT = BASE_DIR / 'tools' / 'data' / 'grammar_stats_report.csv'
+CACHE_PATH = BASE_DIR / 'tools' / 'data' / 'grammar_stats_cache.json'
+
+CACHE_VERSION = 1
+
+# 語数の区分（下限, 上限, 表示名）
+WORD_BUCKETS = ((0, 2, '1-2'), (3, 5, '3-5'), (6, 8, '6-8'), (9, 11, '9-11'), (12, None, '12+'))
+
+# sentenceOrdering の語数分布の目標（区分 → (下限%, 上限%)）
+WORD_TARGETS = {'3-5': (40, 50), '6-8': (45, 55), '9-11': (5, 15), '12+': (0, 5)}
+
+DEFAULT_WORKERS = 8
+
+_BLANK_RE = re.compile(r'_{3,}')
+_WORD_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9'’-]*")
+_SPEAKER_RE = re.compile(r'^\s*[A-Z][a-z]*\s*[:：]\s*')
+_UNIT_NUMBER_RE = re.compile(r'(\d+)')
+
+
+class QuestionRecord(NamedTuple):
+    """集計用の1問分の属性"""
+
+    grade: int
+    source: str
+    unit: str
+    type: str
+    difficulty: str
+    grammar_point: str
+    word_count: int
+
+
+class UnitInfo(NamedTuple):
+    """単元のメタデータ"""
+
+    grade: int
+    unit: str
+    title: str
+    grammar: str
+    declared_total: Optional[int]
+    declared_types: Dict[str, int]
+    enabled: bool
+    source: str
+
+
+def _natural_key(path: Path) -> Tuple[str, int]:
+    match = _UNIT_NUMBER_RE.search(path.stem)
+    return (path.parent.name, int(match.group(1)) if match else -1)
+
+
+def discover_unit_files(grammar_dir: Path = GRAMMAR_DIR) -> List[Path]:
+    """学年ディレクトリ直下の単元ファイル（archive は除く、単元番号順）"""
+    return sorted(grammar_dir.glob('grade*/unit*.json'), key=_natural_key)
+
+
+def legacy_files(data_dir: Path = DATA_DIR) -> List[Path]:
+    """旧形式の文並び替え問題ファイル"""
+    return sorted(data_dir.glob('sentence-ordering-grade*.json'))
+
+
+def count_words(text: str) -> int:
+    """英単語の数（記号のみのトークンは数えない）"""
+    return len(_WORD_RE.findall(text or ''))
+
+
+def _blank_carrier(question: dict) -> Optional[str]:
+    """空欄（____）を含む英文（なければNone）"""
+    q_type = question.get('type')
+    if q_type in ('fillInBlank', 'verbForm'):
+        candidates = [question.get('sentence')]
+    elif q_type == 'paraphrase':
+        candidates = [question.get('targetSentence'), question.get('question')]
+    elif q_type == 'conversation':
+        candidates = [line.get('text') if isinstance(line, dict) else line
+                      for line in question.get('dialogue') or []]
+    else:
+        candidates = []
+    for text in candidates:
+        if isinstance(text, str) and _BLANK_RE.search(text):
+            return _SPEAKER_RE.sub('', text)
+    return None
+
+
+def question_word_count(question: dict) -> int:
+    """
+    問題の英文（解答後の文）の語数
+
+    Args:
+        question: 問題
+
+    Returns:
+        int: wordCount があればその値、なければ words の語数、空欄を含む英文
+             （sentence / targetSentence / 会話の行）の語数 + 正解の語数、
+             それもなければ正解の語数
+    """
+    if isinstance(question.get('wordCount'), int):
+        return question['wordCount']
+    if question.get('type') == 'sentenceOrdering' and isinstance(question.get('words'), list):
+        return sum(count_words(word) for word in question['words'])
+    answer = question.get('correctAnswer') or ''
+    carrier = _blank_carrier(question)
+    if carrier is not None:
+        return count_words(_BLANK_RE.sub(' ', carrier)) + count_words(answer)
+    return count_words(answer)
+
+
+def word_bucket(count: int) -> str:
+    """語数の区分名"""
+    for low, high, label in WORD_BUCKETS:
+        if count >= low and (high is None or count <= high):
+            return label
+    return WORD_BUCKETS[0][2]
+
+
+def _grade_from_path(path: Path) -> int:
+    match = _UNIT_NUMBER_RE.search(path.parent.name if path.parent.name.startswith('grade')
+                                   else path.stem)
+    return int(match.group(1)) if match else 0
+
+
+def read_unit(path: Path) -> Tuple[List[UnitInfo], List[QuestionRecord]]:
+    """
+    単元ファイルを読み込み、単元情報と問題レコードに変換
+
+    Args:
+        path: grade*/unit*.json または sentence-ordering-grade*.json
+
+    Returns:
+        tuple: (単元情報のリスト, 問題レコードのリスト)
+    """
+    data = load_unit(path)
+    if 'units' in data:
+        grade = data.get('grade') or _grade_from_path(path)
+        units = [(unit, unit.get('questions') or unit.get('sentenceOrdering') or [])
+                 for unit in data['units']]
+        default_type = 'sentenceOrdering'
+    else:
+        grade = _grade_from_path(path)
+        units = [(data, data.get('questions', []))]
+        default_type = None
+
+    infos = []
+    records = []
+    for index, (unit, questions) in enumerate(units):
+        name = unit.get('unit') or f'Unit {index}'
+        infos.append(UnitInfo(grade, name, unit.get('title', ''), unit.get('grammar', ''),
+                              unit.get('totalQuestions'), unit.get('questionTypes') or {},
+                              unit.get('enabled', True) is not False, path.name))
+        for question in questions:
+            records.append(QuestionRecord(
+                grade,
+                path.name,
+                name,
+                question.get('type') or default_type or 'unknown',
+                question.get('difficulty') or 'unknown',
+                question.get('grammarPoint') or unit.get('grammar') or unit.get('title') or 'unknown',
+                question_word_count(question),
+            ))
+    return infos, records
+
+
+class StatsAccumulator:
+    """問題レコードを1回の走査で集計（部分集計どうしは merge で合算）"""
+
+    COUNTERS = ('by_grade', 'by_unit', 'by_type', 'by_grade_type', 'by_unit_type',
+                'by_difficulty', 'by_grade_difficulty', 'by_type_difficulty',
+                'by_grammar_point', 'by_grade_grammar_point', 'word_buckets',
+                'by_type_word_buckets', 'word_histogram', 'words_total')
+
+    def __init__(self):
+        self.units: List[UnitInfo] = []
+        self.by_grade = Counter()
+        self.by_unit = Counter()
+        self.by_type = Counter()
+        self.by_grade_type = Counter()
+        self.by_unit_type = Counter()
+        self.by_difficulty = Counter()
+        self.by_grade_difficulty = Counter()
+        self.by_type_difficulty = Counter()
+        self.by_grammar_point = Counter()
+        self.by_grade_grammar_point = Counter()
+        self.word_buckets = Counter()
+        self.by_type_word_buckets = Counter()
+        self.word_histogram = Counter()
+        self.words_total = Counter()
+
+    def add_unit(self, info: UnitInfo):
+        self.units.append(info)
+
+    def add(self, record: QuestionRecord):
+        """1問を全集計に反映"""
+        unit_key = (record.grade, record.source, record.unit)
+        bucket = word_bucket(record.word_count)
+        self.by_grade[record.grade] += 1
+        self.by_unit[unit_key] += 1
+        self.by_type[record.type] += 1
+        self.by_grade_type[(record.grade, record.type)] += 1
+        self.by_unit_type[(*unit_key, record.type)] += 1
+        self.by_difficulty[record.difficulty] += 1
+        self.by_grade_difficulty[(record.grade, record.difficulty)] += 1
+        self.by_type_difficulty[(record.type, record.difficulty)] += 1
+        self.by_grammar_point[record.grammar_point] += 1
+        self.by_grade_grammar_point[(record.grade, record.grammar_point)] += 1
+        self.word_buckets[bucket] += 1
+        self.by_type_word_buckets[(record.type, bucket)] += 1
+        self.word_histogram[record.word_count] += 1
+        self.words_total[record.type] += record.word_count
+
+    def extend(self, records: Iterable[QuestionRecord]):
+        for record in records:
+            self.add(record)
+
+    def merge(self, other: 'StatsAccumulator') -> 'StatsAccumulator':
+        """別の部分集計を合算（順序によらず同じ結果になる）"""
+        self.units.extend(other.units)
+        for name in self.COUNTERS:
+            getattr(self, name).update(getattr(other, name))
+        return self
+
+    def to_partial(self) -> dict:
+        """キャッシュ保存用の部分集計（Counter のタプルキーはリストにする）"""
+        return {
+            'units': [list(info) for info in self.units],
+            **{name: [[list(key) if isinstance(key, tuple) else key, count]
+                      for key, count in getattr(self, name).items()]
+               for name in self.COUNTERS},
+        }
+
+    @classmethod
+    def from_partial(cls, data: dict) -> 'StatsAccumulator':
+        """to_partial の出力から復元"""
+        stats = cls()
+        stats.units = [UnitInfo(*row) for row in data['units']]
+        for name in cls.COUNTERS:
+            getattr(stats, name).update(
+                {tuple(key) if isinstance(key, list) else key: count for key, count in data[name]})
+        return stats
+
+    @property
+    def total(self) -> int:
+        return sum(self.by_grade.values())
+
+    def types(self) -> List[str]:
+        """問題タイプ（既定の5タイプ + それ以外）"""
+        return list(QUESTION_TYPES) + sorted(t for t in self.by_type if t not in QUESTION_TYPES)
+
+    def declared_mismatches(self) -> List[Tuple[UnitInfo, int, Dict[str, int]]]:
+        """totalQuestions / questionTypes が実際の問題数と一致しない単元"""
+        mismatches = []
+        for info in self.units:
+            if info.declared_total is None and not info.declared_types:
+                continue
+            actual_types = {t: self.by_unit_type[(info.grade, info.source, info.unit, t)] for t in self.types()
+                            if self.by_unit_type[(info.grade, info.source, info.unit, t)]}
+            actual_total = self.by_unit[(info.grade, info.source, info.unit)]
+            declared_types = {t: n for t, n in info.declared_types.items() if n}
+            if ((info.declared_total is not None and info.declared_total != actual_total)
+                    or (info.declared_types and declared_types != actual_types)):
+                mismatches.append((info, actual_total, actual_types))
+        return mismatches
+
+    def unit_rows(self) -> List[Dict[str, object]]:
+        """単元ごとの行（CSV出力用）"""
+        rows = []
+        for info in self.units:
+            key = (info.grade, info.source, info.unit)
+            total = self.by_unit[key]
+            row = {'grade': info.grade, 'unit': info.unit, 'title': info.title,
+                   'grammar': info.grammar, 'enabled': info.enabled,
+                   'source': info.source, 'total': total}
+            for q_type in self.types():
+                row[q_type] = self.by_unit_type[(*key, q_type)]
+            rows.append(row)
+        return rows
+
+    def to_dict(self) -> dict:
+        """JSON出力用の集計結果"""
+        def nested(counter: Counter) -> Dict[str, Dict[str, int]]:
+            result: Dict[str, Dict[str, int]] = {}
+            for (outer, inner), count in sorted(counter.items(), key=lambda x: (str(x[0][0]), -x[1])):
+                result.setdefault(str(outer), {})[str(inner)] = count
+            return result
+
+        types = self.types()
+        return {
+            'generatedAt': date.today().isoformat(),
+            'totalQuestions': self.total,
+            'totalUnits': len(self.units),
+            'byGrade': {str(g): n for g, n in sorted(self.by_grade.items())},
+            'byType': {t: self.by_type[t] for t in types if self.by_type[t]},
+            'byGradeType': nested(self.by_grade_type),
+            'byDifficulty': dict(self.by_difficulty.most_common()),
+            'byGradeDifficulty': nested(self.by_grade_difficulty),
+            'byTypeDifficulty': nested(self.by_type_difficulty),
+            'byGrammarPoint': dict(self.by_grammar_point.most_common()),
+            'byGradeGrammarPoint': nested(self.by_grade_grammar_point),
+            'wordCount': {
+                'buckets': {label: self.word_buckets[label] for _, _, label in WORD_BUCKETS},
+                'byType': nested(self.by_type_word_buckets),
+                'averageByType': {t: round(self.words_total[t] / self.by_type[t], 2)
+                                  for t in types if self.by_type[t]},
+                'histogram': {str(n): c for n, c in sorted(self.word_histogram.items())},
+            },
+            'units': self.unit_rows(),
+            'declaredMismatches': [
+                {'source': info.source, 'unit': info.unit, 'declaredTotal': info.declared_total,
+                 'actualTotal': total, 'declaredTypes': info.declared_types, 'actualTypes': types_}
+                for info, total, types_ in self.declared_mismatches()
+            ],
+        }
+
+
+def file_partial(path: Path) -> StatsAccumulator:
+    """1ファイル分の部分集計"""
+    infos, records = read_unit(path)
+    stats = StatsAccumulator()
+    for info in infos:
+        stats.add_unit(info)
+    stats.extend(records)
+    return stats
+
+
+def _grade_key(path: Path) -> str:
+    match = re.search(r'grade(\d+)', path.resolve().as_posix())
+    return match.group(0) if match else path.parent.name
+
+
+def _partial_group(group: List[Tuple[str, str, Path]]) -> List[Tuple[str, str, dict]]:
+    """1学年分のファイルを部分集計（ワーカープロセスで実行するためモジュールレベルに置く）"""
+    return [(name, digest, file_partial(path).to_partial()) for name, digest, path in group]
+
+
+def _cache_name(path: Path) -> str:
+    try:
+        return path.resolve().relative_to(BASE_DIR).as_posix()
+    except ValueError:
+        return str(path.resolve())
+
+
+def load_cache(cache_path: Path, engine: str) -> Dict[str, dict]:
+    """部分集計キャッシュ（形式・集計コードが変わっていれば空）"""
+    if not cache_path.exists():
+        return {}
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return {}
+    if data.get('version') != CACHE_VERSION or data.get('engine') != engine:
+        return {}
+    return data.get('files', {})
+
+
+def collect_stats(files: List[Path], workers: int = DEFAULT_WORKERS,
+                  cache_path: Optional[Path] = CACHE_PATH) -> Tuple[StatsAccumulator, int]:
+    """
+    ファイルごとの部分集計を合算して全体の集計を作成
+
+    内容ハッシュがキャッシュと一致するファイルは読み込まず、変更されたファイルだけを
+    学年ごとにまとめて別プロセスで並列に集計し直します。
+
+    Args:
+        files: 単元ファイル
+        workers: 並列数（プロセス数。1 の場合は直列）
+        cache_path: 部分集計キャッシュ（Noneの場合はキャッシュを使わない）
+
+    Returns:
+        tuple: (集計結果, キャッシュを再利用したファイル数)
+    """
+    engine = content_hash(Path(__file__).read_bytes())
+    cache = load_cache(cache_path, engine) if cache_path else {}
+
+    partials: Dict[str, StatsAccumulator] = {}
+    entries: Dict[str, dict] = {}
+    pending: Dict[str, List[Tuple[str, str, Path]]] = defaultdict(list)
+    for path in files:
+        name = _cache_name(path)
+        digest = content_hash(path.read_bytes())
+        entry = cache.get(name)
+        if entry and entry.get('sha256') == digest:
+            partials[name] = StatsAccumulator.from_partial(entry['partial'])
+            entries[name] = entry
+        else:
+            pending[_grade_key(path)].append((name, digest, path))
+
+    reused = len(partials)
+    groups = list(pending.values())
+    if workers > 1 and len(groups) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(groups))) as executor:
+            computed = list(executor.map(_partial_group, groups))
+    else:
+        computed = [_partial_group(group) for group in groups]
+    for group in computed:
+        for name, digest, partial in group:
+            partials[name] = StatsAccumulator.from_partial(partial)
+            entries[name] = {'sha256': digest, 'partial': partial}
+
+    stats = StatsAccumulator()
+    for path in files:
+        stats.merge(partials[_cache_name(path)])
+
+    if cache_path and pending:
+        # 今回の対象外（--legacy なし実行時の旧形式ファイルなど）のエントリも保持する
+        merged = {**cache, **entries}
+        write_text(cache_path, json.dumps({'version': CACHE_VERSION, 'engine': engine, 'files': merged},
+                                          ensure_ascii=False, separators=(',', ':')), backup=False)
+    return stats, reused
+
+
+def _unit_label(info: UnitInfo) -> str:
+    prefix = f"grade{info.grade}/" if info.source.startswith('unit') else ''
+    return f"{prefix}{info.source} {info.unit}"
+
+
+def _percent(count: int, total: int) -> float:
+    return count / total * 100 if total else 0.0
+
+
+def _section(title: str):
     print("\n" + "=" * 80)
-    print("NEW HORIZON Grammar Questions - Statistics Report")
+    print(title)
     print("=" * 80)
-    print(f"Report Date: 2025-11-23")
-    print(f"Data Files: {len([f for f in files if f.exists()])}")
-    print("=" * 80)
-    
-    total_questions = 0
-    total_units = 0
-    word_count_stats = {"3-5": 0, "6-8": 0, "9-11": 0, "12+": 0}
-    difficulty_stats = defaultdict(int)
-    grammar_points = defaultdict(int)
-    grade_details = []
-    
-    for filepath in files:
-        if not filepath.exists():
-            print(f"\n⚠️  File not found: {filepath}")
-            continue
-        
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        grade = data['grade']
-        q_count = data['totalQuestions']
-        units = data['units']
-        
+
+
+def print_report(stats: StatsAccumulator, file_count: int):
+    """統計レポートをコンソールに表示"""
+    total = stats.total
+    types = [t for t in stats.types() if stats.by_type[t]]
+
+    _section("NEW HORIZON Grammar Questions - Statistics Report")
+    print(f"Report Date: {date.today().isoformat()}")
+    print(f"Data Files: {file_count}")
+
+    for grade in sorted(stats.by_grade):
+        units = [info for info in stats.units if info.grade == grade]
         print(f"\n【Grade {grade}】")
-        print(f"  Total Questions: {q_count}")
+        print(f"  Total Questions: {stats.by_grade[grade]}")
         print(f"  Total Units: {len(units)}")
-        
-        total_questions += q_count
-        total_units += len(units)
-        
-        grade_word_stats = {"3-5": 0, "6-8": 0, "9-11": 0, "12+": 0}
-        grade_grammar = defaultdict(int)
-        
-        for unit in units:
-            unit_name = unit['unit']
-            unit_title = unit['title']
-            questions = unit['questions']
-            
-            print(f"    • {unit_name}: {unit_title} ({len(questions)} questions)")
-            
-            for q in questions:
-                # 語数統計
-                wc = q['wordCount']
-                if 3 <= wc <= 5:
-                    word_count_stats["3-5"] += 1
-                    grade_word_stats["3-5"] += 1
-                elif 6 <= wc <= 8:
-                    word_count_stats["6-8"] += 1
-                    grade_word_stats["6-8"] += 1
-                elif 9 <= wc <= 11:
-                    word_count_stats["9-11"] += 1
-                    grade_word_stats["9-11"] += 1
-                else:
-                    word_count_stats["12+"] += 1
-                    grade_word_stats["12+"] += 1
-                
-                # 難易度統計
-                difficulty_stats[q['difficulty']] += 1
-                
-                # 文法項目統計
-                grammar_points[q['grammarPoint']] += 1
-                grade_grammar[q['grammarPoint']] += 1
-        
-        # 学年別統計を保存
-        grade_details.append({
-            'grade': grade,
-            'questions': q_count,
-            'units': len(units),
-            'word_stats': grade_word_stats,
-            'grammar': grade_grammar
-        })
-    
-    # 総合統計
-    print("\n" + "=" * 80)
-    print("Overall Statistics")
-    print("=" * 80)
-    print(f"Total Questions: {total_questions}")
-    print(f"Total Units: {total_units}")
-    print(f"Average Questions/Unit: {total_questions/total_units:.1f}")
-    print(f"Average Questions/Grade: {total_questions/len(grade_details):.1f}")
-    
-    # 語数分布
-    print("\n" + "=" * 80)
-    print("Word Count Distribution (Overall)")
-    print("=" * 80)
-    for range_name, count in sorted(word_count_stats.items()):
-        if count > 0:
-            percentage = count/total_questions*100
-            bar = "█" * int(percentage / 2)
-            print(f"  {range_name:8s}: {count:3d} ({percentage:5.1f}%) {bar}")
-    
-    # 学年別語数分布
-    print("\n" + "=" * 80)
-    print("Word Count Distribution by Grade")
-    print("=" * 80)
-    for detail in grade_details:
-        print(f"\n  Grade {detail['grade']}:")
-        for range_name, count in sorted(detail['word_stats'].items()):
-            if count > 0:
-                percentage = count/detail['questions']*100
-                print(f"    {range_name:8s}: {count:3d} ({percentage:5.1f}%)")
-    
-    # 難易度分布
-    print("\n" + "=" * 80)
-    print("Difficulty Distribution")
-    print("=" * 80)
-    for difficulty, count in sorted(difficulty_stats.items()):
-        percentage = count/total_questions*100
-        bar = "█" * int(percentage / 2)
-        print(f"  {difficulty:12s}: {count:3d} ({percentage:5.1f}%) {bar}")
-    
-    # 文法項目トップ15
-    print("\n" + "=" * 80)
-    print("Top 15 Grammar Points")
-    print("=" * 80)
-    sorted_grammar = sorted(grammar_points.items(), key=lambda x: x[1], reverse=True)
-    for idx, (grammar, count) in enumerate(sorted_grammar[:15], 1):
-        print(f"  {idx:2d}. {grammar:35s}: {count:3d} questions")
-    
-    # 学年別文法項目トップ5
-    print("\n" + "=" * 80)
-    print("Top 5 Grammar Points by Grade")
-    print("=" * 80)
-    for detail in grade_details:
-        print(f"\n  Grade {detail['grade']}:")
-        sorted_grade_grammar = sorted(detail['grammar'].items(), key=lambda x: x[1], reverse=True)
-        for idx, (grammar, count) in enumerate(sorted_grade_grammar[:5], 1):
-            print(f"    {idx}. {grammar:30s}: {count:2d} questions")
-    
-    # 推奨事項
-    print("\n" + "=" * 80)
-    print("Quality Metrics")
-    print("=" * 80)
-    
-    # 語数分布の妥当性チェック
-    short_percentage = word_count_stats["3-5"] / total_questions * 100
-    medium_percentage = word_count_stats["6-8"] / total_questions * 100
-    long_percentage = word_count_stats["9-11"] / total_questions * 100
-    very_long_percentage = word_count_stats["12+"] / total_questions * 100
-    
-    print(f"\n  Word Count Distribution Quality:")
-    print(f"    3-5 words:  {short_percentage:5.1f}% (Target: ~45%)  {'✅' if 40 <= short_percentage <= 50 else '⚠️'}")
-    print(f"    6-8 words:  {medium_percentage:5.1f}% (Target: ~50%)  {'✅' if 45 <= medium_percentage <= 55 else '⚠️'}")
-    print(f"    9-11 words: {long_percentage:5.1f}% (Target: ~10%)  {'✅' if 5 <= long_percentage <= 15 else '⚠️'}")
-    print(f"    12+ words:  {very_long_percentage:5.1f}% (Target: <5%)   {'✅' if very_long_percentage < 5 else '⚠️'}")
-    
-    # 問題数バランス
-    print(f"\n  Questions per Unit:")
-    avg_per_unit = total_questions / total_units
-    print(f"    Average: {avg_per_unit:.1f} questions/unit")
-    print(f"    Balance: {'✅ Balanced' if 4 <= avg_per_unit <= 7 else '⚠️  Consider rebalancing'}")
-    
-    # 難易度バランス
-    print(f"\n  Difficulty Balance:")
-    beginner_pct = difficulty_stats.get('beginner', 0) / total_questions * 100
-    intermediate_pct = difficulty_stats.get('intermediate', 0) / total_questions * 100
-    advanced_pct = difficulty_stats.get('advanced', 0) / total_questions * 100
-    print(f"    Beginner:     {beginner_pct:5.1f}% {'✅' if beginner_pct > 0 else '⚠️'}")
-    print(f"    Intermediate: {intermediate_pct:5.1f}% {'✅' if intermediate_pct > 0 else '⚠️'}")
-    print(f"    Advanced:     {advanced_pct:5.1f}% {'✅' if advanced_pct > 0 else '⚠️'}")
-    
-    print("\n" + "=" * 80)
-    print("✅ Statistics Report Complete")
-    print("=" * 80 + "\n")
+        for info in units:
+            disabled = '' if info.enabled else ' [disabled]'
+            count = stats.by_unit[(grade, info.source, info.unit)]
+            print(f"    • {info.unit}: {info.title} ({count} questions){disabled}")
+
+    _section("Overall Statistics")
+    print(f"Total Questions: {total}")
+    print(f"Total Units: {len(stats.units)}")
+    if stats.units:
+        per_unit = [stats.by_unit[(info.grade, info.source, info.unit)] for info in stats.units]
+        print(f"Questions/Unit: avg {total / len(per_unit):.1f} (min {min(per_unit)}, max {max(per_unit)})")
+
+    _section("Question Types by Grade")
+    print("  " + "Grade".ljust(8) + "".join(t[:12].rjust(14) for t in types) + "Total".rjust(8))
+    for grade in sorted(stats.by_grade):
+        cells = "".join(str(stats.by_grade_type[(grade, t)]).rjust(14) for t in types)
+        print(f"  {str(grade):8s}{cells}{stats.by_grade[grade]:8d}")
+    cells = "".join(str(stats.by_type[t]).rjust(14) for t in types)
+    print(f"  {'All':8s}{cells}{total:8d}")
+
+    _section("Word Count Distribution (Overall)")
+    for _, _, label in WORD_BUCKETS:
+        count = stats.word_buckets[label]
+        if count:
+            percentage = _percent(count, total)
+            print(f"  {label:8s}: {count:4d} ({percentage:5.1f}%) {'█' * int(percentage / 2)}")
+    print("\n  Average words by type:")
+    for q_type in types:
+        print(f"    {q_type:18s}: {stats.words_total[q_type] / stats.by_type[q_type]:5.1f}")
+
+    _section("Difficulty Distribution")
+    for difficulty, count in stats.by_difficulty.most_common():
+        percentage = _percent(count, total)
+        print(f"  {difficulty:12s}: {count:4d} ({percentage:5.1f}%) {'█' * int(percentage / 2)}")
+
+    _section("Top 15 Grammar Points")
+    for idx, (grammar, count) in enumerate(stats.by_grammar_point.most_common(15), 1):
+        print(f"  {idx:2d}. {grammar:35s}: {count:4d} questions")
+
+    _section("Top 5 Grammar Points by Grade")
+    for grade in sorted(stats.by_grade):
+        print(f"\n  Grade {grade}:")
+        ranked = sorted(((gp, n) for (g, gp), n in stats.by_grade_grammar_point.items() if g == grade),
+                        key=lambda x: x[1], reverse=True)
+        for idx, (grammar, count) in enumerate(ranked[:5], 1):
+            print(f"    {idx}. {grammar:30s}: {count:3d} questions")
+
+    _section("Quality Metrics")
+    ordering_total = stats.by_type['sentenceOrdering']
+    if ordering_total:
+        print("\n  Sentence Ordering Word Count Distribution:")
+        for label, (low, high) in WORD_TARGETS.items():
+            percentage = _percent(stats.by_type_word_buckets[('sentenceOrdering', label)], ordering_total)
+            print(f"    {label:5s} words: {percentage:5.1f}% (Target: {low}-{high}%)  "
+                  f"{'✅' if low <= percentage <= high else '⚠️'}")
+
+    print("\n  Difficulty Balance:")
+    for difficulty in ('beginner', 'intermediate', 'advanced'):
+        percentage = _percent(stats.by_difficulty.get(difficulty, 0), total)
+        print(f"    {difficulty.capitalize() + ':':14s}{percentage:5.1f}% {'✅' if percentage > 0 else '⚠️'}")
+
+    mismatches = stats.declared_mismatches()
+    print("\n  Declared totalQuestions / questionTypes:")
+    if not mismatches:
+        print("    ✅ All units match their questions")
+    for info, actual_total, actual_types in mismatches:
+        print(f"    ⚠️  {_unit_label(info)}: "
+              f"declared {info.declared_total} {info.declared_types} → actual {actual_total} {actual_types}")
+
+    _section("✅ Statistics Report Complete")
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='文法問題の統計レポート')
+    parser.add_argument('--grammar-dir', type=str, help='文法データのディレクトリ')
+    parser.add_argument('--legacy', action='store_true',
+                        help='旧形式の sentence-ordering-grade*.json も集計')
+    parser.add_argument('--json-output', type=str, help='JSONレポートの出力先')
+    parser.add_argument('--csv-output', type=str, help='CSVレポートの出力先')
+    parser.add_argument('--no-write', action='store_true', help='レポートファイルを書き出さない')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='並列に集計するプロセス数（1 で直列）')
+    parser.add_argument('--cache', type=str, help='部分集計キャッシュの保存先')
+    parser.add_argument('--no-cache', action='store_true', help='キャッシュを使わずに全ファイルを集計')
+    parser.add_argument('--check', action='store_true',
+                        help='要約のみ表示し、totalQuestions / questionTypes の不整合があれば終了コード1')
+
+    args = parser.parse_args()
+    grammar_dir = Path(args.grammar_dir) if args.grammar_dir else GRAMMAR_DIR
+
+    files = discover_unit_files(grammar_dir)
+    if args.legacy:
+        files += legacy_files()
+    if not files:
+        print(f"❌ 単元ファイルが見つかりません: {grammar_dir}", file=sys.stderr)
+        return 1
+
+    cache_path = None if args.no_cache else (Path(args.cache) if args.cache else CACHE_PATH)
+    stats, reused = collect_stats(files, args.workers, cache_path)
+
+    if args.check:
+        mismatches = stats.declared_mismatches()
+        print(f"📊 文法問題 {stats.total}問 / {len(stats.units)}単元"
+              f"（キャッシュ再利用 {reused}/{len(files)}ファイル）")
+        for info, actual_total, actual_types in mismatches:
+            print(f"  ❌ {_unit_label(info)}: totalQuestions/questionTypes "
+                  f"{info.declared_total} {info.declared_types} → 実際 {actual_total} {actual_types}")
+        return 1 if mismatches else 0
+
+    print_report(stats, len(files))
+    if cache_path:
+        print(f"♻️  部分集計キャッシュ: {reused}/{len(files)}ファイル再利用")
+
+    if not args.no_write:
+        json_path = Path(args.json_output) if args.json_output else JSON_OUTPUT
+        csv_path = Path(args.csv_output) if args.csv_output else CSV_OUTPUT
+        rows = stats.unit_rows()
+        write_json(json_path, stats.to_dict(), backup=False)
+        write_csv_dicts(csv_path, list(rows[0]) if rows else [],
+                        ({k: str(v) for k, v in row.items()} for row in rows), backup=False)
+        print(f"📄 JSON: {json_path}")
+        print(f"📄 CSV:  {csv_path}")
+    return 0
 
 
-if __name__ == "__main__":
-    generate_stats_report()
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+単語 → 原形（lemma）の永続キャッシュとバッチ原形化
+
+spaCy のパイプラインを単語ごとに呼ぶと、1語ごとにパイプライン全体の
+オーバーヘッドがかかります。このモジュールは重複を除いた未登録語だけを
+nlp.pipe でまとめて処理し、結果をキャッシュに保存します。
+
+原形の参照順:
+1. passage-parses（UD依存解析JSON）の lemma
+   同じ語形に複数の lemma がある語（"saw" → see / saw など）は文脈依存のため使わない
+2. spaCy で原形化した結果（モデル名・バージョンが変わったら破棄）
+
+キャッシュ（tools/data/lemma_cache.json）:
+    {
+      "version": 1,
+      "parses": {"J_2022_5.json": "<sha256>", ...},   # 変更されたら passage-parses 分を再構築
+      "parsed": {"is": "be", ...},
+      "model": "en_core_web_sm@3.7.1",
+      "spacy": {"running": "run", ...}
+    }
+
+使用例:
+    from lemma_cache import LemmaCache
+
+    cache = LemmaCache.load()
+    lemmas = cache.lemmatize(words, nlp)   # 未登録語だけを nlp.pipe でまとめて処理
+    cache.save()
+
+    python3 scripts/lemma_cache.py                  # passage-parses からキャッシュを更新
+    python3 scripts/lemma_cache.py --lookup ran is  # キャッシュを参照（未登録語は spaCy で原形化）
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from data_store import content_hash, write_text
+from passage_parse_store import load_parse
+
+try:
+    import spacy
+    HAS_SPACY = True
+except ImportError:
+    HAS_SPACY = False
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+PARSES_DIR = BASE_DIR / 'public' / 'data' / 'passage-parses'
+CACHE_PATH = BASE_DIR / 'tools' / 'data' / 'lemma_cache.json'
+
+CACHE_VERSION = 1
+SPACY_MODEL = 'en_core_web_sm'
+
+# 原形化に必要なコンポーネント（それ以外の parser / ner などは無効化）
+LEMMA_COMPONENTS = ('tok2vec', 'tagger', 'attribute_ruler', 'lemmatizer')
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def load_spacy(model: str = SPACY_MODEL):
+    """
+    原形化用の spaCy パイプラインを読み込み
+
+    Returns:
+        Language: parser / ner などを除外したパイプライン（spaCy がなければ None）
+    """
+    if not HAS_SPACY:
+        return None
+    nlp = spacy.load(model)
+    excluded = [name for name in nlp.pipe_names if name not in LEMMA_COMPONENTS]
+    if excluded:
+        nlp.select_pipes(disable=excluded)
+    return nlp
+
+
+def model_signature(nlp) -> str:
+    """キャッシュの有効性判定に使うモデル名とバージョン"""
+    meta = getattr(nlp, 'meta', {}) or {}
+    return f"{meta.get('lang', 'xx')}_{meta.get('name', 'unknown')}@{meta.get('version', '0')}"
+
+
+def read_parse_lemmas(parses_dir: Path = PARSES_DIR) -> Dict[str, Counter]:
+    """
+    passage-parses のトークンから 語形（小文字） → lemma の出現数 を集計
+
+    Args:
+        parses_dir: UD依存解析JSONのディレクトリ
+
+    Returns:
+        dict: 語形 → Counter(lemma → 出現数)
+    """
+    forms: Dict[str, Counter] = {}
+    for parse_path in sorted(parses_dir.glob('*.json')):
+        for sentence in load_parse(parse_path).sentences:
+            for token in sentence.get('tokens', []):
+                text = token.get('text', '')
+                lemma = token.get('lemma')
+                if text.isalpha() and lemma:
+                    forms.setdefault(text.lower(), Counter())[lemma.lower()] += 1
+    return forms
+
+
+def _parse_hashes(parses_dir: Path) -> Dict[str, str]:
+    return {p.name: content_hash(p.read_bytes()) for p in sorted(parses_dir.glob('*.json'))}
+
+
+class LemmaCache:
+    """単語 → 原形 の永続キャッシュ"""
+
+    def __init__(self, path: Path = CACHE_PATH, parses: Optional[Dict[str, str]] = None,
+                 parsed: Optional[Dict[str, str]] = None, model: str = '',
+                 spacy_lemmas: Optional[Dict[str, str]] = None):
+        self.path = Path(path)
+        self.parses = parses or {}
+        self.parsed = parsed or {}
+        self.model = model
+        self.spacy = spacy_lemmas or {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Path = CACHE_PATH, parses_dir: Path = PARSES_DIR) -> 'LemmaCache':
+        """
+        キャッシュを読み込み、passage-parses が変わっていれば該当部分を再構築
+
+        Args:
+            path: キャッシュJSON
+            parses_dir: UD依存解析JSONのディレクトリ
+
+        Returns:
+            LemmaCache: 最新のキャッシュ
+        """
+        data = {}
+        if Path(path).exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (json.JSONDecodeError, OSError):
+                data = {}
+        if data.get('version') != CACHE_VERSION:
+            data = {}
+
+        cache = cls(path, data.get('parses'), data.get('parsed'),
+                    data.get('model', ''), data.get('spacy'))
+        cache.refresh_parses(parses_dir)
+        return cache
+
+    def refresh_parses(self, parses_dir: Path = PARSES_DIR) -> bool:
+        """passage-parses の内容ハッシュが変わっていれば lemma を再集計（変更があればTrue）"""
+        hashes = _parse_hashes(parses_dir) if parses_dir.exists() else {}
+        if hashes == self.parses:
+            return False
+
+        self.parsed = {
+            form: lemmas.most_common(1)[0][0]
+            for form, lemmas in sorted(read_parse_lemmas(parses_dir).items())
+            if len(lemmas) == 1
+        }
+        self.parses = hashes
+        self._dirty = True
+        return True
+
+    def __len__(self) -> int:
+        return len(set(self.parsed) | set(self.spacy))
+
+    def get(self, word: str) -> Optional[str]:
+        """キャッシュ済みの原形（未登録ならNone）"""
+        key = word.lower()
+        return self.parsed.get(key) or self.spacy.get(key)
+
+    def lemmatize(self, words: Iterable[str], nlp=None,
+                  batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, str]:
+        """
+        単語をまとめて原形化
+
+        英字のみの語は小文字にして重複を除き、キャッシュにない語だけを
+        nlp.pipe で一度に処理します。英字以外を含む語はそのまま返します。
+
+        Args:
+            words: 単語
+            nlp: load_spacy() のパイプライン（Noneの場合、未登録語は小文字形を原形とする）
+            batch_size: nlp.pipe のバッチサイズ
+
+        Returns:
+            dict: 入力の単語 → 原形
+        """
+        words = list(dict.fromkeys(words))
+        if nlp is not None:
+            signature = model_signature(nlp)
+            if signature != self.model:
+                self.model = signature
+                self.spacy = {}
+                self._dirty = True
+
+        missing = sorted({w.lower() for w in words if w.isalpha() and self.get(w) is None})
+        if missing and nlp is not None:
+            for word, doc in zip(missing, nlp.pipe(missing, batch_size=batch_size)):
+                self.spacy[word] = doc[0].lemma_ if len(doc) > 0 else word
+            self._dirty = True
+
+        result = {}
+        for word in words:
+            if not word.isalpha():
+                result[word] = word
+            else:
+                result[word] = self.get(word) or word.lower()
+        return result
+
+    def save(self) -> bool:
+        """変更があればキャッシュを書き出し（書き込んだ場合True）"""
+        if not self._dirty:
+            return False
+        data = {
+            'version': CACHE_VERSION,
+            'parses': self.parses,
+            'parsed': self.parsed,
+            'model': self.model,
+            'spacy': dict(sorted(self.spacy.items())),
+        }
+        write_text(self.path, json.dumps(data, ensure_ascii=False, separators=(',', ':')),
+                   backup=False)
+        self._dirty = False
+        return True
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='単語 → 原形 キャッシュ')
+    parser.add_argument('--cache', type=str, help='キャッシュJSONの出力先')
+    parser.add_argument('--parses-dir', type=str, help='UD依存解析JSONのディレクトリ')
+    parser.add_argument('--lookup', nargs='+', metavar='WORD', help='単語の原形を表示')
+
+    args = parser.parse_args()
+    cache_path = Path(args.cache) if args.cache else CACHE_PATH
+    parses_dir = Path(args.parses_dir) if args.parses_dir else PARSES_DIR
+
+    cache = LemmaCache.load(cache_path, parses_dir)
+    if args.lookup:
+        missing = [w for w in args.lookup if w.isalpha() and cache.get(w) is None]
+        nlp = None
+        if missing:
+            if HAS_SPACY:
+                nlp = load_spacy()
+            else:
+                print("⚠️  spaCy がないため、未登録語は小文字形を原形とします")
+        lemmas = cache.lemmatize(args.lookup, nlp)
+        for word in args.lookup:
+            source = '（未登録）' if word in missing and nlp is None else ''
+            print(f"  📖 {word} → {lemmas[word]}{source}")
+    cache.save()
+
+    print(f"✅ 原形キャッシュ: {len(cache)}語（passage-parses {len(cache.parsed)}語 / "
+          f"spaCy {len(cache.spacy)}語）")
+    print(f"  出力: {cache_path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
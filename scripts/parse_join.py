@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+フレーズ学習セグメントと passage-parses（UD依存解析）トークンの結合
+
+public/data/passage-parses/<passageId>.json には文ごとのトークン
+（lemma, upos, xpos, head, deprel と文内の start/end）があります。
+このモジュールはフレーズ学習JSONのセグメントを文字オフセットでトークンに
+対応付け、文脈を考慮した原形・品詞を再利用できるようにします。
+
+結合方法:
+1. 解析結果の全文から空白を除いた文字列を作り、各文字がどのトークンに属するかの
+   配列を用意（ParseIndex）
+2. フレーズの英文（空白除去）を前回の一致位置以降から探し、セグメントの単語を
+   フレーズ内で順に探して全体オフセットを求める
+   （注記記号・見出し行などでフレーズ全体が一致しない場合は、セグメントごとに
+   カーソルの近傍だけを探す）
+3. セグメントの範囲とトークンの範囲が完全に一致した場合だけ結合
+   （縮約形の分割などで一致しないセグメント、解析結果にない語は None）
+
+カーソルは前にしか進まないため、1パッセージあたりの処理は文字数に対して線形です。
+
+使用例:
+    from parse_join import join_passage, load_parse_for
+
+    parse = load_parse_for('beginner_50_Morning-Routine')
+    tokens = join_passage(passage_data, parse)   # フレーズごとのトークン（またはNone）のリスト
+
+    python3 scripts/parse_join.py public/data/passages/6_passages-phrase-learning/*.json
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+from passage_parse_store import ParsedPassage, load_parse
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+PARSES_DIR = BASE_DIR / 'public' / 'data' / 'passage-parses'
+
+_WORD_COUNT_RE = re.compile(r'-\d+(?=-)')
+
+# フレーズ全体が一致しない場合に、セグメント単位で読み飛ばせる文字数
+MAX_SKIP = 8
+
+
+class ParseToken(NamedTuple):
+    """UD依存解析のトークン（sentence は文ID）"""
+
+    sentence: int
+    id: int
+    text: str
+    lemma: str
+    upos: str
+    xpos: str
+    head: int
+    deprel: str
+
+
+class ParseIndex:
+    """
+    解析結果の文字オフセット索引
+
+    text は全文から空白を除いた文字列、owner[i] は text[i] が属するトークンの
+    番号（トークン外の文字は -1）、spans[k] はトークン k の text 上の範囲です。
+    """
+
+    def __init__(self, parse):
+        if isinstance(parse, dict):
+            parse = ParsedPassage(parse)
+        self.passage_id = parse.get('passageId', '')
+        chars: List[str] = []
+        owner: List[int] = []
+        self.tokens: List[ParseToken] = []
+        self.spans: List[tuple] = []
+
+        for sentence in parse.get('sentences', []):
+            text = sentence.get('text', '')
+            token_at = [-1] * len(text)
+            for token in sentence.get('tokens', []):
+                index = len(self.tokens)
+                self.tokens.append(ParseToken(
+                    sentence=sentence.get('id', 0),
+                    id=token.get('id', 0),
+                    text=token.get('text', ''),
+                    lemma=token.get('lemma') or token.get('text', ''),
+                    upos=token.get('upos', ''),
+                    xpos=token.get('xpos', ''),
+                    head=token.get('head', 0),
+                    deprel=token.get('deprel', ''),
+                ))
+                self.spans.append([None, None])
+                for offset in range(max(token.get('start', 0), 0), min(token.get('end', 0), len(text))):
+                    token_at[offset] = index
+
+            for offset, char in enumerate(text):
+                if char.isspace():
+                    continue
+                index = token_at[offset]
+                position = len(chars)
+                chars.append(char)
+                owner.append(index)
+                if index >= 0:
+                    span = self.spans[index]
+                    if span[0] is None:
+                        span[0] = position
+                    span[1] = position + 1
+
+        self.text = ''.join(chars)
+        self.owner = owner
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def token_for_span(self, start: int, end: int) -> Optional[ParseToken]:
+        """text 上の範囲 [start, end) と完全に一致するトークン"""
+        if not 0 <= start < len(self.owner):
+            return None
+        index = self.owner[start]
+        if index < 0 or tuple(self.spans[index]) != (start, end):
+            return None
+        return self.tokens[index]
+
+
+def _compact(text: str) -> str:
+    return ''.join(text.split())
+
+
+def join_passage(passage: dict, parse) -> List[List[Optional[ParseToken]]]:
+    """
+    フレーズ学習JSONのセグメントを解析トークンに対応付け
+
+    Args:
+        passage: 従来形式のフレーズ学習JSON（phrases[].english, phrases[].segments[].word）
+        parse: passage-parses のJSON（従来形式・列指向形式）、またはその ParseIndex
+
+    Returns:
+        list: フレーズごとに、セグメントと同じ長さの ParseToken（対応なしは None）のリスト
+    """
+    index = parse if isinstance(parse, ParseIndex) else ParseIndex(parse)
+    cursor = 0
+    joined = []
+    for phrase in passage.get('phrases', []):
+        segments = phrase.get('segments', [])
+        tokens: List[Optional[ParseToken]] = [None] * len(segments)
+        joined.append(tokens)
+
+        key = _compact(phrase.get('english', ''))
+        position = index.text.find(key, cursor) if key else -1
+        if position < 0:
+            cursor = _join_segments_near(index, segments, tokens, cursor)
+            continue
+        cursor = position + len(key)
+
+        local = 0
+        for i, segment in enumerate(segments):
+            word = _compact(segment.get('word', ''))
+            if not word:
+                continue
+            found = key.find(word, local)
+            if found < 0:
+                continue
+            local = found + len(word)
+            tokens[i] = index.token_for_span(position + found, position + local)
+    return joined
+
+
+def _join_segments_near(index: ParseIndex, segments: List[dict],
+                        tokens: List[Optional[ParseToken]], cursor: int) -> int:
+    """セグメントごとにカーソルの近傍（MAX_SKIP 文字以内）で一致するトークンを探す"""
+    for i, segment in enumerate(segments):
+        word = _compact(segment.get('word', ''))
+        if not word:
+            continue
+        found = index.text.find(word, cursor, cursor + len(word) + MAX_SKIP)
+        if found < 0:
+            continue
+        token = index.token_for_span(found, found + len(word))
+        if token is not None:
+            tokens[i] = token
+            cursor = found + len(word)
+    return cursor
+
+
+def parse_path_for(passage_id: str, parses_dir: Path = PARSES_DIR) -> Optional[Path]:
+    """
+    パッセージIDに対応する解析JSONのパス
+
+    ファイル名が一致しない場合は、小文字化・"_" → "-"・語数（"_50_" など）を除いた
+    名前でも探します（beginner_50_Morning-Routine → beginner-morning-routine）。
+    """
+    candidates = [passage_id]
+    slug = passage_id.lower().replace('_', '-')
+    candidates += [slug, _WORD_COUNT_RE.sub('', slug)]
+    for name in candidates:
+        path = Path(parses_dir) / f'{name}.json'
+        if path.exists():
+            return path
+    return None
+
+
+def load_parse_for(passage_id: str, parses_dir: Path = PARSES_DIR) -> Optional[ParseIndex]:
+    """パッセージIDに対応する解析結果の索引（解析JSONがなければNone）"""
+    path = parse_path_for(passage_id, parses_dir)
+    if path is None:
+        return None
+    return ParseIndex(load_parse(path))
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='フレーズ学習セグメントとUD解析トークンの結合')
+    parser.add_argument('input', nargs='+', help='フレーズ学習JSON')
+    parser.add_argument('--parses-dir', type=str, help='UD依存解析JSONのディレクトリ')
+    parser.add_argument('--show', action='store_true', help='対応付けできなかったセグメントを表示')
+
+    args = parser.parse_args()
+    parses_dir = Path(args.parses_dir) if args.parses_dir else PARSES_DIR
+
+    for input_name in args.input:
+        input_path = Path(input_name)
+        with open(input_path, 'r', encoding='utf-8') as f:
+            passage = json.load(f)
+        passage_id = passage.get('id') or input_path.stem
+        index = load_parse_for(passage_id, parses_dir)
+        if index is None:
+            print(f"ℹ️  {passage_id}: 解析JSONがありません")
+            continue
+
+        joined = join_passage(passage, index)
+        total = sum(len(tokens) for tokens in joined)
+        matched = sum(token is not None for tokens in joined for token in tokens)
+        print(f"✅ {passage_id} ↔ {index.passage_id}: {matched}/{total} セグメントを結合")
+        if args.show:
+            for phrase, tokens in zip(passage.get('phrases', []), joined):
+                missing = [s.get('word', '') for s, t in zip(phrase.get('segments', []), tokens) if t is None]
+                if missing:
+                    print(f"    {phrase.get('english', '')[:50]}: {' '.join(missing)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+passage-parses（UD依存解析JSON）の列指向コンパクト形式と遅延リーダー
+
+従来形式では1トークンごとに id, text, lemma, upos, xpos, head, deprel, start, end の
+キーを持つオブジェクトを保存するため、キー名と同じ品詞タグが何千回も重複します。
+列指向形式では文ごとに並列配列を持ち、文字列はファイル単位の表に一度だけ保存します。
+
+列指向形式:
+    {
+      "passageId": "J_2022_5", "generatedAt": "...",
+      "format": "columnar", "version": 1,
+      "lemmas": ["Takuma", "be", ...],       # 原形の表（出現順）
+      "upos": ["PROPN", "AUX", ...],         # UPOS / XPOS / deprel のコード表
+      "xpos": [...], "deprel": [...],
+      "sentences": [
+        {"id": 1, "text": "Takuma is ...",
+         "offsets": [0, 6, 7, 9, ...],       # トークンごとの start, end（文内）
+         "lemma": [0, 1, ...], "upos": [...], "xpos": [...], "deprel": [...],
+         "head": [7, 7, ...]}
+      ]
+    }
+
+- トークンの text は text[start:end] から復元します（一致しないトークンだけ "texts" に保存）
+- トークンIDが 1 からの連番でない文だけ "ids" を保存します
+- 値のないフィールドはコード -1 で表します
+- 従来形式への復元はキー順も含めて元のJSONと一致します（decode_parse）
+
+使用例:
+    from passage_parse_store import load_parse
+
+    parse = load_parse(path)          # どちらの形式でも読み込み可能
+    for sentence in parse.sentences:
+        token = sentence[0]           # TokenView（参照された列だけを読む）
+        token.lemma, token.upos, token.head
+
+    python3 scripts/passage_parse_store.py encode public/data/passage-parses/J_2022_5.json
+    python3 scripts/passage_parse_store.py decode public/data/passage-parses/J_2022_5.json -o restored.json
+    python3 scripts/passage_parse_store.py stats public/data/passage-parses/*.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from data_store import write_text
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+PARSES_DIR = BASE_DIR / 'public' / 'data' / 'passage-parses'
+
+COLUMNAR_FORMAT = 'columnar'
+COLUMNAR_VERSION = 1
+
+# 文字列表でエンコードするフィールド（lemma は原形表、その他はタグのコード表）
+CODED_FIELDS = ('upos', 'xpos', 'deprel')
+TOKEN_KEYS = ('id', 'text', 'lemma', 'upos', 'xpos', 'head', 'deprel', 'start', 'end')
+
+MISSING = -1
+
+
+def is_columnar(data: dict) -> bool:
+    """列指向形式の解析JSONか"""
+    return data.get('format') == COLUMNAR_FORMAT
+
+
+class _Interner:
+    def __init__(self):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def code(self, value: Optional[str]) -> int:
+        if value is None:
+            return MISSING
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def encode_parse(data: dict) -> dict:
+    """
+    従来形式の解析JSONを列指向形式に変換
+
+    Args:
+        data: passage-parses の従来形式JSON
+
+    Returns:
+        dict: 列指向形式（従来形式のキー順を保てない入力の場合は ValueError）
+    """
+    if is_columnar(data):
+        return data
+
+    lemmas = _Interner()
+    tables = {name: _Interner() for name in CODED_FIELDS}
+    sentences = []
+    for sentence in data.get('sentences', []):
+        text = sentence.get('text', '')
+        tokens = sentence.get('tokens', [])
+        for token in tokens:
+            if tuple(token) != TOKEN_KEYS:
+                raise ValueError(f"未対応のトークン形式です（文 {sentence.get('id')}）: {list(token)}")
+
+        encoded = {k: v for k, v in sentence.items() if k != 'tokens'}
+        offsets = []
+        for token in tokens:
+            offsets.extend((token['start'], token['end']))
+        encoded['offsets'] = offsets
+        encoded['lemma'] = [lemmas.code(token['lemma']) for token in tokens]
+        for name in CODED_FIELDS:
+            encoded[name] = [tables[name].code(token[name]) for token in tokens]
+        encoded['head'] = [MISSING if token['head'] is None else token['head'] for token in tokens]
+
+        texts = {str(i): token['text'] for i, token in enumerate(tokens)
+                 if text[token['start']:token['end']] != token['text']}
+        if texts:
+            encoded['texts'] = texts
+        ids = [token['id'] for token in tokens]
+        if ids != list(range(1, len(tokens) + 1)):
+            encoded['ids'] = ids
+        sentences.append(encoded)
+
+    result = {k: v for k, v in data.items() if k != 'sentences'}
+    result['format'] = COLUMNAR_FORMAT
+    result['version'] = COLUMNAR_VERSION
+    result['lemmas'] = lemmas.values
+    for name in CODED_FIELDS:
+        result[name] = tables[name].values
+    result['sentences'] = sentences
+    return result
+
+
+class TokenView:
+    """列指向形式の1トークン（属性を参照したときに列から値を取り出す）"""
+
+    __slots__ = ('_sentence', '_index')
+
+    def __init__(self, sentence: 'SentenceView', index: int):
+        self._sentence = sentence
+        self._index = index
+
+    def _code(self, name: str, table: str):
+        code = self._sentence.data[name][self._index]
+        return None if code == MISSING else self._sentence.parse.data[table][code]
+
+    @property
+    def id(self) -> int:
+        ids = self._sentence.data.get('ids')
+        return ids[self._index] if ids else self._index + 1
+
+    @property
+    def start(self) -> int:
+        return self._sentence.data['offsets'][2 * self._index]
+
+    @property
+    def end(self) -> int:
+        return self._sentence.data['offsets'][2 * self._index + 1]
+
+    @property
+    def text(self) -> str:
+        texts = self._sentence.data.get('texts')
+        if texts and str(self._index) in texts:
+            return texts[str(self._index)]
+        return self._sentence.text[self.start:self.end]
+
+    @property
+    def lemma(self) -> Optional[str]:
+        return self._code('lemma', 'lemmas')
+
+    @property
+    def upos(self) -> Optional[str]:
+        return self._code('upos', 'upos')
+
+    @property
+    def xpos(self) -> Optional[str]:
+        return self._code('xpos', 'xpos')
+
+    @property
+    def deprel(self) -> Optional[str]:
+        return self._code('deprel', 'deprel')
+
+    @property
+    def head(self) -> Optional[int]:
+        head = self._sentence.data['head'][self._index]
+        return None if head == MISSING else head
+
+    def get(self, key: str, default=None):
+        """dict 互換の参照（parse_join など従来形式を前提とするコード向け）"""
+        if key not in TOKEN_KEYS:
+            return default
+        value = getattr(self, key)
+        return default if value is None else value
+
+    def to_dict(self) -> dict:
+        """従来形式のトークン"""
+        return {key: getattr(self, key) for key in TOKEN_KEYS}
+
+
+class SentenceView:
+    """列指向形式の1文"""
+
+    def __init__(self, parse: 'ParsedPassage', data: dict):
+        self.parse = parse
+        self.data = data
+
+    @property
+    def id(self) -> Optional[int]:
+        return self.data.get('id')
+
+    @property
+    def text(self) -> str:
+        return self.data.get('text', '')
+
+    def __len__(self) -> int:
+        return len(self.data['head'])
+
+    def __getitem__(self, index: int) -> TokenView:
+        if not -len(self) <= index < len(self):
+            raise IndexError(index)
+        return TokenView(self, index % len(self))
+
+    def __iter__(self) -> Iterator[TokenView]:
+        for index in range(len(self)):
+            yield TokenView(self, index)
+
+    def get(self, key: str, default=None):
+        """dict 互換の参照（"tokens" はトークンビューのリスト）"""
+        if key == 'tokens':
+            return list(self)
+        return self.data.get(key, default)
+
+    def to_dict(self) -> dict:
+        """従来形式の文"""
+        result = {k: v for k, v in self.data.items()
+                  if k not in ('offsets', 'lemma', 'head', 'texts', 'ids') + CODED_FIELDS}
+        result['tokens'] = [token.to_dict() for token in self]
+        return result
+
+
+class ParsedPassage:
+    """
+    解析JSONの共通リーダー
+
+    列指向形式では文・トークンをビューとして遅延展開し、従来形式ではそのまま返します。
+    """
+
+    def __init__(self, data: dict):
+        self.data = data
+
+    @property
+    def passage_id(self) -> str:
+        return self.data.get('passageId', '')
+
+    @property
+    def columnar(self) -> bool:
+        return is_columnar(self.data)
+
+    @property
+    def sentences(self) -> list:
+        """文のリスト（列指向形式は SentenceView、従来形式は dict）"""
+        if not self.columnar:
+            return self.data.get('sentences', [])
+        return [SentenceView(self, sentence) for sentence in self.data.get('sentences', [])]
+
+    def get(self, key: str, default=None):
+        """dict 互換の参照"""
+        if key == 'sentences':
+            return self.sentences
+        return self.data.get(key, default)
+
+    def to_dict(self) -> dict:
+        """従来形式の解析JSON"""
+        if not self.columnar:
+            return self.data
+        result = {k: v for k, v in self.data.items()
+                  if k not in ('format', 'version', 'lemmas', 'sentences') + CODED_FIELDS}
+        result['sentences'] = [sentence.to_dict() for sentence in self.sentences]
+        return result
+
+
+def decode_parse(data: dict) -> dict:
+    """列指向形式を従来形式に戻す"""
+    return ParsedPassage(data).to_dict()
+
+
+def load_parse(path: Path) -> ParsedPassage:
+    """解析JSONを読み込み（従来形式・列指向形式のどちらも可）"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return ParsedPassage(json.load(f))
+
+
+def _serialize(data: dict, compact: bool) -> str:
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def print_stats(paths: List[Path]):
+    """従来形式と列指向形式のサイズ・読み込み時間を比較"""
+    for path in paths:
+        parse = load_parse(path)
+        verbose_text = _serialize(parse.to_dict(), compact=False)
+        columnar_text = _serialize(encode_parse(parse.to_dict()), compact=True)
+
+        timings = []
+        for text in (verbose_text, columnar_text):
+            started = time.perf_counter()
+            for _ in range(20):
+                json.loads(text)
+            timings.append((time.perf_counter() - started) / 20 * 1000)
+
+        verbose_size = len(verbose_text.encode('utf-8'))
+        columnar_size = len(columnar_text.encode('utf-8'))
+        print(f"📊 {path.name}: {verbose_size / 1024:.1f} KB → {columnar_size / 1024:.1f} KB "
+              f"({verbose_size / columnar_size:.1f}倍) / 読み込み {timings[0]:.2f} ms → {timings[1]:.2f} ms")
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='passage-parses の列指向形式への変換・復元')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for name, help_text in (('encode', '列指向形式に変換'), ('decode', '従来形式に復元')):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('input', nargs='+', help='解析JSON')
+        sub.add_argument('-o', '--output', help='出力先（入力が1ファイルの場合のみ、省略時は上書き）')
+
+    stats_parser = subparsers.add_parser('stats', help='サイズと読み込み時間を比較')
+    stats_parser.add_argument('input', nargs='+', help='解析JSON')
+
+    args = parser.parse_args()
+    inputs = [Path(name) for name in args.input]
+    if args.command == 'stats':
+        print_stats(inputs)
+        return 0
+    if args.output and len(inputs) > 1:
+        print("❌ --output は入力が1ファイルの場合のみ指定できます", file=sys.stderr)
+        return 1
+
+    for input_path in inputs:
+        output_path = Path(args.output) if args.output else input_path
+        with open(input_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if args.command == 'encode':
+            text = _serialize(encode_parse(data), compact=True)
+        else:
+            text = _serialize(decode_parse(data), compact=False)
+
+        before = input_path.stat().st_size
+        written = write_text(output_path, text, label=f'parse-{args.command}')
+        status = '✅' if written else 'ℹ️ '
+        print(f"{status} {input_path.name} → {output_path.name}: "
+              f"{before / 1024:.1f} KB → {len(text.encode('utf-8')) / 1024:.1f} KB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
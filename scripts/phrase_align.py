@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+英文フレーズと和訳フレーズのアライメント（Gale–Church 方式）
+
+英文（20語で分割）と和訳（。！？で分割）はフレーズ数が一致しないことが多く、
+zip で対応付けると食い違った位置以降がすべてずれます。このモジュールは
+文字数比に基づく Gale–Church の動的計画法で2つのフレーズ列を対応付けます。
+
+- ビード（対応の単位）: 1-1, 1-0, 0-1, 2-1, 1-2, 2-2
+- 長さコスト: 和訳文字数 / 英文文字数 の比をパッセージ全体から推定し、
+  ずれを正規分布で評価
+- アンカー: 数字（1820, 10,000, eleven ↔ 11, 1万 ↔ 10,000 など）、話者ラベル（"Sam :" と「サム：」）、
+  英字の固有表現（CO2 など）、固有名詞（大文字語 ↔ カタカナ語）
+- 帯状DP: 対角線から一定幅の範囲だけを計算・保持するため、
+  メモリは O(英文フレーズ数 × 帯幅)
+
+使用例:
+    from phrase_align import align_phrases
+
+    alignment = align_phrases(english_phrases, japanese_phrases)
+    alignment.confidence      # 0〜1
+    alignment.merged()        # [(英文, 和訳), ...]（英文側を基準に結合）
+
+    python3 scripts/phrase_align.py                 # 全パッセージの信頼度を表示
+    python3 scripts/phrase_align.py J_2020_4 --show # 対応表を表示
+"""
+
+import argparse
+import math
+import re
+import sys
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+PASSAGES_DIR = BASE_DIR / 'public' / 'data' / 'passages'
+
+# ビード種別（英文フレーズ数, 和訳フレーズ数）と事前確率（Gale & Church 1993）
+BEADS = (
+    ((1, 1), 0.89),
+    ((1, 0), 0.0099 / 2),
+    ((0, 1), 0.0099 / 2),
+    ((2, 1), 0.089 / 2),
+    ((1, 2), 0.089 / 2),
+    ((2, 2), 0.011),
+)
+_BEAD_COSTS = tuple((shape, -math.log(prior)) for shape, prior in BEADS)
+
+# 長さのずれの分散（和訳の期待文字数に比例。1-1 で対応するパッセージでの実測値）
+LENGTH_VARIANCE = 1.0
+
+# アンカーの重み（一致1件あたりのコスト減 / 片側のみ1件あたりのコスト増）
+ANCHOR_BONUS = 2.0
+ANCHOR_PENALTY = 1.5
+
+# 帯幅の最小値（フレーズ数の差に加える余裕）
+MIN_BAND = 8
+
+# 信頼度がこの値未満、または 1-1 以外のビードは要確認とする
+REVIEW_THRESHOLD = 0.2
+
+_NUMBER_RE = re.compile(r'\d[\d,]*(?:\.\d+)?')
+_EN_SPEAKER_RE = re.compile(r"^[A-Z][\w.']*(?: [A-Z][\w.']*)?\s*:")
+_JA_SPEAKER_RE = re.compile(r'^[^\s：:。、]{1,10}[：:]')
+_EN_CAPITALIZED_RE = re.compile(r"(?<=[\s,;])[A-Z][a-z]+")
+_KATAKANA_WORD_RE = re.compile(r'[ァ-ヴー]{2,}')
+_LATIN_TOKEN_RE = re.compile(r'[A-Za-z][A-Za-z0-9]+')
+_JA_LARGE_NUMBER_RE = re.compile(r'(\d[\d,]*(?:\.\d+)?)([万億])')
+
+# 英語の数詞（和訳では算用数字で書かれることが多い）
+_EN_UNITS = ('zero one two three four five six seven eight nine ten eleven twelve thirteen '
+             'fourteen fifteen sixteen seventeen eighteen nineteen').split()
+_EN_TENS = 'twenty thirty forty fifty sixty seventy eighty ninety'.split()
+NUMBER_WORDS = {word: value for value, word in enumerate(_EN_UNITS)}
+NUMBER_WORDS.update({word: 10 * (value + 2) for value, word in enumerate(_EN_TENS)})
+NUMBER_MULTIPLIERS = {'hundred': 100, 'thousand': 1000, 'million': 10 ** 6, 'billion': 10 ** 9}
+JA_MULTIPLIERS = {'万': 10 ** 4, '億': 10 ** 8}
+_EN_NUMBER_WORD_RE = re.compile(
+    r'\b(?:(\d[\d,]*(?:\.\d+)?)|((?:%s)(?:-(?:%s))?))(?:\s+(%s))?\b' % (
+        '|'.join(_EN_TENS + _EN_UNITS), '|'.join(_EN_UNITS[1:10]), '|'.join(NUMBER_MULTIPLIERS)),
+    re.IGNORECASE)
+
+
+class Anchors(NamedTuple):
+    """フレーズから抽出したアンカー"""
+
+    numbers: Counter
+    latin: Counter
+    speaker: int
+    proper_nouns: int
+
+
+class AlignedPair(NamedTuple):
+    """ビード1個分の対応"""
+
+    english_indices: Tuple[int, ...]
+    japanese_indices: Tuple[int, ...]
+    english: str
+    japanese: str
+    confidence: float
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.english_indices), len(self.japanese_indices)
+
+    @property
+    def needs_review(self) -> bool:
+        return self.shape != (1, 1) or self.confidence < REVIEW_THRESHOLD
+
+
+class Alignment(NamedTuple):
+    """アライメント結果"""
+
+    pairs: List[AlignedPair]
+    ratio: float
+
+    @property
+    def confidence(self) -> float:
+        """ビード信頼度の平均（0〜1）"""
+        if not self.pairs:
+            return 1.0
+        return sum(p.confidence for p in self.pairs) / len(self.pairs)
+
+    @property
+    def review(self) -> List[AlignedPair]:
+        """要確認のビード"""
+        return [p for p in self.pairs if p.needs_review]
+
+    def merged(self) -> List[Tuple[str, str]]:
+        """
+        英文フレーズ単位の (英文, 和訳) リストに変換
+
+        2-1 / 2-2 ビードは英文を結合し、1-2 ビードは和訳を結合します。
+        英文のない 0-1 ビードの和訳は直前（先頭なら直後）のフレーズに結合します。
+        """
+        merged: List[List[str]] = []
+        orphan = ''
+        for pair in self.pairs:
+            if not pair.english_indices:
+                if merged:
+                    merged[-1][1] += pair.japanese
+                else:
+                    orphan += pair.japanese
+                continue
+            merged.append([pair.english, orphan + pair.japanese])
+            orphan = ''
+        if orphan and merged:
+            merged[-1][1] += orphan
+        return [(english, japanese) for english, japanese in merged]
+
+
+def _normalize_number(text: str) -> str:
+    return text.replace(',', '')
+
+
+def _scaled_number(digits: str, multiplier: int) -> str:
+    value = float(_normalize_number(digits)) * multiplier
+    return str(int(value)) if value.is_integer() else str(value)
+
+
+def english_numbers(phrase: str) -> Counter:
+    """
+    英文フレーズ中の数値（数詞は算用数字に変換）
+
+    "eleven" → "11"、"twenty-four" → "24"、"1.5 million" → "1500000" のように
+    和訳の表記と比較できる形にそろえます。
+    """
+    numbers = Counter()
+    for match in _EN_NUMBER_WORD_RE.finditer(phrase):
+        digits, words, multiplier = match.groups()
+        if words:
+            parts = words.lower().split('-')
+            value = sum(NUMBER_WORDS[part] for part in parts)
+            # "one" は代名詞・冠詞的な用法が多いため、単独ではアンカーにしない
+            if value == 1 and not multiplier:
+                continue
+            digits = str(value)
+        scale = NUMBER_MULTIPLIERS[multiplier.lower()] if multiplier else 1
+        numbers[_scaled_number(digits, scale)] += 1
+    return numbers
+
+
+def japanese_numbers(text: str) -> Counter:
+    """和訳フレーズ中の数値（"1万" → "10000"、"20億" → "2000000000"）"""
+    numbers = Counter()
+    for digits, unit in _JA_LARGE_NUMBER_RE.findall(text):
+        numbers[_scaled_number(digits, JA_MULTIPLIERS[unit])] += 1
+    rest = _JA_LARGE_NUMBER_RE.sub(' ', text)
+    numbers.update(_normalize_number(n) for n in _NUMBER_RE.findall(rest))
+    return numbers
+
+
+def english_anchors(phrase: str) -> Anchors:
+    """英文フレーズのアンカー"""
+    speaker = 1 if _EN_SPEAKER_RE.match(phrase) else 0
+    body = phrase.split(':', 1)[1] if speaker else phrase
+    proper = [w for w in _EN_CAPITALIZED_RE.findall(body) if w != 'I']
+    return Anchors(
+        numbers=english_numbers(phrase),
+        latin=Counter(w.lower() for w in _LATIN_TOKEN_RE.findall(phrase) if any(c.isdigit() for c in w)),
+        speaker=speaker,
+        proper_nouns=len(proper),
+    )
+
+
+def japanese_anchors(phrase: str) -> Anchors:
+    """和訳フレーズのアンカー（全角英数字は半角に正規化）"""
+    text = unicodedata.normalize('NFKC', phrase)
+    return Anchors(
+        numbers=japanese_numbers(text),
+        latin=Counter(w.lower() for w in _LATIN_TOKEN_RE.findall(text) if any(c.isdigit() for c in w)),
+        speaker=1 if _JA_SPEAKER_RE.match(text) else 0,
+        proper_nouns=len(_KATAKANA_WORD_RE.findall(text)),
+    )
+
+
+def _sum_anchors(anchors: Sequence[Anchors]) -> Anchors:
+    numbers = Counter()
+    latin = Counter()
+    for a in anchors:
+        numbers.update(a.numbers)
+        latin.update(a.latin)
+    return Anchors(numbers, latin, sum(a.speaker for a in anchors),
+                   sum(a.proper_nouns for a in anchors))
+
+
+def anchor_score(en: Anchors, ja: Anchors) -> Tuple[int, int]:
+    """
+    アンカーの一致数と不一致数
+
+    Returns:
+        tuple: (両側にある件数, 片側にしかない件数)
+    """
+    matched = 0
+    mismatched = 0
+    for left, right in ((en.numbers, ja.numbers), (en.latin, ja.latin)):
+        common = sum((left & right).values())
+        matched += common
+        mismatched += sum(left.values()) + sum(right.values()) - 2 * common
+
+    matched += min(en.speaker, ja.speaker)
+    mismatched += abs(en.speaker - ja.speaker)
+
+    # 固有名詞は表記が異なるため、両側にあるかどうかだけを弱く評価する
+    if en.proper_nouns and ja.proper_nouns:
+        matched += 1
+    return matched, mismatched
+
+
+def _length_probability(english_len: int, japanese_len: int, ratio: float) -> float:
+    """文字数のずれが生じる確率（両側検定）"""
+    mean = (english_len + japanese_len / ratio) / 2
+    if mean <= 0:
+        return 1.0
+    delta = (japanese_len - english_len * ratio) / math.sqrt(mean * ratio * LENGTH_VARIANCE)
+    return math.erfc(abs(delta) / math.sqrt(2))
+
+
+def _bead_cost(english_len: int, japanese_len: int, ratio: float,
+               en: Anchors, ja: Anchors, prior_cost: float) -> float:
+    probability = _length_probability(english_len, japanese_len, ratio)
+    matched, mismatched = anchor_score(en, ja)
+    return (prior_cost - math.log(max(probability, 1e-12))
+            - ANCHOR_BONUS * matched + ANCHOR_PENALTY * mismatched)
+
+
+def _logsumexp(values: List[float]) -> float:
+    finite = [v for v in values if v != -math.inf]
+    if not finite:
+        return -math.inf
+    top = max(finite)
+    return top + math.log(sum(math.exp(v - top) for v in finite))
+
+
+def align_phrases(english: Sequence[str], japanese: Sequence[str],
+                  ratio: Optional[float] = None, band: Optional[int] = None) -> Alignment:
+    """
+    英文フレーズ列と和訳フレーズ列をアライメント
+
+    各ビードの信頼度は、帯内の全経路に対するそのビードの事後確率（前向き・後ろ向き
+    アルゴリズム）です。
+
+    Args:
+        english: 英文フレーズ
+        japanese: 和訳フレーズ
+        ratio: 和訳/英文の文字数比（省略時はパッセージ全体から推定）
+        band: 帯幅（省略時はフレーズ数の差 + MIN_BAND。経路が見つからなければ自動で拡大）
+
+    Returns:
+        Alignment: ビードのリストと文字数比
+    """
+    n, m = len(english), len(japanese)
+    en_lens = [len(p) for p in english]
+    ja_lens = [len(p) for p in japanese]
+    if ratio is None:
+        total_en = sum(en_lens)
+        ratio = sum(ja_lens) / total_en if total_en else 1.0
+    ratio = ratio or 1.0
+
+    lattice = _BandedLattice(en_lens, ja_lens,
+                             [english_anchors(p) for p in english],
+                             [japanese_anchors(p) for p in japanese], ratio)
+    width = band if band is not None else abs(n - m) + MIN_BAND
+    path = lattice.run(width)
+    while path is None:
+        width *= 2
+        path = lattice.run(width)
+
+    pairs = []
+    for (i, j), (di, dj), confidence in path:
+        en_idx = tuple(range(i, i + di))
+        ja_idx = tuple(range(j, j + dj))
+        pairs.append(AlignedPair(
+            english_indices=en_idx,
+            japanese_indices=ja_idx,
+            english=' '.join(english[k] for k in en_idx),
+            japanese=''.join(japanese[k] for k in ja_idx),
+            confidence=round(confidence, 3),
+        ))
+    return Alignment(pairs, ratio)
+
+
+class _BandedLattice:
+    """
+    帯状DPの格子
+
+    行 i（英文の位置）ごとに、対角線 j ≈ i·m/n の前後 width の範囲だけを保持します。
+    """
+
+    def __init__(self, en_lens, ja_lens, en_anchors, ja_anchors, ratio):
+        self.n, self.m = len(en_lens), len(ja_lens)
+        self.en_anchors = en_anchors
+        self.ja_anchors = ja_anchors
+        self.ratio = ratio
+        self.en_prefix = [0]
+        for length in en_lens:
+            self.en_prefix.append(self.en_prefix[-1] + length)
+        self.ja_prefix = [0]
+        for length in ja_lens:
+            self.ja_prefix.append(self.ja_prefix[-1] + length)
+
+    def _window(self, i: int, width: int) -> Tuple[int, int]:
+        centre = round(i * self.m / self.n) if self.n else 0
+        return max(0, centre - width), min(self.m, centre + width)
+
+    def _cost(self, pi: int, pj: int, i: int, j: int, prior_cost: float) -> float:
+        return _bead_cost(
+            self.en_prefix[i] - self.en_prefix[pi], self.ja_prefix[j] - self.ja_prefix[pj],
+            self.ratio, _sum_anchors(self.en_anchors[pi:i]),
+            _sum_anchors(self.ja_anchors[pj:j]), prior_cost)
+
+    def run(self, width: int):
+        """
+        最小コスト経路とビードの事後確率を計算
+
+        Returns:
+            list: ((開始i, 開始j), ビード形状, 事後確率) の列（帯内に経路がなければNone）
+        """
+        n, m = self.n, self.m
+        inf = math.inf
+        windows = [self._window(i, width) for i in range(n + 1)]
+
+        def index(i, j):
+            lo, hi = windows[i]
+            return j - lo if lo <= j <= hi else None
+
+        # 行ごとの配列: 最小コスト, 最小コストのビード, 前向き対数確率, ビードごとのコスト
+        best = [[inf] * (hi - lo + 1) for lo, hi in windows]
+        back = [[-1] * (hi - lo + 1) for lo, hi in windows]
+        alpha = [[-inf] * (hi - lo + 1) for lo, hi in windows]
+        edges = [[None] * (hi - lo + 1) for lo, hi in windows]
+        if index(0, 0) is None:
+            return None
+        best[0][0] = 0.0
+        alpha[0][0] = 0.0
+
+        for i in range(n + 1):
+            lo, hi = windows[i]
+            for j in range(lo, hi + 1):
+                offset = j - lo
+                incoming = []
+                for bead_index, ((di, dj), prior_cost) in enumerate(_BEAD_COSTS):
+                    pi, pj = i - di, j - dj
+                    if pi < 0 or pj < 0:
+                        continue
+                    poffset = index(pi, pj)
+                    if poffset is None or best[pi][poffset] == inf:
+                        continue
+                    cost = self._cost(pi, pj, i, j, prior_cost)
+                    incoming.append((bead_index, cost))
+                    if best[pi][poffset] + cost < best[i][offset]:
+                        best[i][offset] = best[pi][poffset] + cost
+                        back[i][offset] = bead_index
+                if incoming:
+                    edges[i][offset] = incoming
+                    alpha[i][offset] = _logsumexp([
+                        alpha[i - _BEAD_COSTS[b][0][0]][index(i - _BEAD_COSTS[b][0][0], j - _BEAD_COSTS[b][0][1])] - c
+                        for b, c in incoming
+                    ])
+
+        end = index(n, m)
+        if end is None or best[n][end] == inf:
+            return None
+
+        # 後ろ向き対数確率（終点から各点までの全経路）
+        beta = [[-inf] * (hi - lo + 1) for lo, hi in windows]
+        beta[n][end] = 0.0
+        for i in range(n, -1, -1):
+            lo, hi = windows[i]
+            for j in range(hi, lo - 1, -1):
+                offset = j - lo
+                if beta[i][offset] == -inf or not edges[i][offset]:
+                    continue
+                for bead_index, cost in edges[i][offset]:
+                    (di, dj), _ = _BEAD_COSTS[bead_index]
+                    pi, pj = i - di, j - dj
+                    poffset = index(pi, pj)
+                    beta[pi][poffset] = _logsumexp([beta[pi][poffset], beta[i][offset] - cost])
+
+        total = alpha[n][end]
+        path = []
+        i, j = n, m
+        while i > 0 or j > 0:
+            offset = index(i, j)
+            bead_index = back[i][offset]
+            (di, dj), _ = _BEAD_COSTS[bead_index]
+            pi, pj = i - di, j - dj
+            cost = dict(edges[i][offset])[bead_index]
+            posterior = math.exp(min(0.0, alpha[pi][index(pi, pj)] - cost + beta[i][offset] - total))
+            path.append(((pi, pj), (di, dj), posterior))
+            i, j = pi, pj
+        path.reverse()
+        return path
+
+
+def main():
+    """メイン処理"""
+    sys.path.insert(0, str(Path(__file__).resolve().parent / 'archive'))
+    import convert_preformatted_to_json as converter
+
+    parser = argparse.ArgumentParser(description='英文・和訳フレーズのアライメント')
+    parser.add_argument('passages', nargs='*', help='パッセージID（ファイル名の stem、省略時は全件）')
+    parser.add_argument('--show', action='store_true', help='対応表を表示')
+
+    args = parser.parse_args()
+    english_dir = PASSAGES_DIR / '3_passages-for-phrase-work'
+    japanese_dir = PASSAGES_DIR / '5_passages-for-phrase-work-ja'
+    ids = args.passages or sorted(p.stem for p in english_dir.glob('*.txt'))
+
+    for passage_id in ids:
+        english_file = english_dir / f'{passage_id}.txt'
+        japanese_file = japanese_dir / f'{passage_id}.txt'
+        if not english_file.exists() or not japanese_file.exists():
+            print(f"⚠️  {passage_id}: 英文または和訳が見つかりません")
+            continue
+
+        english = converter.load_phrases_from_preformatted_file(english_file)
+        japanese = converter.load_japanese_phrases(japanese_file)
+        alignment = align_phrases(english, japanese)
+        review = alignment.review
+        status = '✅' if not review else '⚠️ '
+        print(f"{status} {passage_id}: 英文{len(english)} / 和訳{len(japanese)} → "
+              f"{len(alignment.pairs)}ビード / 信頼度 {alignment.confidence:.2f} / 要確認 {len(review)}")
+
+        pairs = alignment.pairs if args.show else review
+        for pair in pairs:
+            en, ja = pair.shape
+            mark = '  ' if not pair.needs_review else '❗'
+            print(f"    {mark} [{en}-{ja}] {pair.confidence:.2f}  {pair.english[:60]}")
+            print(f"               {pair.japanese[:40]}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
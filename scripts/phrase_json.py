@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+フレーズ学習JSONの正規化形式（辞書参照）と復元ローダー
+
+従来形式では各セグメントの meaning に辞書エントリ全体（reading, etymology,
+passages など）が埋め込まれ、"my" のような頻出語がパッセージ内で何十回も重複します。
+正規化形式ではセグメントは辞書キーだけを持ち、エントリ本体はパッセージごとの
+entries テーブル（または共有辞書）に一度だけ保存します。
+
+正規化形式:
+    {
+      "id": ..., "title": ..., ...,
+      "format": "normalized",
+      "dictionary": "reading-passages-dictionary.json",   # 共有辞書を参照する場合のみ
+      "dictionarySha256": "...",                           # 参照した共有辞書の内容ハッシュ
+      "entries": {"my": {...}, "morning": {...}},          # 共有辞書と異なるエントリのみ
+      "phrases": [
+        {"id": 1, ..., "segments": [
+          {"word": "My", "key": "my", "isUnknown": false},
+          {"word": ".", "isUnknown": false}                 # key なし → meaning は ""
+        ]}
+      ]
+    }
+
+従来形式への復元はバイト単位で可逆です（denormalize_passage）。
+クライアントは dictionarySha256 がシャードのマニフェストの sourceSha256 と一致する
+場合だけシャードを使い、一致しなければ共有辞書全体を読み込みます。
+
+使用例:
+    from phrase_json import load_passage
+
+    passage = load_passage(json_path)      # どちらの形式でも読み込み可能
+    passage.segments(0)                    # 1フレーズ分だけ復元
+    passage.to_dict()                      # 従来形式の辞書
+
+    python3 scripts/phrase_json.py normalize input.json -o output.json
+    python3 scripts/phrase_json.py normalize input.json --shared public/data/dictionaries/reading-passages-dictionary.json
+    python3 scripts/phrase_json.py denormalize output.json -o restored.json
+"""
+
+import argparse
+import copy
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from data_store import write_json
+from dictionary_shards import open_dictionary, source_hash
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DICTIONARY_DIR = BASE_DIR / 'public' / 'data' / 'dictionaries'
+
+NORMALIZED_FORMAT = 'normalized'
+
+
+def is_normalized(data: dict) -> bool:
+    """正規化形式のフレーズ学習JSONか"""
+    return data.get('format') == NORMALIZED_FORMAT
+
+
+def _entry_key(word: str, entry: dict, entries: Dict[str, dict], reserved: Set[str] = frozenset()) -> str:
+    """
+    エントリの保存キーを決定
+
+    通常は単語の小文字形。同じキーで内容の異なるエントリ（手修正など）がある場合や、
+    キーが共有辞書の参照に使われている場合（reserved）は "key#2" のように連番を付けて区別します。
+    """
+    base = word.lower()
+    key = base
+    suffix = 2
+    while key in reserved or (key in entries and entries[key] != entry):
+        key = f'{base}#{suffix}'
+        suffix += 1
+    return key
+
+
+def normalize_passage(data: dict, shared: Optional[Dict[str, dict]] = None,
+                      shared_name: Optional[str] = None, shared_sha256: Optional[str] = None) -> dict:
+    """
+    従来形式のパッセージを正規化形式に変換
+
+    Args:
+        data: 従来形式のフレーズ学習JSON
+        shared: 共有辞書（指定時、共有辞書と同一のエントリは entries に含めない）
+        shared_name: 出力に記録する共有辞書のファイル名
+        shared_sha256: 出力に記録する共有辞書の内容ハッシュ（dictionary_shards.source_hash）
+
+    Returns:
+        dict: 正規化形式のフレーズ学習JSON
+    """
+    if is_normalized(data):
+        return data
+
+    entries: Dict[str, dict] = {}
+    # 共有辞書を参照したキー（復元は entries を優先するため、entries には同じキーを置かない）
+    shared_keys: Set[str] = set()
+    phrases = []
+    for phrase in data.get('phrases', []):
+        segments = []
+        for segment in phrase.get('segments', []):
+            meaning = segment.get('meaning', '')
+            if not isinstance(meaning, dict):
+                # 句読点・辞書未登録語の空の meaning は省略（文字列の意味はそのまま残す）
+                if meaning == '':
+                    segment = {k: v for k, v in segment.items() if k != 'meaning'}
+                segments.append(segment)
+                continue
+
+            word = segment.get('word', '')
+            if shared is not None and shared.get(word.lower()) == meaning and word.lower() not in entries:
+                key = word.lower()
+                shared_keys.add(key)
+            else:
+                key = _entry_key(word, meaning, entries, shared_keys)
+                entries.setdefault(key, meaning)
+
+            normalized = {}
+            for name, value in segment.items():
+                if name == 'meaning':
+                    normalized['key'] = key
+                else:
+                    normalized[name] = value
+            segments.append(normalized)
+
+        phrases.append({**phrase, 'segments': segments})
+
+    result = {k: v for k, v in data.items() if k != 'phrases'}
+    result['format'] = NORMALIZED_FORMAT
+    if shared_keys and shared_name:
+        result['dictionary'] = shared_name
+        if shared_sha256:
+            result['dictionarySha256'] = shared_sha256
+    result['entries'] = entries
+    result['phrases'] = phrases
+    return result
+
+
+def rehydrate_segment(segment: dict, lookup) -> dict:
+    """
+    正規化形式のセグメントを従来形式に戻す
+
+    Args:
+        segment: {"word", "key", "isUnknown"} 形式のセグメント
+        lookup: キー → 辞書エントリ を返す関数
+
+    Returns:
+        dict: {"word", "meaning", "isUnknown"} 形式のセグメント
+    """
+    if 'meaning' in segment:
+        return segment
+
+    restored = {}
+    has_key = 'key' in segment
+    for name, value in segment.items():
+        if name == 'key':
+            entry = lookup(value)
+            restored['meaning'] = copy.deepcopy(entry) if entry is not None else ''
+        else:
+            restored[name] = value
+            if name == 'word' and not has_key:
+                restored['meaning'] = ''
+    return restored
+
+
+class PhrasePassage:
+    """
+    フレーズ学習JSONの遅延復元ローダー
+
+    正規化形式の場合、セグメントは要求されたフレーズ分だけ復元します。
+    共有辞書は最初に参照されたときに開き、シャードがあれば必要な分だけ読み込みます。
+    """
+
+    def __init__(self, data: dict, dictionary_dir: Path = DICTIONARY_DIR):
+        self.data = data
+        self.dictionary_dir = Path(dictionary_dir)
+        self._shared = None
+
+    @property
+    def normalized(self) -> bool:
+        return is_normalized(self.data)
+
+    @property
+    def phrases(self) -> List[dict]:
+        return self.data.get('phrases', [])
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    def _shared_dictionary(self):
+        if self._shared is None:
+            name = self.data.get('dictionary')
+            self._shared = load_shared_dictionary(self.dictionary_dir / name) if name else {}
+        return self._shared
+
+    def entry(self, key: str) -> Optional[dict]:
+        """辞書キーからエントリを取得（パッセージ内テーブル → 共有辞書の順）"""
+        entries = self.data.get('entries', {})
+        if key in entries:
+            return entries[key]
+        return self._shared_dictionary().get(key)
+
+    def segments(self, index: int) -> List[dict]:
+        """指定フレーズのセグメントを従来形式で返す"""
+        segments = self.phrases[index].get('segments', [])
+        if not self.normalized:
+            return segments
+        return [rehydrate_segment(segment, self.entry) for segment in segments]
+
+    def to_dict(self) -> dict:
+        """従来形式（辞書エントリ埋め込み）の辞書に復元"""
+        if not self.normalized:
+            return self.data
+        result = {k: v for k, v in self.data.items()
+                  if k not in ('format', 'dictionary', 'dictionarySha256', 'entries', 'phrases')}
+        result['phrases'] = [
+            {**phrase, 'segments': self.segments(i)} for i, phrase in enumerate(self.phrases)
+        ]
+        return result
+
+
+def load_shared_dictionary(path: Path):
+    """共有辞書を開く（シャードがあれば必要なシャードだけを遅延読み込み）"""
+    return open_dictionary(Path(path))
+
+
+def load_passage(path: Path, dictionary_dir: Path = DICTIONARY_DIR) -> PhrasePassage:
+    """フレーズ学習JSONを読み込み（従来形式・正規化形式のどちらも可）"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return PhrasePassage(json.load(f), dictionary_dir)
+
+
+def denormalize_passage(data: dict, dictionary_dir: Path = DICTIONARY_DIR) -> dict:
+    """正規化形式を従来形式に戻す"""
+    return PhrasePassage(data, dictionary_dir).to_dict()
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='フレーズ学習JSONの正規化・復元')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    normalize_parser = subparsers.add_parser('normalize', help='辞書参照形式に変換')
+    normalize_parser.add_argument('input', nargs='+', help='従来形式のJSON')
+    normalize_parser.add_argument('-o', '--output', help='出力先（入力が1ファイルの場合のみ、省略時は上書き）')
+    normalize_parser.add_argument('--shared', help='共有辞書JSON（同一エントリは参照のみにする）')
+    normalize_parser.add_argument('--compact', action='store_true', help='インデントなしで出力')
+
+    denormalize_parser = subparsers.add_parser('denormalize', help='従来形式に復元')
+    denormalize_parser.add_argument('input', nargs='+', help='正規化形式のJSON')
+    denormalize_parser.add_argument('-o', '--output', help='出力先（入力が1ファイルの場合のみ、省略時は上書き）')
+    denormalize_parser.add_argument('--dictionary-dir', default=str(DICTIONARY_DIR),
+                                    help='共有辞書のディレクトリ')
+
+    args = parser.parse_args()
+    if args.output and len(args.input) > 1:
+        print("❌ --output は入力が1ファイルの場合のみ指定できます", file=sys.stderr)
+        return 1
+
+    shared = None
+    shared_name = None
+    shared_sha256 = None
+    if args.command == 'normalize' and args.shared:
+        shared_path = Path(args.shared)
+        shared = load_shared_dictionary(shared_path)
+        shared_name = shared_path.name
+        shared_sha256 = source_hash(shared_path)
+
+    for input_name in args.input:
+        input_path = Path(input_name)
+        output_path = Path(args.output) if args.output else input_path
+        with open(input_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if args.command == 'normalize':
+            result = normalize_passage(data, shared, shared_name, shared_sha256)
+            label = 'phrase-normalize'
+        else:
+            result = denormalize_passage(data, Path(args.dictionary_dir))
+            label = 'phrase-denormalize'
+
+        indent = None if getattr(args, 'compact', False) else 2
+        before = input_path.stat().st_size
+        written = write_json(output_path, result, label=label, indent=indent)
+        after = output_path.stat().st_size
+        status = '✅' if written else 'ℹ️ '
+        print(f"{status} {input_path.name} → {output_path.name}: "
+              f"{before / 1024:.1f} KB → {after / 1024:.1f} KB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
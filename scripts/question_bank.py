@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+問題バンクのコンパイラとリーダー（1つのインデックス付きバイナリバンドル）
+
+public/data の文法単元・旧形式（verb-form / fill-in-blank / sentence-ordering）・
+アクセント・発音の問題ファイルを1つのバンドルにまとめます。リーダーはバンドルを
+mmap で開き、インデックスから該当する問題のレコードだけを読むため、
+「2年生の受動態の fillInBlank」のような問い合わせで他の問題を読み込みません。
+
+バンドルの構成（リトルエンディアン）:
+    ヘッダー        magic "QBNK", version, 各セクションの件数とオフセット
+    文字列表        件数 + オフセット配列（件数+1個の u32）+ UTF-8 本体
+    レコード        問題ごとの固定長レコード（RECORD、36バイト）
+    インデックス    grade / unit / type / grammarPoint / title / difficulty ごとに
+                    (キー文字列, ポスティング位置, 件数) のエントリ + レコード番号の u32 配列
+    ソース一覧      (ファイル, SHA-256) の文字列番号の組（バンドルが古いかの判定用）
+    ペイロード      問題本体のJSON（空白なし）。レコードが位置と長さを持つ
+
+レコード: id, source, type, grammarPoint, difficulty, japanese（文字列番号）,
+ペイロードの位置・長さ, grade（u8、0 は学年なし）, unit（i16、-1 は単元なし）
+
+インデックスのキーはすべて文字列表の文字列です（grade は "2"、unit は "2-3"）。
+title は単元名（アクセント・発音はカテゴリ名）で、文法項目の問い合わせは grammarPoint と
+title のキーを部分一致で照合します（例: 2年 Unit 7 の grammarPoint は「be動詞 + 過去分詞（受け身）」、
+title は「受動態」）。
+
+使用例:
+    python3 scripts/question_bank.py build
+    python3 scripts/question_bank.py query --grade 2 --type fillInBlank --grammar 受動態
+    python3 scripts/question_bank.py stats
+
+    from question_bank import QuestionBank
+
+    with QuestionBank.open() as bank:
+        for question in bank.questions(bank.query(grade=2, type='fillInBlank', grammar='受動態')):
+            ...
+"""
+
+import argparse
+import json
+import mmap
+import re
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from data_store import atomic_write_bytes, content_hash
+from explanation_templates import GRAMMAR_DIR, expand_unit
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / 'public' / 'data'
+BUNDLE_PATH = BASE_DIR / 'tools' / 'data' / 'question_bank.bin'
+
+MAGIC = b'QBNK'
+VERSION = 1
+
+# magic, version, 予約, 文字列数, レコード数, インデックス数, ソース数,
+# 文字列表・レコード・インデックス・ソース一覧・ペイロードのオフセット
+HEADER = struct.Struct('<4sHH4I5I')
+# id, source, type, grammarPoint, difficulty, japanese, ペイロード位置, ペイロード長, grade, 予約, unit
+RECORD = struct.Struct('<8IBxh')
+INDEX_HEADER = struct.Struct('<2I')     # インデックス名, エントリ数
+INDEX_ENTRY = struct.Struct('<3I')      # キー, ポスティング位置（インデックスセクション内）, 件数
+SOURCE_ENTRY = struct.Struct('<2I')     # ファイル, SHA-256
+U32 = struct.Struct('<I')
+
+INDEX_NAMES = ('grade', 'unit', 'type', 'grammarPoint', 'title', 'difficulty')
+
+LEGACY_PATTERNS = ('verb-form-questions-grade*.json', 'fill-in-blank-questions-grade*.json',
+                   'sentence-ordering-grade*.json')
+LEGACY_SECTIONS = ('verbForm', 'fillInBlank', 'sentenceOrdering')
+CATEGORY_FILES = {'accent-questions.json': 'accent', 'pronunciation-questions.json': 'pronunciation'}
+
+_NUMBER_RE = re.compile(r'\d+')
+
+
+class BankEntry(NamedTuple):
+    """コンパイル前の問題"""
+
+    source: str
+    grade: int
+    unit: int
+    type: str
+    grammar_point: str
+    title: str
+    question: dict
+
+
+class BankRecord(NamedTuple):
+    """バンドルから読んだレコード（問題本体は QuestionBank.question で取得）"""
+
+    number: int
+    id: str
+    source: str
+    grade: int
+    unit: int
+    type: str
+    grammar_point: str
+    difficulty: str
+    japanese: str
+
+
+def source_files() -> List[Path]:
+    """バンドルに含める問題ファイル"""
+    files = sorted(GRAMMAR_DIR.glob('grade*/unit*.json'))
+    for pattern in LEGACY_PATTERNS:
+        files.extend(sorted(DATA_DIR.glob(pattern)))
+    files.extend(DATA_DIR / name for name in CATEGORY_FILES if (DATA_DIR / name).exists())
+    return files
+
+
+def _source_name(path: Path) -> str:
+    try:
+        return path.resolve().relative_to(BASE_DIR).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def _number(value, default: int = -1) -> int:
+    match = _NUMBER_RE.search(str(value)) if value is not None else None
+    return int(match.group(0)) if match else default
+
+
+def read_entries(path: Path) -> Iterator[BankEntry]:
+    """
+    問題ファイルの問題を列挙
+
+    - 単元ファイル: questions[]（学年はディレクトリ名、文法項目は grammarPoint か単元の grammar）
+    - 旧形式: units[] の verbForm / fillInBlank / sentenceOrdering
+    - アクセント・発音: categories[]（学年・単元なし、文法項目はカテゴリの grammarPoint）
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    source = _source_name(path)
+
+    if path.name in CATEGORY_FILES:
+        for category in data.get('categories', []):
+            for question in category.get('questions', []):
+                yield BankEntry(source, 0, -1, CATEGORY_FILES[path.name],
+                                question.get('grammarPoint') or category.get('grammarPoint') or '',
+                                category.get('category') or '', question)
+        return
+
+    grade = data.get('grade')
+    if not isinstance(grade, int):
+        match = re.search(r'grade(\d+)', path.resolve().as_posix())
+        grade = int(match.group(1)) if match else 0
+
+    if 'questions' in data:
+        data = expand_unit(data)
+        unit = _number(data.get('unit'))
+        for question in data['questions']:
+            yield BankEntry(source, grade, unit, question.get('type') or '',
+                            question.get('grammarPoint') or data.get('grammar') or '',
+                            data.get('title') or '', question)
+        return
+
+    for unit_data in data.get('units', []):
+        unit = _number(unit_data.get('unit'))
+        for section in LEGACY_SECTIONS:
+            for question in unit_data.get(section, []):
+                yield BankEntry(source, grade, unit, question.get('type') or section,
+                                question.get('grammarPoint') or unit_data.get('title') or '',
+                                unit_data.get('title') or '', question)
+
+
+class StringTable:
+    """文字列 → 番号（重複は1つにまとめる）"""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._numbers: Dict[str, int] = {}
+
+    def add(self, text: str) -> int:
+        number = self._numbers.get(text)
+        if number is None:
+            number = len(self.strings)
+            self.strings.append(text)
+            self._numbers[text] = number
+        return number
+
+    def encode(self) -> bytes:
+        blobs = [s.encode('utf-8') for s in self.strings]
+        offsets = [0]
+        for blob in blobs:
+            offsets.append(offsets[-1] + len(blob))
+        return (U32.pack(len(blobs)) + struct.pack(f'<{len(offsets)}I', *offsets) + b''.join(blobs))
+
+
+def _align(data: bytearray, size: int = 4):
+    data.extend(b'\0' * (-len(data) % size))
+
+
+def compile_bundle(files: Sequence[Path]) -> Tuple[bytes, int]:
+    """
+    問題ファイルからバンドルを作成
+
+    Args:
+        files: 問題ファイル
+
+    Returns:
+        tuple: (バンドルのバイト列, 問題数)
+    """
+    strings = StringTable()
+    records = bytearray()
+    payload = bytearray()
+    postings: Dict[str, Dict[int, List[int]]] = {name: {} for name in INDEX_NAMES}
+    sources = []
+
+    number = 0
+    for path in files:
+        sources.append((strings.add(_source_name(path)), strings.add(content_hash(path.read_bytes()))))
+        for entry in read_entries(path):
+            question = entry.question
+            body = json.dumps(question, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+            difficulty = question.get('difficulty') or ''
+            records.extend(RECORD.pack(
+                strings.add(str(question.get('id') or '')), strings.add(entry.source),
+                strings.add(entry.type), strings.add(entry.grammar_point), strings.add(difficulty),
+                strings.add(str(question.get('japanese') or '')),
+                len(payload), len(body), entry.grade, entry.unit,
+            ))
+            payload.extend(body)
+
+            keys = {
+                'grade': str(entry.grade) if entry.grade else '',
+                'unit': f'{entry.grade}-{entry.unit}' if entry.grade and entry.unit >= 0 else '',
+                'type': entry.type,
+                'grammarPoint': entry.grammar_point,
+                'title': entry.title,
+                'difficulty': difficulty,
+            }
+            for name, key in keys.items():
+                if key:
+                    postings[name].setdefault(strings.add(key), []).append(number)
+            number += 1
+
+    index_data = bytearray()
+    for name in INDEX_NAMES:
+        entries = postings[name]
+        index_data.extend(INDEX_HEADER.pack(strings.add(name), len(entries)))
+        entry_start = len(index_data)
+        index_data.extend(b'\0' * (INDEX_ENTRY.size * len(entries)))
+        for position, (key, numbers) in enumerate(sorted(entries.items())):
+            INDEX_ENTRY.pack_into(index_data, entry_start + position * INDEX_ENTRY.size,
+                                  key, len(index_data), len(numbers))
+            index_data.extend(struct.pack(f'<{len(numbers)}I', *numbers))
+
+    source_data = b''.join(SOURCE_ENTRY.pack(*source) for source in sources)
+
+    body = bytearray(b'\0' * HEADER.size)
+    offsets = []
+    for section in (strings.encode(), records, index_data, source_data, payload):
+        _align(body)
+        offsets.append(len(body))
+        body.extend(section)
+    HEADER.pack_into(body, 0, MAGIC, VERSION, 0, len(strings.strings), number,
+                     len(INDEX_NAMES), len(sources), *offsets)
+    return bytes(body), number
+
+
+class QuestionBank:
+    """バンドルのリーダー（mmap で開き、必要なレコード・文字列だけを読む）"""
+
+    def __init__(self, buffer, path: Optional[Path] = None):
+        self.buffer = buffer
+        self.path = path
+        (magic, version, _, self.string_count, self.record_count, index_count, self.source_count,
+         self._strings_offset, self._records_offset, self._index_offset, self._sources_offset,
+         self._payload_offset) = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"問題バンドルの形式が違います: {magic!r} v{version}")
+
+        self._blob_offset = self._strings_offset + U32.size * (self.string_count + 2)
+        self._string_cache: Dict[int, str] = {}
+        # インデックス名 → {キー: (ポスティング位置, 件数)}（キーの文字列だけを読む）
+        self.indexes: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        position = self._index_offset
+        for _ in range(index_count):
+            name, entry_count = INDEX_HEADER.unpack_from(buffer, position)
+            position += INDEX_HEADER.size
+            entries = {}
+            for _ in range(entry_count):
+                key, offset, count = INDEX_ENTRY.unpack_from(buffer, position)
+                entries[self.string(key)] = (self._index_offset + offset, count)
+                position += INDEX_ENTRY.size
+            # エントリのあとに続くポスティング（u32 配列）を読み飛ばす
+            position += U32.size * sum(count for _, count in entries.values())
+            self.indexes[self.string(name)] = entries
+
+    @classmethod
+    def open(cls, path: Path = BUNDLE_PATH) -> 'QuestionBank':
+        """バンドルファイルを mmap で開く"""
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer, Path(path))
+
+    def close(self):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+    def __enter__(self) -> 'QuestionBank':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.record_count
+
+    def string(self, number: int) -> str:
+        """文字列表の文字列"""
+        text = self._string_cache.get(number)
+        if text is None:
+            start, end = struct.unpack_from('<2I', self.buffer, self._strings_offset + U32.size * (number + 1))
+            text = bytes(self.buffer[self._blob_offset + start:self._blob_offset + end]).decode('utf-8')
+            self._string_cache[number] = text
+        return text
+
+    def _postings(self, index: str, key: str) -> List[int]:
+        entry = self.indexes.get(index, {}).get(key)
+        if entry is None:
+            return []
+        offset, count = entry
+        return list(struct.unpack_from(f'<{count}I', self.buffer, offset))
+
+    def keys(self, index: str) -> List[str]:
+        """インデックスのキー一覧"""
+        return sorted(self.indexes.get(index, {}))
+
+    def query(self, grade: Optional[int] = None, unit: Optional[int] = None, type: Optional[str] = None,
+              grammar: Optional[str] = None, difficulty: Optional[str] = None) -> List[int]:
+        """
+        条件に一致するレコード番号（指定した条件すべてに一致、番号順）
+
+        Args:
+            grade: 学年
+            unit: 単元番号（grade と組み合わせて指定）
+            type: 問題タイプ（fillInBlank / accent など）
+            grammar: 文法項目（grammarPoint / title のキーに含まれる文字列で照合）
+            difficulty: 難易度
+
+        Returns:
+            list: レコード番号
+        """
+        selected: List[Iterable[int]] = []
+        if grade is not None and unit is not None:
+            selected.append(self._postings('unit', f'{grade}-{unit}'))
+        elif grade is not None:
+            selected.append(self._postings('grade', str(grade)))
+        elif unit is not None:
+            raise ValueError("unit は grade と組み合わせて指定してください")
+        if type is not None:
+            selected.append(self._postings('type', type))
+        if difficulty is not None:
+            selected.append(self._postings('difficulty', difficulty))
+        if grammar is not None:
+            numbers = set()
+            for index in ('grammarPoint', 'title'):
+                for key in self.indexes.get(index, {}):
+                    if grammar in key:
+                        numbers.update(self._postings(index, key))
+            selected.append(numbers)
+
+        if not selected:
+            return list(range(self.record_count))
+        selected.sort(key=len)
+        result = set(selected[0])
+        for numbers in selected[1:]:
+            result.intersection_update(numbers)
+        return sorted(result)
+
+    def record(self, number: int) -> BankRecord:
+        """レコード（問題本体は読まない）"""
+        (question_id, source, question_type, grammar_point, difficulty, japanese,
+         _, _, grade, unit) = RECORD.unpack_from(self.buffer, self._records_offset + RECORD.size * number)
+        return BankRecord(number, self.string(question_id), self.string(source), grade, unit,
+                          self.string(question_type), self.string(grammar_point),
+                          self.string(difficulty), self.string(japanese))
+
+    def question(self, number: int) -> dict:
+        """問題本体（元のJSONの問題オブジェクト）"""
+        fields = RECORD.unpack_from(self.buffer, self._records_offset + RECORD.size * number)
+        start = self._payload_offset + fields[6]
+        return json.loads(bytes(self.buffer[start:start + fields[7]]).decode('utf-8'))
+
+    def questions(self, numbers: Iterable[int]) -> Iterator[dict]:
+        for number in numbers:
+            yield self.question(number)
+
+    def sources(self) -> Dict[str, str]:
+        """バンドル作成時のソースファイル → SHA-256"""
+        result = {}
+        for number in range(self.source_count):
+            name, digest = SOURCE_ENTRY.unpack_from(self.buffer, self._sources_offset + SOURCE_ENTRY.size * number)
+            result[self.string(name)] = self.string(digest)
+        return result
+
+    def stale_sources(self, files: Optional[Sequence[Path]] = None) -> List[str]:
+        """作成後に変更・追加・削除されたソースファイル"""
+        recorded = self.sources()
+        current = {_source_name(path): content_hash(path.read_bytes()) for path in (files or source_files())}
+        return sorted(name for name in set(recorded) | set(current) if recorded.get(name) != current.get(name))
+
+
+def _print_records(bank: QuestionBank, numbers: List[int], limit: int):
+    for number in numbers[:limit]:
+        record = bank.record(number)
+        location = f"G{record.grade} U{record.unit}" if record.grade else '-'
+        print(f"  {record.id:22s} {location:8s} {record.type:16s} {record.difficulty:12s} {record.japanese[:30]}")
+    if len(numbers) > limit:
+        print(f"  …ほか{len(numbers) - limit}問")
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='問題バンク（インデックス付きバイナリバンドル）')
+    parser.add_argument('--bundle', type=str, help=f'バンドルのパス（既定: {BUNDLE_PATH.relative_to(BASE_DIR)}）')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('build', help='問題ファイルからバンドルを作成')
+
+    query_parser = subparsers.add_parser('query', help='条件に一致する問題を表示')
+    query_parser.add_argument('--grade', type=int)
+    query_parser.add_argument('--unit', type=int)
+    query_parser.add_argument('--type', type=str)
+    query_parser.add_argument('--grammar', type=str, help='文法項目・単元名（部分一致）')
+    query_parser.add_argument('--difficulty', type=str)
+    query_parser.add_argument('--json', action='store_true', help='問題本体をJSONで出力')
+    query_parser.add_argument('--limit', type=int, default=20, help='表示する件数の上限')
+
+    subparsers.add_parser('stats', help='インデックスの内訳と読み込み時間（JSON全件との比較）')
+
+    args = parser.parse_args()
+    bundle_path = Path(args.bundle) if args.bundle else BUNDLE_PATH
+
+    if args.command == 'build':
+        files = source_files()
+        start = time.perf_counter()
+        data, count = compile_bundle(files)
+        written = atomic_write_bytes(bundle_path, data, backup=False)
+        elapsed = time.perf_counter() - start
+        print(f"📦 {count}問 / {len(files)}ファイル → {bundle_path} ({len(data) / 1024:.0f} KB, {elapsed:.2f}秒)"
+              f"{'' if written else '（変更なし）'}")
+        return 0
+
+    if not bundle_path.exists():
+        print(f"❌ バンドルがありません: {bundle_path}（python3 scripts/question_bank.py build で作成）")
+        return 1
+
+    with QuestionBank.open(bundle_path) as bank:
+        stale = bank.stale_sources()
+        if stale:
+            print(f"⚠️  バンドル作成後に変更されたファイル: {len(stale)}件（build で再作成してください）")
+
+        if args.command == 'query':
+            try:
+                numbers = bank.query(args.grade, args.unit, args.type, args.grammar, args.difficulty)
+            except ValueError as e:
+                print(f"❌ {e}")
+                return 1
+            if args.json:
+                print(json.dumps(list(bank.questions(numbers[:args.limit])), ensure_ascii=False, indent=2))
+            else:
+                print(f"🔍 {len(numbers)}問")
+                _print_records(bank, numbers, args.limit)
+            return 0
+
+        print(f"📦 {len(bank)}問 / 文字列 {bank.string_count}件 / ソース {bank.source_count}ファイル")
+        for name in INDEX_NAMES:
+            print(f"  {name:14s} {len(bank.indexes.get(name, {})):4d}キー")
+
+    start = time.perf_counter()
+    for path in source_files():
+        list(read_entries(path))
+    json_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with QuestionBank.open(bundle_path) as bank:
+        numbers = bank.query(grade=2, type='fillInBlank', grammar='受動態')
+        list(bank.questions(numbers))
+    bundle_elapsed = time.perf_counter() - start
+    print(f"\n⏱  JSON全件の読み込み: {json_elapsed * 1000:.1f} ms")
+    print(f"⏱  バンドルを開いて問い合わせ（2年・受動態・fillInBlank {len(numbers)}問）: {bundle_elapsed * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
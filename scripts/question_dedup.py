@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+文法問題の重複・類似問題の検出（MinHash + LSH）
+
+文法単元（public/data/grammar/grade*/unit*.json）と旧形式の
+fill-in-blank / verb-form / sentence-ordering の問題ファイルから、英文と和訳の組が
+同一または酷似している問題を学年・単元をまたいで検出します。
+
+検出の流れ:
+1. 英文 + 和訳を正規化（NFKC・小文字化・空欄 ____ の統一）し、文字3-gramに分割
+2. NUM_PERM 個のハッシュ関数で MinHash 署名を計算
+3. 署名を BANDS 個の帯に分けて LSH バケットに登録し、同じバケットの組だけを候補にする
+   （全組の比較は不要）
+4. 署名の一致率（Jaccard 係数の推定値）がしきい値以上の組を Union-Find でクラスタ化
+
+同じファイル内で同じ和訳を持つ問題（1つの文から作った verbForm / fillInBlank /
+sentenceOrdering などの出題形式違い）は意図的な構成のため、1項目にまとめます。
+paraphrase の japanese は書き換えの指示（「主語の変更（I→We）」など）のことがあり
+英文の和訳ではないため、照合には英文だけを使います。
+
+長文付き問題の passage / passageJapanese も別の項目として照合します。同じファイル内で
+同じ長文を複数の問題が共有するのは意図的な構成のため、長文は1ファイル1項目にまとめます。
+
+問題・長文とも、複数ファイル（学年・単元）にまたがるクラスタだけを報告します
+（同じ単元内の類似は、同じ元の文からの書き換え問題など意図的なものがほとんどのため）。
+
+署名は正規化後のテキストのハッシュをキーに tools/data/question_minhash_index.json に
+保存します。問題の位置には依存しないため、問題の追加・削除・並べ替えがあっても
+テキストが変わっていない問題は再計算しません（新しいテキストだけを署名化）。
+
+使用例:
+    python3 scripts/question_dedup.py                      # 全問題を検査してレポートを出力
+    python3 scripts/question_dedup.py --threshold 0.7
+    python3 scripts/question_dedup.py --check new_unit.json  # 新しい問題を索引と照合（重複ありで終了コード1）
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import sys
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from data_store import content_hash, write_json, write_text
+from explanation_templates import load_unit
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / 'public' / 'data'
+GRAMMAR_DIR = DATA_DIR / 'grammar'
+INDEX_PATH = BASE_DIR / 'tools' / 'data' / 'question_minhash_index.json'
+REPORT_PATH = BASE_DIR / 'tools' / 'data' / 'question_duplicates.json'
+
+# 旧形式の問題ファイル（units[].<キー> に問題の配列）
+LEGACY_PATTERNS = {
+    'fill-in-blank-questions-grade*.json': 'fillInBlank',
+    'verb-form-questions-grade*.json': 'verbForm',
+    'sentence-ordering-grade*.json': 'sentenceOrdering',
+}
+
+INDEX_VERSION = 2
+NUM_PERM = 64
+BANDS = 16          # 1帯 4行: Jaccard 0.8 の組は 99.9% 以上の確率で候補になる
+SHINGLE_SIZE = 3
+SEED = 20240601
+DEFAULT_THRESHOLD = 0.8
+
+# 2^32 より大きい素数（ハッシュ関数 (a * x + b) mod P）
+_PRIME = 4294967311
+_BLANK_RE = re.compile(r'_{2,}')
+_SPACE_RE = re.compile(r'\s+')
+
+
+class QuestionItem(NamedTuple):
+    """照合対象の1項目（問題または長文）"""
+
+    key: str
+    kind: str           # 'question' / 'passage'
+    source: str
+    question_id: str
+    english: str
+    japanese: str
+    variant_ids: Tuple[str, ...] = ()   # まとめた出題形式違いの問題の id
+
+
+def grammar_files(grammar_dir: Path = GRAMMAR_DIR) -> List[Path]:
+    """学年ディレクトリ直下の単元ファイル（archive は除く）"""
+    return sorted(grammar_dir.glob('grade*/unit*.json'))
+
+
+def legacy_files(data_dir: Path = DATA_DIR) -> List[Path]:
+    """旧形式の問題ファイル"""
+    return sorted(path for pattern in LEGACY_PATTERNS for path in data_dir.glob(pattern))
+
+
+def _source_name(path: Path) -> str:
+    try:
+        return path.resolve().relative_to(DATA_DIR).as_posix()
+    except ValueError:
+        return path.name
+
+
+def english_text(question: dict) -> str:
+    """問題の英文（sentence / 書き換え元 / 会話 / 正解の順で最初にあるもの）"""
+    for field in ('sentence', 'originalSentence', 'original'):
+        if isinstance(question.get(field), str) and question[field].strip():
+            return question[field]
+    dialogue = question.get('dialogue')
+    if isinstance(dialogue, list) and dialogue:
+        return ' '.join(line.get('text', '') if isinstance(line, dict) else str(line)
+                        for line in dialogue)
+    return question.get('correctAnswer') or ''
+
+
+def japanese_text(question: dict) -> str:
+    """問題の和訳（paraphrase の japanese は書き換えの指示のことがあるため使わない）"""
+    if question.get('type') == 'paraphrase':
+        return ''
+    return question.get('japanese') or ''
+
+
+def _questions(data: dict) -> Iterable[dict]:
+    if 'questions' in data:
+        yield from data['questions']
+        return
+    for unit in data.get('units', []):
+        for key in ('questions', *LEGACY_PATTERNS.values()):
+            yield from unit.get(key) or []
+
+
+def read_items(path: Path) -> List[QuestionItem]:
+    """
+    問題ファイルから照合項目を作成
+
+    Args:
+        path: 文法単元または旧形式の問題ファイル
+
+    Returns:
+        list: 問題の項目（同じ和訳の出題形式違いは1項目）+ ファイル内で重複を除いた長文の項目
+    """
+    source = _source_name(path)
+    items: List[QuestionItem] = []
+    variants: Dict[str, int] = {}
+    passages: Dict[Tuple[str, str], str] = {}
+    for index, question in enumerate(_questions(load_unit(path))):
+        question_id = str(question.get('id') or index)
+        japanese = japanese_text(question)
+        variant_key = normalize(japanese)
+        if variant_key and variant_key in variants:
+            position = variants[variant_key]
+            items[position] = items[position]._replace(
+                variant_ids=items[position].variant_ids + (question_id,))
+        else:
+            if variant_key:
+                variants[variant_key] = len(items)
+            items.append(QuestionItem(f'{source}#{index}', 'question', source, question_id,
+                                      english_text(question), japanese, (question_id,)))
+        passage = question.get('passage')
+        if isinstance(passage, str) and passage.strip():
+            passages.setdefault((passage, question.get('passageJapanese') or ''), question_id)
+    for (passage, japanese), question_id in passages.items():
+        items.append(QuestionItem(f'{source}#passage:{question_id}', 'passage', source,
+                                  question_id, passage, japanese))
+    return items
+
+
+def normalize(text: str) -> str:
+    """比較用の正規化（NFKC・小文字化・空欄と空白の統一）"""
+    text = unicodedata.normalize('NFKC', text).lower()
+    text = _BLANK_RE.sub('_', text)
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+def item_text(item: QuestionItem) -> str:
+    """署名の対象テキスト（英文と和訳を区切り文字で連結）"""
+    return f"{normalize(item.english)}␞{normalize(item.japanese)}"
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> List[int]:
+    """文字 n-gram の 32bit ハッシュ（重複なし）"""
+    if len(text) <= size:
+        grams = {text}
+    else:
+        grams = {text[i:i + size] for i in range(len(text) - size + 1)}
+    return [int.from_bytes(hashlib.blake2b(g.encode('utf-8'), digest_size=4).digest(), 'little')
+            for g in grams]
+
+
+class MinHasher:
+    """固定シードのハッシュ関数族による MinHash 署名"""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = SEED):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.params = [(rng.randrange(1, _PRIME), rng.randrange(0, _PRIME)) for _ in range(num_perm)]
+
+    def signature(self, text: str) -> List[int]:
+        """テキストの MinHash 署名"""
+        values = shingles(text)
+        return [min((a * x + b) % _PRIME for x in values) for a, b in self.params]
+
+
+def similarity(left: List[int], right: List[int]) -> float:
+    """署名の一致率（Jaccard 係数の推定値）"""
+    return sum(1 for a, b in zip(left, right) if a == b) / len(left)
+
+
+class SignatureIndex:
+    """
+    正規化後のテキストのハッシュ → 署名 の永続索引
+
+    署名はテキストだけで決まるため、問題の位置（項目キー）ではなくテキストのハッシュで
+    引きます。項目キー → ハッシュの対応は実行ごとに求め、索引には保存しません。
+    """
+
+    def __init__(self, path: Path = INDEX_PATH, entries: Optional[Dict[str, List[int]]] = None):
+        self.path = Path(path)
+        self.entries = entries or {}
+        self.hasher = MinHasher()
+        self.computed = 0
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Path = INDEX_PATH) -> 'SignatureIndex':
+        """索引を読み込み（パラメータが変わっていれば空の索引）"""
+        data = {}
+        if Path(path).exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (json.JSONDecodeError, OSError):
+                data = {}
+        if (data.get('version'), data.get('numPerm'), data.get('bands'), data.get('seed')) != \
+                (INDEX_VERSION, NUM_PERM, BANDS, SEED):
+            data = {}
+        return cls(path, data.get('items'))
+
+    def signature(self, item: QuestionItem) -> List[int]:
+        """項目の署名（同じテキストの署名が索引にあれば再利用）"""
+        return self._signature(item_text(item))[1]
+
+    def _signature(self, text: str) -> Tuple[str, List[int]]:
+        digest = content_hash(text.encode('utf-8'))
+        signature = self.entries.get(digest)
+        if signature is None:
+            signature = self.hasher.signature(text)
+            self.entries[digest] = signature
+            self.computed += 1
+            self._dirty = True
+        return digest, signature
+
+    def update(self, items: List[QuestionItem]) -> Dict[str, List[int]]:
+        """全項目の署名を求め、どの項目のテキストでもなくなった署名を索引から削除"""
+        signatures = {}
+        used = set()
+        for item in items:
+            digest, signatures[item.key] = self._signature(item_text(item))
+            used.add(digest)
+        removed = set(self.entries) - used
+        for digest in removed:
+            del self.entries[digest]
+        if removed:
+            self._dirty = True
+        return signatures
+
+    def save(self) -> bool:
+        """変更があれば索引を書き出し"""
+        if not self._dirty:
+            return False
+        data = {'version': INDEX_VERSION, 'numPerm': NUM_PERM, 'bands': BANDS, 'seed': SEED,
+                'items': self.entries}
+        return write_text(self.path, json.dumps(data, separators=(',', ':')), backup=False)
+
+
+def _band_keys(signature: List[int]) -> Iterable[Tuple[int, Tuple[int, ...]]]:
+    rows = len(signature) // BANDS
+    for band in range(BANDS):
+        yield band, tuple(signature[band * rows:(band + 1) * rows])
+
+
+class LshIndex:
+    """LSH バケット（帯ごとに署名の一部が一致する項目をまとめる）"""
+
+    def __init__(self):
+        self.buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = {}
+
+    def add(self, key: str, signature: List[int]):
+        for band_key in _band_keys(signature):
+            self.buckets.setdefault(band_key, []).append(key)
+
+    def query(self, signature: List[int]) -> set:
+        """同じバケットに入る項目（候補）"""
+        candidates = set()
+        for band_key in _band_keys(signature):
+            candidates.update(self.buckets.get(band_key, ()))
+        return candidates
+
+
+def find_pairs(signatures: Dict[str, List[int]], kinds: Dict[str, str],
+               threshold: float) -> List[Tuple[str, str, float]]:
+    """
+    LSH の候補組のうち、推定類似度がしきい値以上の組
+
+    Args:
+        signatures: 項目キー → 署名
+        kinds: 項目キー → 種類（同じ種類どうしだけを比較）
+        threshold: Jaccard 係数のしきい値
+
+    Returns:
+        list: (キー, キー, 推定類似度)
+    """
+    lsh = LshIndex()
+    pairs = []
+    for key, signature in signatures.items():
+        for other in lsh.query(signature):
+            if kinds[other] != kinds[key]:
+                continue
+            score = similarity(signature, signatures[other])
+            if score >= threshold:
+                pairs.append((other, key, score))
+        lsh.add(key, signature)
+    return pairs
+
+
+def cluster(pairs: List[Tuple[str, str, float]]) -> List[List[str]]:
+    """類似組を Union-Find で連結成分にまとめる"""
+    parent: Dict[str, str] = {}
+
+    def find(key: str) -> str:
+        parent.setdefault(key, key)
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    for left, right, _ in pairs:
+        parent[find(left)] = find(right)
+    groups: Dict[str, List[str]] = {}
+    for key in parent:
+        groups.setdefault(find(key), []).append(key)
+    return sorted((sorted(members) for members in groups.values()), key=lambda m: (-len(m), m))
+
+
+def build_report(items: List[QuestionItem], signatures: Dict[str, List[int]],
+                 threshold: float) -> List[dict]:
+    """重複・類似問題のクラスタ（複数ファイルにまたがるものだけ）"""
+    by_key = {item.key: item for item in items}
+    pairs = find_pairs(signatures, {item.key: item.kind for item in items}, threshold)
+    clusters = []
+    for members in cluster(pairs):
+        first = by_key[members[0]]
+        sources = sorted({by_key[key].source for key in members})
+        if len(sources) < 2:
+            continue
+        texts = {item_text(by_key[key]) for key in members}
+        clusters.append({
+            'kind': first.kind,
+            'exact': len(texts) == 1,
+            'sources': sources,
+            'members': [
+                {'source': by_key[key].source, 'id': by_key[key].question_id,
+                 'variants': list(by_key[key].variant_ids[1:]),
+                 'english': by_key[key].english, 'japanese': by_key[key].japanese,
+                 'similarity': round(similarity(signatures[members[0]], signatures[key]), 3)}
+                for key in members
+            ],
+        })
+    return sorted(clusters, key=lambda c: (c['kind'] != 'question', -len(c['members'])))
+
+
+def check_items(new_items: List[QuestionItem], index_items: List[QuestionItem],
+                index: SignatureIndex, threshold: float) -> List[Tuple[QuestionItem, QuestionItem, float]]:
+    """
+    新しい問題を既存の問題の索引と照合
+
+    Args:
+        new_items: 検査する問題
+        index_items: 既存の問題（署名は索引から再利用）
+        index: 署名索引
+        threshold: Jaccard 係数のしきい値
+
+    Returns:
+        list: (新しい問題, 類似する既存の問題, 推定類似度)
+    """
+    new_keys = {item.key for item in new_items}
+    lsh = LshIndex()
+    by_key = {}
+    for item in index_items:
+        if item.key in new_keys:
+            continue
+        signature = index.signature(item)
+        lsh.add(item.key, signature)
+        by_key[item.key] = (item, signature)
+
+    matches = []
+    for item in new_items:
+        signature = index.hasher.signature(item_text(item))
+        for key in sorted(lsh.query(signature)):
+            other, other_signature = by_key[key]
+            if other.kind != item.kind:
+                continue
+            score = similarity(signature, other_signature)
+            if score >= threshold:
+                matches.append((item, other, score))
+    return matches
+
+
+def _label(source: str, question_id: str, kind: str) -> str:
+    return f"{source} {question_id}{'（長文）' if kind == 'passage' else ''}"
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='文法問題の重複・類似問題の検出（MinHash + LSH）')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'類似とみなす Jaccard 係数（既定: {DEFAULT_THRESHOLD}）')
+    parser.add_argument('--index', type=str, help='署名索引の保存先')
+    parser.add_argument('--output', type=str, help='レポートの出力先')
+    parser.add_argument('--check', nargs='+', metavar='FILE',
+                        help='指定ファイルの問題を既存の問題と照合（索引・レポートは更新しない）')
+    parser.add_argument('--limit', type=int, default=20, help='表示するクラスタ数')
+    parser.add_argument('--members', type=int, default=5, help='クラスタごとに表示する問題数')
+
+    args = parser.parse_args()
+    index_path = Path(args.index) if args.index else INDEX_PATH
+    output_path = Path(args.output) if args.output else REPORT_PATH
+
+    index = SignatureIndex.load(index_path)
+    corpus = [item for path in grammar_files() + legacy_files() for item in read_items(path)]
+
+    if args.check:
+        new_items = [item for name in args.check for item in read_items(Path(name))]
+        matches = check_items(new_items, corpus, index, args.threshold)
+        print(f"🔍 {len(new_items)}項目を {len(corpus)}項目と照合（署名の再計算 {index.computed}件）")
+        for item, other, score in matches:
+            print(f"  ⚠️  {_label(item.source, item.question_id, item.kind)} ≈ "
+                  f"{_label(other.source, other.question_id, other.kind)} ({score:.2f})")
+            print(f"      {item.english} / {item.japanese}")
+        if not matches:
+            print("  ✅ 類似する既存の問題はありません")
+        return 1 if matches else 0
+
+    signatures = index.update(corpus)
+    index.save()
+    clusters = build_report(corpus, signatures, args.threshold)
+    write_json(output_path, {'threshold': args.threshold, 'clusters': clusters}, backup=False)
+
+    questions = [c for c in clusters if c['kind'] == 'question']
+    passages = [c for c in clusters if c['kind'] == 'passage']
+    print(f"✅ {len(corpus)}項目を検査（署名の再計算 {index.computed}件）")
+    print(f"  複数ファイルにまたがる類似問題: {len(questions)}クラスタ（完全一致 {sum(c['exact'] for c in questions)}）"
+          f" / 複数ファイルで共有される長文: {len(passages)}クラスタ")
+    print(f"  出力: {output_path}")
+    for entry in clusters[:args.limit]:
+        mark = '🟰' if entry['exact'] else '≈'
+        print(f"\n  {mark} {entry['kind']} × {len(entry['members'])}（{', '.join(entry['sources'])}）")
+        for member in entry['members'][:args.members]:
+            english = member['english'] if len(member['english']) <= 60 else member['english'][:57] + '...'
+            print(f"    - {member['id']}: {english} / {member['japanese'][:30]} ({member['similarity']:.2f})")
+        if len(entry['members']) > args.members:
+            print(f"    …他 {len(entry['members']) - args.members}件")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
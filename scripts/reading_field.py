@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+読みフィールド（IPA (カタカナ)）パーサー
+
+語彙CSVの「読み」列を1パスでトークン化し、IPA・カタカナ・アクセント位置に分解します。
+正規表現と str.translate 用の変換テーブルはモジュール読み込み時に一度だけ構築し、
+各修正スクリプト・検証スクリプトから共通で再利用します。
+
+対応する形式:
+- "ˈæk.ʃən (ア́クション)"               通常形式
+- "ˈæftə(r) ɔːl (アフター オール)"      IPA内のオプション音素括弧
+- "ɡet (ゲット) ʌp (アップ)"            単語ごとの分割表記
+- "æɪ (ア́(エ́イ))"                      カタカナ内の入れ子括弧
+
+使用例:
+    from reading_field import parse_reading, normalize_reading
+
+    reading = parse_reading("ˈæk.ʃən (ア́クション)")
+    reading.ipa               # 'ˈæk.ʃən'
+    reading.katakana          # 'アクション'
+    reading.accent_positions  # (0,)
+    reading.format()          # 'ˈæk.ʃən (ア́クション)'
+
+    replace_ipa("ɡet (ゲット) ʌp (アップ)", "ɡɛt ʌp")   # 'ɡɛt (ゲット) ʌp (アップ)'
+
+format() は入れ子括弧・単語ごとの分割表記を「IPA (カタカナ)」の1組にまとめるため、
+既存の読みのIPAだけを直す場合はレイアウトを保つ replace_ipa() を使います。
+"""
+
+import re
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# アクセント記号（結合用アキュートアクセント U+0301）
+ACCENT_MARK = '́'
+
+# トップレベルの括弧グループ（1段の入れ子まで）
+_GROUP_RE = re.compile(r'\(((?:[^()]|\([^()]*\))*)\)')
+
+# カタカナを1文字でも含むか（オプション音素括弧とカタカナ括弧の判別用）
+_KATAKANA_CHAR_RE = re.compile(r'[ァ-ヴ]')
+
+# カタカナ部分に混入した英字・IPA記号
+_LATIN_OR_IPA_RE = re.compile(r'[A-Za-zɑæəɛɪʊʌɔɜʉɒɐɝɚɘɨäŏɵɞθðʃʒŋʔɹɡɾɫʍ]')
+
+# カタカナ・長音・中黒・空白・アクセント記号以外
+_NON_KATAKANA_RE = re.compile(r'[^ァ-ヴー・ ' + ACCENT_MARK + r']+')
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# アクセント記号を除去する変換テーブル
+_STRIP_ACCENT_TABLE = str.maketrans('', '', ACCENT_MARK)
+
+# カタカナ内の入れ子括弧を平坦化する変換テーブル（"ア́(エ́イ)" → "ア́ エ́イ"）
+_FLATTEN_PARENS_TABLE = str.maketrans({'(': ' ', ')': None})
+
+
+class Reading(NamedTuple):
+    """読みフィールドの構造化表現"""
+
+    ipa: str
+    katakana: str
+    accent_positions: Tuple[int, ...]
+
+    @property
+    def accented_katakana(self) -> str:
+        """アクセント記号を再挿入したカタカナ"""
+        return insert_accents(self.katakana, self.accent_positions)
+
+    @property
+    def has_ipa(self) -> bool:
+        return bool(self.ipa)
+
+    @property
+    def has_katakana(self) -> bool:
+        return bool(self.katakana)
+
+    @property
+    def stress_index(self) -> Optional[int]:
+        """最初のアクセント位置（アクセントなしの場合はNone）"""
+        return self.accent_positions[0] if self.accent_positions else None
+
+    def format(self) -> str:
+        """「IPA (カタカナ)」形式に戻す"""
+        katakana = self.accented_katakana
+        if self.ipa and katakana:
+            return f"{self.ipa} ({katakana})"
+        return self.ipa or katakana
+
+
+def split_accents(katakana: str) -> Tuple[str, Tuple[int, ...]]:
+    """
+    アクセント記号付きカタカナをカタカナ本体とアクセント位置に分解
+
+    Args:
+        katakana: アクセント記号付きカタカナ（例: "ア́クション"）
+
+    Returns:
+        tuple: (アクセント記号を除いたカタカナ, アクセントが付く文字のインデックス)
+    """
+    if ACCENT_MARK not in katakana:
+        return katakana, ()
+
+    positions = []
+    offset = 0
+    index = katakana.find(ACCENT_MARK)
+    while index != -1:
+        # アクセント記号は直前の文字に付く。除去済みの文字数だけ位置をずらす
+        positions.append(index - offset - 1)
+        offset += 1
+        index = katakana.find(ACCENT_MARK, index + 1)
+
+    return katakana.translate(_STRIP_ACCENT_TABLE), tuple(p for p in positions if p >= 0)
+
+
+def insert_accents(katakana: str, positions: Iterable[int]) -> str:
+    """アクセント位置にアクセント記号を再挿入"""
+    marked = set(positions)
+    if not marked:
+        return katakana
+    return ''.join(ch + ACCENT_MARK if i in marked else ch for i, ch in enumerate(katakana))
+
+
+def parse_reading(reading: str) -> Reading:
+    """
+    読みフィールドを1パスで解析
+
+    トップレベルの括弧グループを左から走査し、カタカナを含むグループは
+    カタカナ部分、それ以外（IPAのオプション音素など）はIPA部分として扱います。
+
+    Args:
+        reading: 読みフィールド（例: "ˈak(t)ʃj(ʊ)əl (ア́クチュアル)"）
+
+    Returns:
+        Reading: (ipa, katakana, accent_positions)
+    """
+    if not reading:
+        return Reading('', '', ())
+
+    if '(' not in reading:
+        # 括弧なし: カタカナのみ（IPA欠損）か、IPAのみ
+        stripped = reading.strip()
+        if _KATAKANA_CHAR_RE.search(stripped):
+            katakana, positions = split_accents(stripped)
+            return Reading('', katakana, positions)
+        return Reading(stripped, '', ())
+
+    ipa_parts = []
+    katakana_parts = []
+    cursor = 0
+    for match in _GROUP_RE.finditer(reading):
+        content = match.group(1)
+        if not _KATAKANA_CHAR_RE.search(content):
+            continue
+        ipa_parts.append(reading[cursor:match.start()])
+        katakana_parts.append(content)
+        cursor = match.end()
+    ipa_parts.append(reading[cursor:])
+
+    if not katakana_parts:
+        return Reading(_WHITESPACE_RE.sub(' ', reading).strip(), '', ())
+
+    ipa = _WHITESPACE_RE.sub(' ', ''.join(ipa_parts)).strip()
+    katakana = ' '.join(katakana_parts)
+    if '(' in katakana:
+        katakana = katakana.translate(_FLATTEN_PARENS_TABLE)
+    katakana = _WHITESPACE_RE.sub(' ', katakana).strip()
+
+    katakana, positions = split_accents(katakana)
+    return Reading(ipa, katakana, positions)
+
+
+def _ipa_segments(reading: str) -> List[Tuple[int, int]]:
+    """カタカナ括弧グループの外側（IPA部分）の区間のうち、空白以外を含むもの"""
+    bounds = []
+    cursor = 0
+    for match in _GROUP_RE.finditer(reading):
+        if _KATAKANA_CHAR_RE.search(match.group(1)):
+            bounds.append((cursor, match.start()))
+            cursor = match.end()
+    bounds.append((cursor, len(reading)))
+
+    segments = []
+    for start, end in bounds:
+        text = reading[start:end]
+        if text.strip():
+            # 区間の前後の空白は残し、IPA本体だけを置き換える
+            start += len(text) - len(text.lstrip())
+            end -= len(text) - len(text.rstrip())
+            segments.append((start, end))
+    return segments
+
+
+def replace_ipa(reading: str, ipa: str) -> Optional[str]:
+    """
+    読みフィールドのIPA部分だけを置き換え（カタカナ括弧のレイアウトは保持）
+
+    単語ごとの分割表記（"ɡet (ゲット) ʌp (アップ)"）では、各区間の語数と新しいIPAの
+    語数の合計が一致する場合だけ、区間ごとに語を割り当てます。
+
+    Args:
+        reading: 読みフィールド
+        ipa: 新しいIPA
+
+    Returns:
+        str: 置き換え後の読み（IPAの区間に割り当てられない場合はNone）
+    """
+    if not reading or not reading.strip():
+        return ipa
+    if '(' not in reading:
+        stripped = reading.strip()
+        if _KATAKANA_CHAR_RE.search(stripped):
+            return f"{ipa} ({stripped})"
+        return ipa
+
+    segments = _ipa_segments(reading)
+    if not segments:
+        return f"{ipa} {reading.lstrip()}"
+    if len(segments) == 1:
+        start, end = segments[0]
+        return reading[:start] + ipa + reading[end:]
+
+    words = ipa.split()
+    counts = [len(reading[start:end].split()) for start, end in segments]
+    if sum(counts) != len(words):
+        return None
+    parts = []
+    cursor = 0
+    taken = 0
+    for (start, end), count in zip(segments, counts):
+        parts.append(reading[cursor:start])
+        parts.append(' '.join(words[taken:taken + count]))
+        taken += count
+        cursor = end
+    parts.append(reading[cursor:])
+    return ''.join(parts)
+
+
+def clean_katakana(katakana: str) -> str:
+    """カタカナ・長音・中黒・空白・アクセント記号以外の文字を除去"""
+    return _NON_KATAKANA_RE.sub('', katakana)
+
+
+def has_latin_or_ipa(text: str) -> bool:
+    """英字またはIPA記号を含むか"""
+    return _LATIN_OR_IPA_RE.search(text) is not None
+
+
+def normalize_reading(reading: str) -> Tuple[str, bool]:
+    """
+    読みフィールドのカタカナ部分から英字・IPA記号を除去
+
+    Args:
+        reading: 読みフィールド
+
+    Returns:
+        tuple: (正規化後の読み, 変更があったか)
+    """
+    if not reading or '(' not in reading:
+        return reading, False
+
+    # 括弧グループ単位で置換し、単語ごとの分割表記などのレイアウトは保持する
+    def clean_group(match):
+        content = match.group(1)
+        if not _KATAKANA_CHAR_RE.search(content) or not has_latin_or_ipa(content):
+            return match.group(0)
+        cleaned = _WHITESPACE_RE.sub(' ', clean_katakana(content)).strip()
+        return f'({cleaned})' if cleaned else match.group(0)
+
+    normalized = _GROUP_RE.sub(clean_group, reading)
+    return normalized, normalized != reading
+
+
+def iter_readings(readings: Iterable[str]) -> Iterator[Reading]:
+    """読みフィールド列を順に解析（全語彙の一括処理用）"""
+    for reading in readings:
+        yield parse_reading(reading)
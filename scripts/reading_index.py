@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+読みフィールド構造化インデックス（IPA/カタカナ品質分析用）
+
+語彙・フレーズCSVの「読み」列を一度だけ解析し、列指向のサイドカーJSONに保存します。
+各CSVの内容ハッシュ（SHA-256）を記録し、変更されたファイルだけを再解析します。
+検証スクリプトやレポートはCSVを読まずにインデックスを直接問い合わせできます。
+
+保存する列:
+- file, line, word, ipa, katakana
+- stress: 最初のアクセント位置（カタカナ内のインデックス、アクセントなしは -1）
+- ipa_same: IPAが語句と同じか
+
+使用例:
+    python3 scripts/reading_index.py                      # インデックスを更新
+    python3 scripts/reading_index.py --query ipa-missing  # IPA欠損エントリ
+    python3 scripts/reading_index.py --query katakana-latin --json
+    python3 scripts/reading_index.py --rebuild            # 全ファイル再解析
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from data_store import write_text
+from reading_field import has_latin_or_ipa, parse_reading
+from vocab_csv import iter_records
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+VOCAB_DIR = BASE_DIR / 'public' / 'data' / 'vocabulary'
+INDEX_PATH = BASE_DIR / 'tools' / 'data' / 'reading_index.json'
+
+INDEX_VERSION = 1
+
+COLUMNS = ('file', 'line', 'word', 'ipa', 'katakana', 'stress', 'ipa_same')
+
+_LATIN_RE = re.compile(r'[A-Za-z]')
+
+
+def file_hash(path: Path) -> str:
+    """ファイル内容のSHA-256"""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def parse_csv_columns(csv_path: Path) -> Dict[str, list]:
+    """
+    1つのCSVを解析して列データを生成
+
+    Args:
+        csv_path: 語彙・フレーズCSVのパス
+
+    Returns:
+        dict: 列名 → 値リスト（file列を除く）
+    """
+    columns = {name: [] for name in COLUMNS if name != 'file'}
+
+    for line, record in enumerate(iter_records(csv_path), start=2):
+        if 'reading' not in record._fields:
+            break
+        word = record.word.strip()
+        reading = parse_reading(record.reading.strip())
+
+        columns['line'].append(line)
+        columns['word'].append(word)
+        columns['ipa'].append(reading.ipa)
+        columns['katakana'].append(reading.katakana)
+        stress = reading.stress_index
+        columns['stress'].append(-1 if stress is None else stress)
+        columns['ipa_same'].append(bool(reading.ipa) and reading.ipa == word)
+
+    return columns
+
+
+class ReadingIndex:
+    """列指向の読みフィールドインデックス"""
+
+    def __init__(self, files: Dict[str, dict]):
+        self.files = files
+        self.columns = {name: [] for name in COLUMNS}
+        for rel_path in sorted(files):
+            block = files[rel_path]['columns']
+            self.columns['file'].extend([rel_path] * len(block['line']))
+            for name in COLUMNS[1:]:
+                self.columns[name].extend(block[name])
+
+    def __len__(self) -> int:
+        return len(self.columns['line'])
+
+    def rows(self, indices: Optional[List[int]] = None) -> Iterator[dict]:
+        """行単位の辞書として取り出す（表示・JSON出力用）"""
+        if indices is None:
+            indices = range(len(self))
+        for i in indices:
+            yield {name: self.columns[name][i] for name in COLUMNS}
+
+    def where(self, predicate: Callable[[dict, int], bool]) -> List[int]:
+        """条件に合う行インデックスを返す（predicateは列辞書と行番号を受け取る）"""
+        return [i for i in range(len(self)) if predicate(self.columns, i)]
+
+
+# 定義済みクエリ（--query で指定）
+QUERIES: Dict[str, Callable[[dict, int], bool]] = {
+    'ipa-missing': lambda c, i: not c['ipa'][i],
+    'katakana-missing': lambda c, i: not c['katakana'][i],
+    'katakana-latin': lambda c, i: _LATIN_RE.search(c['katakana'][i]) is not None,
+    'katakana-ipa': lambda c, i: has_latin_or_ipa(c['katakana'][i]),
+    'ipa-same-as-word': lambda c, i: c['ipa_same'][i],
+    'no-accent': lambda c, i: c['stress'][i] < 0 and ' ' not in c['katakana'][i],
+}
+
+
+def load_index(index_path: Path = INDEX_PATH, vocab_dir: Path = VOCAB_DIR,
+               rebuild: bool = False, verbose: bool = False) -> ReadingIndex:
+    """
+    インデックスを読み込み、内容ハッシュが変わったCSVだけ再解析
+
+    Args:
+        index_path: サイドカーJSONのパス
+        vocab_dir: 語彙・フレーズCSVのディレクトリ
+        rebuild: Trueの場合はキャッシュを無視して全ファイルを再解析
+        verbose: 再解析したファイルを表示
+
+    Returns:
+        ReadingIndex: 最新のインデックス
+    """
+    cached = {}
+    if not rebuild and index_path.exists():
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                cached = data.get('files', {})
+        except (json.JSONDecodeError, OSError):
+            cached = {}
+
+    files = {}
+    changed = False
+    for csv_path in sorted(vocab_dir.glob('*.csv')):
+        rel_path = csv_path.relative_to(BASE_DIR).as_posix() if csv_path.is_relative_to(BASE_DIR) else str(csv_path)
+        digest = file_hash(csv_path)
+        entry = cached.get(rel_path)
+        if entry and entry.get('sha256') == digest:
+            files[rel_path] = entry
+            continue
+
+        if verbose:
+            print(f"🔄 再解析: {rel_path}")
+        files[rel_path] = {'sha256': digest, 'columns': parse_csv_columns(csv_path)}
+        changed = True
+
+    # 削除されたCSVがあれば書き戻す
+    if changed or set(files) != set(cached):
+        data = json.dumps({'version': INDEX_VERSION, 'files': files},
+                          ensure_ascii=False, separators=(',', ':'))
+        write_text(index_path, data, backup=False)
+
+    return ReadingIndex(files)
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='読みフィールド構造化インデックス')
+    parser.add_argument('--query', choices=sorted(QUERIES), help='定義済みクエリを実行')
+    parser.add_argument('--rebuild', action='store_true', help='キャッシュを無視して全ファイルを再解析')
+    parser.add_argument('--json', action='store_true', help='クエリ結果をJSONで出力')
+    parser.add_argument('--index', type=str, help='サイドカーJSONの出力先')
+
+    args = parser.parse_args()
+
+    index_path = Path(args.index) if args.index else INDEX_PATH
+    index = load_index(index_path, rebuild=args.rebuild, verbose=not args.json)
+
+    if not args.query:
+        print(f"✅ インデックス: {len(index)}件 ({len(index.files)}ファイル)")
+        print(f"  出力: {index_path}")
+        for name in sorted(QUERIES):
+            print(f"  {name:18s}: {len(index.where(QUERIES[name]))}件")
+        return 0
+
+    hits = index.where(QUERIES[args.query])
+    if args.json:
+        json.dump(list(index.rows(hits)), sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return 0
+
+    print(f"🔍 {args.query}: {len(hits)}件")
+    for row in index.rows(hits):
+        print(f"  {Path(row['file']).name}:{row['line']} {row['word']} "
+              f"[{row['ipa']}] ({row['katakana']})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+sentenceOrdering 問題の words と correctAnswer の整合性チェック（語の多重集合インデックス）
+
+各問題の correctAnswer を1回だけ語に分割し、words と correctAnswer の語の多重集合
+（Counter）を前計算して比較します。
+
+検出項目:
+- 語の過不足: words に correctAnswer の語が足りない、または余分な語の数が unusedWords と一致しない
+  （validate_grammar_questions.compare_words で判定し、検証スクリプトと同じ基準）
+- 語順の曖昧さ: 正答の語の多重集合が同じで、語順が異なる正答を持つ問題が全学年のどこかにある
+  （例: "He is a student." と "Is he a student?"）。多重集合のハッシュをキーにした
+  インデックスで、同じ語の組を持つ問題だけを比較します
+
+語の比較は大文字・小文字と句読点を区別しません（validate_grammar_questions.answer_tokens）。
+
+使用例:
+    python3 scripts/sentence_ordering_check.py
+    python3 scripts/sentence_ordering_check.py --check      # 語の過不足があれば終了コード1
+    python3 scripts/sentence_ordering_check.py --strict     # 語順の曖昧さも失敗として扱う
+    python3 scripts/sentence_ordering_check.py public/data/grammar/grade2/unit3.json
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Sequence, Tuple
+
+from data_store import write_text
+from validate_grammar_questions import (BASE_DIR, WordsComparison, answer_tokens, compare_words, default_files,
+                                        word_counts)
+
+REPORT_PATH = BASE_DIR / 'tools' / 'data' / 'sentence_ordering_report.json'
+
+ORDERING_TYPE = 'sentenceOrdering'
+
+
+class OrderingItem(NamedTuple):
+    """前計算済みの sentenceOrdering 問題"""
+
+    source: str
+    question_id: str
+    answer: str
+    answer_tokens: Tuple[str, ...]
+    answer_counts: Counter
+    word_counts: Counter
+    unused_words: int
+
+
+class TokenMismatch(NamedTuple):
+    """words と correctAnswer の語の過不足がある問題"""
+
+    item: OrderingItem
+    comparison: WordsComparison
+
+
+def multiset_key(counts: Counter) -> str:
+    """語の多重集合のハッシュ（語の順序に依存しない）"""
+    text = '\n'.join(f'{token}\t{count}' for token, count in sorted(counts.items()))
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _source_name(path: Path) -> str:
+    try:
+        return path.resolve().relative_to(BASE_DIR).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def read_items(path: Path) -> Iterator[OrderingItem]:
+    """ファイル内の sentenceOrdering 問題（単元ファイルと旧形式の units[].sentenceOrdering）"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if 'questions' in data:
+        questions = [q for q in data['questions'] if q.get('type') == ORDERING_TYPE]
+    else:
+        questions = [q for unit in data.get('units', []) for q in unit.get(ORDERING_TYPE, [])]
+
+    source = _source_name(path)
+    for number, question in enumerate(questions, 1):
+        answer = question.get('correctAnswer')
+        words = question.get('words')
+        if not isinstance(answer, str) or not isinstance(words, list):
+            continue
+        tokens = tuple(answer_tokens(answer))
+        yield OrderingItem(
+            source=source,
+            question_id=question.get('id') or f'#{number}',
+            answer=answer,
+            answer_tokens=tokens,
+            answer_counts=Counter(tokens),
+            word_counts=word_counts(words),
+            unused_words=question.get('unusedWords') or 0,
+        )
+
+
+class MultisetIndex:
+    """正答の語の多重集合ハッシュ → 問題 のインデックス"""
+
+    def __init__(self):
+        self.buckets: Dict[str, List[OrderingItem]] = defaultdict(list)
+
+    def add(self, item: OrderingItem):
+        self.buckets[multiset_key(item.answer_counts)].append(item)
+
+    def ambiguous_groups(self) -> List[List[List[OrderingItem]]]:
+        """
+        同じ語の組で語順の異なる正答を持つ問題のグループ
+
+        Returns:
+            list: グループごとに、同じ語順の問題をまとめたリストのリスト
+        """
+        groups = []
+        for items in self.buckets.values():
+            if len(items) < 2:
+                continue
+            orders: Dict[Tuple[str, ...], List[OrderingItem]] = {}
+            for item in items:
+                # ハッシュの衝突は多重集合そのものを比べて除外
+                if item.answer_counts != items[0].answer_counts:
+                    continue
+                orders.setdefault(item.answer_tokens, []).append(item)
+            if len(orders) > 1:
+                groups.append(list(orders.values()))
+        return groups
+
+
+def check_files(files: Sequence[Path]) -> Tuple[List[OrderingItem], List[TokenMismatch], List[List[List[OrderingItem]]]]:
+    """
+    全ファイルの sentenceOrdering 問題を検査
+
+    Returns:
+        tuple: (問題, 語の過不足がある問題, 語順の曖昧なグループ)
+    """
+    items = []
+    index = MultisetIndex()
+    mismatches = []
+    for path in files:
+        for item in read_items(path):
+            items.append(item)
+            index.add(item)
+            comparison = compare_words(item.answer_counts, item.word_counts, item.unused_words)
+            if not comparison.consistent:
+                mismatches.append(TokenMismatch(item, comparison))
+    return items, mismatches, index.ambiguous_groups()
+
+
+def _format_tokens(counts: Counter) -> str:
+    return ', '.join(sorted(counts.elements()))
+
+
+def build_report(items: List[OrderingItem], mismatches: List[TokenMismatch],
+                 groups: List[List[List[OrderingItem]]]) -> dict:
+    """JSONレポート"""
+    return {
+        'summary': {
+            'questions': len(items),
+            'tokenMismatches': len(mismatches),
+            'ambiguousGroups': len(groups),
+        },
+        'tokenMismatches': [
+            {
+                'source': m.item.source,
+                'id': m.item.question_id,
+                'correctAnswer': m.item.answer,
+                'missing': sorted(m.comparison.missing.elements()),
+                'extra': sorted(m.comparison.extra.elements()),
+                'unusedWords': m.item.unused_words,
+            }
+            for m in mismatches
+        ],
+        'ambiguousOrderings': [
+            [
+                {'source': item.source, 'id': item.question_id, 'correctAnswer': item.answer}
+                for order in group for item in order
+            ]
+            for group in groups
+        ],
+    }
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='sentenceOrdering 問題の words / correctAnswer 整合性チェック')
+    parser.add_argument('files', nargs='*', help='対象ファイル（省略時は全単元ファイル + 旧形式）')
+    parser.add_argument('--output', type=str, help=f'JSONレポートの出力先（既定: {REPORT_PATH.relative_to(BASE_DIR)}）')
+    parser.add_argument('--no-write', action='store_true', help='レポートファイルを書き出さない')
+    parser.add_argument('--check', action='store_true', help='語の過不足があれば終了コード1')
+    parser.add_argument('--strict', action='store_true', help='語順の曖昧さがあっても終了コード1')
+    parser.add_argument('--limit', type=int, default=20, help='表示する件数の上限')
+
+    args = parser.parse_args()
+
+    files = [Path(f) for f in args.files] or default_files()
+    start = time.perf_counter()
+    items, mismatches, groups = check_files(files)
+    elapsed = time.perf_counter() - start
+
+    print(f"🔍 sentenceOrdering {len(items)}問 / {len(files)}ファイル（{elapsed * 1000:.1f} ms）")
+
+    if mismatches:
+        print(f"\n❌ words と correctAnswer の語の過不足: {len(mismatches)}問")
+        for m in mismatches[:args.limit]:
+            detail = []
+            if m.comparison.missing:
+                detail.append(f"不足: {_format_tokens(m.comparison.missing)}")
+            if m.comparison.extra_mismatch:
+                detail.append(f"余分: {_format_tokens(m.comparison.extra) or 'なし'}"
+                              f"（unusedWords={m.item.unused_words}）")
+            print(f"  {m.item.source} {m.item.question_id}: {' / '.join(detail)}")
+            print(f"    正答: {m.item.answer}")
+
+    if groups:
+        print(f"\n⚠️  語順の曖昧な正答（同じ語の組で語順が異なる）: {len(groups)}組")
+        for group in groups[:args.limit]:
+            print(f"  - {' ⇔ '.join(order[0].answer for order in group)}")
+            for order in group:
+                for item in order:
+                    print(f"      {item.source} {item.question_id}")
+
+    if not args.no_write:
+        output = Path(args.output) if args.output else REPORT_PATH
+        write_text(output, json.dumps(build_report(items, mismatches, groups), ensure_ascii=False, indent=2) + '\n',
+                   backup=False)
+        print(f"\n📝 レポート: {output}")
+
+    failed = (args.check and mismatches) or (args.strict and (mismatches or groups))
+    if failed:
+        return 1
+    if not mismatches and not groups:
+        print("✅ すべての問題で words と correctAnswer が一致")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
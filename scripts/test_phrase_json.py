@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+phrase_json の正規化・復元の往復テスト
+
+実行:
+    python3 -m pytest scripts/test_phrase_json.py -q
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from phrase_json import denormalize_passage, normalize_passage  # noqa: E402
+
+SHARED_NAME = 'shared-dictionary.json'
+
+SHARED = {
+    'book': {'word': 'book', 'meaning': '本', 'reading': 'ブック'},
+    'read': {'word': 'read', 'meaning': '読む', 'reading': 'リード'},
+}
+
+
+def _segment(word, meaning):
+    return {'word': word, 'meaning': meaning, 'isUnknown': False}
+
+
+def _passage(*phrases):
+    return {
+        'id': 'test-passage',
+        'title': 'Test',
+        'phrases': [{'id': i, 'english': ' '.join(s['word'] for s in segments), 'segments': segments}
+                    for i, segments in enumerate(phrases, 1)],
+    }
+
+
+def _round_trip(data, tmp_path, shared=SHARED):
+    (tmp_path / SHARED_NAME).write_text(json.dumps(shared, ensure_ascii=False), encoding='utf-8')
+    normalized = normalize_passage(json.loads(json.dumps(data)), shared, SHARED_NAME)
+    return normalized, denormalize_passage(normalized, tmp_path)
+
+
+def test_round_trip_without_shared(tmp_path):
+    data = _passage([_segment('I', {'word': 'I', 'meaning': '私'}), _segment('.', '')])
+    normalized = normalize_passage(json.loads(json.dumps(data)))
+    assert 'dictionary' not in normalized
+    assert denormalize_passage(normalized, tmp_path) == data
+
+
+def test_shared_reference_is_not_shadowed_by_later_edit(tmp_path):
+    # 共有辞書と同じ意味の "book" の後に、手修正で意味の異なる "Book" が現れる
+    edited = dict(SHARED['book'], meaning='予約する')
+    data = _passage(
+        [_segment('book', SHARED['book']), _segment('read', SHARED['read'])],
+        [_segment('Book', edited), _segment('book', SHARED['book'])],
+    )
+    normalized, restored = _round_trip(data, tmp_path)
+
+    assert normalized['dictionary'] == SHARED_NAME
+    assert 'book' not in normalized['entries']
+    assert normalized['entries']['book#2'] == edited
+    assert restored == data
+
+
+def test_entry_before_shared_match_keeps_own_key(tmp_path):
+    # 先に意味の異なるエントリが "book" を使った場合、共有辞書と同じ意味の語は book#2 に入る
+    edited = dict(SHARED['book'], meaning='予約する')
+    data = _passage([_segment('book', edited), _segment('book', SHARED['book'])])
+    normalized, restored = _round_trip(data, tmp_path)
+
+    assert normalized['entries'] == {'book': edited, 'book#2': SHARED['book']}
+    assert restored == data
+
+
+def test_shared_reference_records_dictionary_hash(tmp_path):
+    data = _passage([_segment('book', SHARED['book'])])
+    normalized = normalize_passage(json.loads(json.dumps(data)), SHARED, SHARED_NAME, 'abc123')
+    assert normalized['dictionarySha256'] == 'abc123'
+
+    (tmp_path / SHARED_NAME).write_text(json.dumps(SHARED, ensure_ascii=False), encoding='utf-8')
+    assert denormalize_passage(normalized, tmp_path) == data
@@ -17,14 +17,15 @@ python3 scripts/validate-social-studies.py local-data-packs/social-studies-sampl
 python3 scripts/validate-social-studies.py local-data-packs/social-studies-sample.csv --output report.json
 """
 
-import csv
 import json
 import re
 import sys
-from typing import List, Dict, Tuple
+from typing import List, Tuple
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
+from vocab_csv import read_records
+
 # ===== 定数 =====
 
 REQUIRED_COLUMNS = [
@@ -90,7 +91,7 @@ def validate_headers(headers: List[str]) -> List[ValidationIssue]:
     
     return issues
 
-def validate_row(row: Dict[str, str], line_number: int, all_rows: List[Dict[str, str]]) -> List[ValidationIssue]:
+def validate_row(row, line_number: int, all_rows: List) -> List[ValidationIssue]:
     """行データの検証"""
     issues = []
     
@@ -232,52 +233,50 @@ def validate_file(file_path: str) -> ValidationReport:
     issues = []
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            headers = reader.fieldnames or []
-            
-            # ヘッダー検証
-            header_issues = validate_headers(headers)
-            issues.extend(header_issues)
-            
-            # ヘッダーエラーがあれば中断
-            if any(i.severity == 'error' for i in header_issues):
-                return ValidationReport(
-                    file_path=file_path,
-                    total_rows=0,
-                    valid_rows=0,
-                    issues=issues,
-                    quality_score=0,
-                    passed=False
-                )
-            
-            # 行データの読み込みと検証
-            rows = list(reader)
-            valid_rows = 0
-            
-            for index, row in enumerate(rows, start=2):  # ヘッダーが1行目
-                row_issues = validate_row(row, index, rows)
-                issues.extend(row_issues)
-                
-                if not any(i.severity == 'error' for i in row_issues):
-                    valid_rows += 1
-            
-            # サマリー計算
-            errors = sum(1 for i in issues if i.severity == 'error')
-            warnings = sum(1 for i in issues if i.severity == 'warning')
-            infos = sum(1 for i in issues if i.severity == 'info')
-            
-            quality_score = calculate_quality_score(len(rows), errors, warnings, infos)
-            passed = quality_score >= 80 and errors == 0
-            
+        # 行は vocab_csv のレコード（row.get('語句', '') で列を参照）
+        headers, rows = read_records(Path(file_path))
+        
+        # ヘッダー検証
+        header_issues = validate_headers(headers)
+        issues.extend(header_issues)
+        
+        # ヘッダーエラーがあれば中断
+        if any(i.severity == 'error' for i in header_issues):
             return ValidationReport(
                 file_path=file_path,
-                total_rows=len(rows),
-                valid_rows=valid_rows,
+                total_rows=0,
+                valid_rows=0,
                 issues=issues,
-                quality_score=quality_score,
-                passed=passed
+                quality_score=0,
+                passed=False
             )
+        
+        # 行データの検証
+        valid_rows = 0
+        
+        for index, row in enumerate(rows, start=2):  # ヘッダーが1行目
+            row_issues = validate_row(row, index, rows)
+            issues.extend(row_issues)
+            
+            if not any(i.severity == 'error' for i in row_issues):
+                valid_rows += 1
+        
+        # サマリー計算
+        errors = sum(1 for i in issues if i.severity == 'error')
+        warnings = sum(1 for i in issues if i.severity == 'warning')
+        infos = sum(1 for i in issues if i.severity == 'info')
+        
+        quality_score = calculate_quality_score(len(rows), errors, warnings, infos)
+        passed = quality_score >= 80 and errors == 0
+        
+        return ValidationReport(
+            file_path=file_path,
+            total_rows=len(rows),
+            valid_rows=valid_rows,
+            issues=issues,
+            quality_score=quality_score,
+            passed=passed
+        )
     
     except Exception as e:
         issues.append(ValidationIssue('error', 0, 'file', f'ファイル読み込みエラー: {str(e)}'))
@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""
+NEW HORIZON文法問題データの検証（問題タイプ別スキーマをチェック関数にコンパイル）
+
+対象:
+- public/data/grammar/grade*/unit*.json（単元ファイル、5つの問題タイプ）
+- public/data/{sentence-ordering,fill-in-blank-questions,verb-form-questions}-grade*.json（旧形式）
+
+問題タイプごとのスキーマ（必須フィールドと型、正答の整合性）を QUESTION_SCHEMAS に定義し、
+起動時に問題タイプ別のチェック関数へコンパイルします。各問題は自分のタイプの
+チェック関数だけを通るため、タイプ判定やフィールド一覧の解釈は問題ごとに行いません。
+
+検証項目:
+- エラー（終了コード1）
+  - 必須フィールドの欠落・型の誤り、未知の問題タイプ、難易度タグの誤り
+  - fillInBlank / verbForm / paraphrase / conversation: choices に correctAnswer が含まれない
+  - sentenceOrdering: words を並べ替えても correctAnswer にならない（語の過不足、unusedWords を考慮）
+  - id の重複（単元ファイル同士、旧形式ファイル同士）
+- 警告
+  - 単元ファイルと旧形式ファイルの間の id の重複（旧形式から移した問題）
+  - id が g{grade}-u{unit}- の接頭辞を持たない、またはファイルの学年・単元と一致しない
+  - wordCount が correctAnswer の語数と一致しない
+  - hint が空
+
+変更されたファイルを学年ごとにまとめ、ProcessPoolExecutor で学年単位に別プロセスで
+検証します（チェックは純Pythonの CPU 処理のため、スレッドでは GIL で直列になる）。
+検証するグループが1つだけ、または --workers 1 の場合はプロセスを起動せずに直列で検証します。
+ファイルごとの検証結果は内容ハッシュをキーに tools/data/grammar_validation_cache.json へ保存し、
+変更されたファイルだけを再検証します。
+
+使用例:
+    python3 scripts/validate_grammar_questions.py
+    python3 scripts/validate_grammar_questions.py public/data/grammar/grade1/unit0.json
+    python3 scripts/validate_grammar_questions.py --verbose        # 警告をすべて表示
+    python3 scripts/validate_grammar_questions.py --strict         # 警告があっても終了コード1
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from data_store import content_hash, write_text
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / 'public' / 'data'
+GRAMMAR_DIR = DATA_DIR / 'grammar'
+CACHE_PATH = BASE_DIR / 'tools' / 'data' / 'grammar_validation_cache.json'
+CACHE_VERSION = 1
+
+LEGACY_PATTERNS = ('sentence-ordering-grade*.json', 'fill-in-blank-questions-grade*.json',
+                   'verb-form-questions-grade*.json')
+LEGACY_SECTIONS = ('sentenceOrdering', 'fillInBlank', 'verbForm')
+
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+
+DIFFICULTIES = ('beginner', 'intermediate', 'advanced')
+
+ERROR = 'error'
+WARNING = 'warning'
+
+# 全問題タイプ共通のフィールド（フィールド名 → 型）
+COMMON_FIELDS = {
+    'id': str,
+    'japanese': str,
+    'correctAnswer': str,
+    'difficulty': str,
+    'explanation': (str, list),  # list はテンプレート圧縮形式
+}
+
+# 存在する場合に型を確認するフィールド
+OPTIONAL_FIELDS = {
+    'hint': str,
+    'passage': str,
+    'passageJapanese': str,
+    'grammarPoint': str,
+    'wordCount': int,
+    'unusedWords': int,
+}
+
+
+class QuestionSchema(NamedTuple):
+    """問題タイプのスキーマ"""
+
+    fields: Dict[str, object]
+    answer_in_choices: bool = False
+    words_form_answer: bool = False
+
+
+QUESTION_SCHEMAS: Dict[str, QuestionSchema] = {
+    'fillInBlank': QuestionSchema({'sentence': str, 'choices': list}, answer_in_choices=True),
+    'verbForm': QuestionSchema({'sentence': str, 'choices': list}, answer_in_choices=True),
+    'paraphrase': QuestionSchema({}, answer_in_choices=True),  # choices のない記述式もある
+    'conversation': QuestionSchema({'dialogue': list, 'choices': list}, answer_in_choices=True),
+    'sentenceOrdering': QuestionSchema({'words': list}, words_form_answer=True),
+}
+
+_TOKEN_RE = re.compile(r"[A-Za-z0-9]+(?:['’][A-Za-z]+)*")
+_ID_PREFIX_RE = re.compile(r'(?:^|-)g(\d+)-?u(\d+)[-_]')
+_NUMBER_RE = re.compile(r'\d+')
+
+_TYPE_NAMES = {str: '文字列', int: '整数', list: '配列'}
+
+
+class Issue(NamedTuple):
+    """検出した問題点"""
+
+    severity: str
+    rule: str
+    file: str
+    question_id: str
+    message: str
+
+
+Check = Callable[[dict], List[Tuple[str, str, str]]]
+
+
+def answer_tokens(text: str) -> List[str]:
+    """正答の語（小文字化、句読点は除く）"""
+    return [token.lower() for token in _TOKEN_RE.findall(text)]
+
+
+def _type_name(expected) -> str:
+    if isinstance(expected, tuple):
+        return '/'.join(_TYPE_NAMES.get(t, t.__name__) for t in expected)
+    return _TYPE_NAMES.get(expected, expected.__name__)
+
+
+def _field_check(fields: Dict[str, object], optional: Dict[str, object]) -> Check:
+    required = tuple(fields.items())
+    typed = tuple(optional.items())
+
+    def check(question):
+        issues = []
+        for name, expected in required:
+            value = question.get(name)
+            if value is None or value == '' or value == []:
+                issues.append((ERROR, 'required', f"{name} がありません"))
+            elif not isinstance(value, expected) or isinstance(value, bool):
+                issues.append((ERROR, 'field-type', f"{name} は{_type_name(expected)}が必要です"))
+        for name, expected in typed:
+            value = question.get(name)
+            if value is not None and (not isinstance(value, expected) or isinstance(value, bool)):
+                issues.append((ERROR, 'field-type', f"{name} は{_type_name(expected)}が必要です"))
+        return issues
+    return check
+
+
+def _difficulty_check(question):
+    difficulty = question.get('difficulty')
+    if difficulty and difficulty not in DIFFICULTIES:
+        return [(ERROR, 'difficulty', f"difficulty '{difficulty}' は {'/'.join(DIFFICULTIES)} のいずれか")]
+    return []
+
+
+def _hint_check(question):
+    if not question.get('hint'):
+        return [(WARNING, 'hint', "hint が空です")]
+    return []
+
+
+def _choices_check(question):
+    choices = question.get('choices')
+    answer = question.get('correctAnswer')
+    if isinstance(choices, list) and isinstance(answer, str) and answer not in choices:
+        return [(ERROR, 'answer-in-choices', f"choices に correctAnswer '{answer}' がありません")]
+    return []
+
+
+class WordsComparison(NamedTuple):
+    """sentenceOrdering の words と correctAnswer の語の多重集合の比較"""
+
+    missing: Counter        # correctAnswer にあって words にない語
+    extra: Counter          # words にあって correctAnswer にない語
+    unused_words: int       # 問題の unusedWords（余分な語として許容する数）
+
+    @property
+    def extra_count(self) -> int:
+        return sum(self.extra.values())
+
+    @property
+    def extra_mismatch(self) -> bool:
+        """余分な語の数が unusedWords と一致しない"""
+        return self.extra_count != self.unused_words
+
+    @property
+    def consistent(self) -> bool:
+        return not self.missing and not self.extra_mismatch
+
+
+def word_counts(words: Sequence) -> Counter:
+    """words の語の多重集合（answer_tokens と同じ分割）"""
+    return Counter(token for word in words for token in answer_tokens(str(word)))
+
+
+def compare_words(answer_counts: Counter, words_counts: Counter, unused_words: int = 0) -> WordsComparison:
+    """
+    correctAnswer と words の語の多重集合を比較
+
+    Args:
+        answer_counts: correctAnswer の語の多重集合
+        words_counts: words の語の多重集合（word_counts）
+        unused_words: 余分な語として許容する数（unusedWords）
+
+    Returns:
+        WordsComparison: 語の過不足
+    """
+    return WordsComparison(answer_counts - words_counts, words_counts - answer_counts, unused_words)
+
+
+def _words_check(question):
+    words = question.get('words')
+    answer = question.get('correctAnswer')
+    if not isinstance(words, list) or not isinstance(answer, str):
+        return []
+    comparison = compare_words(Counter(answer_tokens(answer)), word_counts(words),
+                               question.get('unusedWords') or 0)
+    issues = []
+    if comparison.missing:
+        issues.append((ERROR, 'words-answer',
+                       f"words に足りない語: {', '.join(sorted(comparison.missing.elements()))}"))
+    if comparison.extra_mismatch:
+        detail = ', '.join(sorted(comparison.extra.elements())) or 'なし'
+        issues.append((ERROR, 'words-answer', f"words の余分な語 {comparison.extra_count}語（{detail}）が "
+                                               f"unusedWords={comparison.unused_words} と一致しません"))
+    return issues
+
+
+def _word_count_check(question):
+    word_count = question.get('wordCount')
+    answer = question.get('correctAnswer')
+    if isinstance(word_count, int) and isinstance(answer, str):
+        actual = len(answer_tokens(answer))
+        if word_count != actual:
+            return [(WARNING, 'word-count', f"wordCount={word_count} が correctAnswer の語数 {actual} と一致しません")]
+    return []
+
+
+def compile_schema(schema: QuestionSchema) -> Check:
+    """
+    スキーマを1つのチェック関数にコンパイル
+
+    Args:
+        schema: 問題タイプのスキーマ
+
+    Returns:
+        Check: 問題を受け取り (重要度, ルール, メッセージ) のリストを返す関数
+    """
+    fields = dict(COMMON_FIELDS, **schema.fields)
+    optional = {name: t for name, t in OPTIONAL_FIELDS.items() if name not in fields}
+    if 'choices' not in fields:
+        optional['choices'] = list
+    checks: List[Check] = [_field_check(fields, optional), _difficulty_check, _hint_check]
+    if schema.answer_in_choices:
+        checks.append(_choices_check)
+    if schema.words_form_answer:
+        checks.append(_words_check)
+    checks.append(_word_count_check)
+    checks = tuple(checks)
+
+    def check(question):
+        issues = []
+        for step in checks:
+            issues.extend(step(question))
+        return issues
+    return check
+
+
+COMPILED_CHECKS: Dict[str, Check] = {name: compile_schema(schema) for name, schema in QUESTION_SCHEMAS.items()}
+
+
+def _relative_name(path: Path) -> str:
+    try:
+        return path.resolve().relative_to(BASE_DIR).as_posix()
+    except ValueError:
+        return str(path.resolve())
+
+
+def _file_position(path: Path, data: dict, unit: dict) -> Tuple[Optional[int], Optional[int]]:
+    """(学年, 単元番号)（学年はディレクトリ名・ファイル名または grade、単元は unit フィールド）"""
+    grade = data.get('grade')
+    if not isinstance(grade, int):
+        match = re.search(r'grade(\d+)', path.resolve().as_posix())
+        grade = int(match.group(1)) if match else None
+    number = _NUMBER_RE.search(str(unit.get('unit', '')))
+    return grade, int(number.group(0)) if number else None
+
+
+def _iter_sections(data: dict) -> List[Tuple[dict, str, list]]:
+    if 'questions' in data:
+        return [(data, '', data.get('questions') or [])]
+    return [(unit, section, unit[section])
+            for unit in data.get('units', []) for section in LEGACY_SECTIONS if section in unit]
+
+
+def validate_file(path: Path) -> dict:
+    """
+    1ファイルを検証（ファイルをまたぐ id の重複は validate_files で判定）
+
+    Returns:
+        dict: {'issues': [[重要度, ルール, id, メッセージ], ...], 'ids': [...], 'questions': 問題数}
+    """
+    issues = []
+    ids = []
+    count = 0
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, OSError) as e:
+        return {'issues': [[ERROR, 'json', '', f"JSONを読み込めません: {e}"]], 'ids': [], 'questions': 0}
+
+    for unit, section, questions in _iter_sections(data):
+        grade, unit_number = _file_position(path, data, unit)
+        count += len(questions)
+        for number, question in enumerate(questions, 1):
+            if not isinstance(question, dict):
+                issues.append([ERROR, 'question', f'#{number}', "問題がオブジェクトではありません"])
+                continue
+            question_id = question.get('id') or f'#{number}'
+            question_type = question.get('type') or section
+            check = COMPILED_CHECKS.get(question_type)
+            if check is None:
+                issues.append([ERROR, 'type', question_id, f"未知の問題タイプ '{question_type}'"])
+                continue
+            for severity, rule, message in check(question):
+                issues.append([severity, rule, question_id, message])
+
+            if isinstance(question.get('id'), str):
+                ids.append(question_id)
+                match = _ID_PREFIX_RE.search(question_id)
+                if not match:
+                    issues.append([WARNING, 'id-prefix', question_id, "id に g{grade}-u{unit}- の接頭辞がありません"])
+                elif (int(match.group(1)), int(match.group(2))) != (grade, unit_number):
+                    issues.append([WARNING, 'id-prefix', question_id,
+                                   f"id の接頭辞がファイルの位置（g{grade}-u{unit_number}）と一致しません"])
+
+    return {'issues': issues, 'ids': ids, 'questions': count}
+
+
+def load_cache(cache_path: Path, engine: str) -> Dict[str, dict]:
+    """検証結果キャッシュ（形式・検証コードが変わっていれば空）"""
+    if not cache_path.exists():
+        return {}
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return {}
+    if data.get('version') != CACHE_VERSION or data.get('engine') != engine:
+        return {}
+    return data.get('files', {})
+
+
+def _bank(name: str) -> str:
+    """問題セット（単元ファイル / 旧形式ファイル）"""
+    return 'grammar' if '/grammar/' in name else 'legacy'
+
+
+def _grade_key(path: Path) -> str:
+    match = re.search(r'grade(\d+)', path.resolve().as_posix())
+    return match.group(0) if match else path.parent.name
+
+
+def _validate_group(group: List[Tuple[str, str, Path]]) -> List[Tuple[str, str, dict]]:
+    """1学年分のファイルを検証（ワーカープロセスで実行するためモジュールレベルに置く）"""
+    return [(name, digest, validate_file(path)) for name, digest, path in group]
+
+
+def validate_files(files: Sequence[Path], workers: int = DEFAULT_WORKERS,
+                   cache_path: Optional[Path] = CACHE_PATH) -> Tuple[List[Issue], int, int]:
+    """
+    全ファイルを検証
+
+    内容ハッシュがキャッシュと一致するファイルは検証結果を再利用し、変更されたファイルは
+    学年ごとにまとめて別プロセスで並列に検証します。
+
+    Args:
+        files: 検証するファイル
+        workers: 並列数（プロセス数。1 の場合は直列）
+        cache_path: 検証結果キャッシュ（Noneの場合はキャッシュを使わない）
+
+    Returns:
+        tuple: (問題点のリスト, 問題数, キャッシュを再利用したファイル数)
+    """
+    engine = content_hash(Path(__file__).read_bytes())
+    cache = load_cache(cache_path, engine) if cache_path else {}
+
+    results: Dict[str, dict] = {}
+    entries: Dict[str, dict] = {}
+    pending: Dict[str, List[Tuple[str, str, Path]]] = defaultdict(list)
+    for path in files:
+        name = _relative_name(path)
+        digest = content_hash(path.read_bytes())
+        entry = cache.get(name)
+        if entry and entry.get('sha256') == digest:
+            results[name] = entry['result']
+            entries[name] = entry
+        else:
+            pending[_grade_key(path)].append((name, digest, path))
+
+    reused = len(results)
+    groups = list(pending.values())
+    if workers > 1 and len(groups) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(groups))) as executor:
+            validated = list(executor.map(_validate_group, groups))
+    else:
+        validated = [_validate_group(group) for group in groups]
+    for group in validated:
+        for name, digest, result in group:
+            results[name] = result
+            entries[name] = {'sha256': digest, 'result': result}
+
+    if cache_path and (pending or set(cache) != set(entries)):
+        text = json.dumps({'version': CACHE_VERSION, 'engine': engine, 'files': entries},
+                          ensure_ascii=False, separators=(',', ':'))
+        write_text(cache_path, text, backup=False)
+
+    issues = []
+    owners: Dict[str, List[str]] = defaultdict(list)
+    total = 0
+    for path in files:
+        name = _relative_name(path)
+        result = results[name]
+        total += result['questions']
+        issues.extend(Issue(severity, rule, name, question_id, message)
+                      for severity, rule, question_id, message in result['issues'])
+        for question_id in result['ids']:
+            owners[question_id].append(name)
+
+    for question_id, names in owners.items():
+        if len(names) < 2:
+            continue
+        banks = Counter(_bank(name) for name in names)
+        severity = ERROR if max(banks.values()) > 1 else WARNING
+        issues.append(Issue(severity, 'duplicate-id', names[0], question_id,
+                            f"id が {len(names)}回使われています（{', '.join(sorted(set(names)))}）"))
+    return issues, total, reused
+
+
+def default_files() -> List[Path]:
+    """全単元ファイル + 旧形式ファイル"""
+    files = sorted(GRAMMAR_DIR.glob('grade*/unit*.json'))
+    for pattern in LEGACY_PATTERNS:
+        files.extend(sorted(DATA_DIR.glob(pattern)))
+    return files
+
+
+def print_issues(issues: List[Issue], verbose: bool = False, limit: int = 5):
+    """重要度・ルールごとに問題点を表示（verbose でなければルールごとに limit 件まで）"""
+    by_rule: Dict[Tuple[str, str], List[Issue]] = defaultdict(list)
+    for issue in issues:
+        by_rule[issue.severity, issue.rule].append(issue)
+
+    for severity, icon in ((ERROR, '❌'), (WARNING, '⚠️ ')):
+        for (rule_severity, rule), items in sorted(by_rule.items()):
+            if rule_severity != severity:
+                continue
+            print(f"\n{icon} {rule}: {len(items)}件")
+            shown = items if verbose else items[:limit]
+            for issue in shown:
+                print(f"  {issue.file} {issue.question_id}: {issue.message}")
+            if len(items) > len(shown):
+                print(f"  …ほか{len(items) - len(shown)}件（--verbose で全件表示）")
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='NEW HORIZON文法問題データの検証')
+    parser.add_argument('files', nargs='*', help='検証するファイル（省略時は全単元ファイル + 旧形式）')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='並列に検証するプロセス数（1 で直列）')
+    parser.add_argument('--cache', type=str, help='検証結果キャッシュのパス')
+    parser.add_argument('--no-cache', action='store_true', help='キャッシュを使わずに全ファイルを検証')
+    parser.add_argument('--strict', action='store_true', help='警告があっても終了コード1')
+    parser.add_argument('--verbose', '-v', action='store_true', help='問題点をすべて表示')
+
+    args = parser.parse_args()
+
+    files = [Path(f) for f in args.files] or default_files()
+    missing = [f for f in files if not f.exists()]
+    if missing:
+        for path in missing:
+            print(f"❌ ファイルが見つかりません: {path}")
+        return 1
+
+    cache_path = None if args.no_cache else (Path(args.cache) if args.cache else CACHE_PATH)
+    start = time.perf_counter()
+    issues, total, reused = validate_files(files, args.workers, cache_path)
+    elapsed = time.perf_counter() - start
+
+    print_issues(issues, args.verbose)
+
+    errors = sum(1 for issue in issues if issue.severity == ERROR)
+    warnings = len(issues) - errors
+    print(f"\n📊 {len(files)}ファイル / {total}問（キャッシュ再利用 {reused}/{len(files)}ファイル、{elapsed:.2f}秒）")
+    if errors or (args.strict and warnings):
+        print(f"❌ エラー {errors}件 / 警告 {warnings}件")
+        return 1
+    print(f"✅ エラーなし（警告 {warnings}件）")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
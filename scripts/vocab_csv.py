@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+語彙データ用のCSVローダー（型付き行レコード）
+
+csv.DictReader は1行ごとに辞書を生成し、日本語ヘッダーのキーを毎行保持します。
+このモジュールはヘッダーごとに namedtuple ベースのレコードクラス（__slots__ = ()）を
+一度だけ生成し、行をタプルとして保持します。列へは属性名（record.reading）でも
+日本語ヘッダー名（record.get('読み')）でもアクセスできます。
+
+目的は既知スキーマの判定と列アクセスの共通化です。速度・メモリは csv.DictReader と
+大差ありません（public/data 全体で速度約1.3倍・保持メモリ約1.2分の1）。時間の大半は
+csv.reader の解析、メモリの大半はセルの文字列そのもので、行の入れ物を替えても
+数倍にはなりません。一括読み込みの速度が必要な場合は pyarrow を使います。
+
+読み取り専用の処理向けです。CSVを書き戻す修正スクリプトと csv_patch は、元のセルを
+そのまま書き戻せるよう csv.reader の行リストを使います（レコードは列数をヘッダーに揃えるため）。
+
+既知のスキーマ:
+- vocabulary:         語句,読み,意味,語源等解説,関連語,関連分野,難易度[,source]
+- classical-japanese: 語句,読み,意味,解説,関連事項,例文1,例文2
+- social-studies:     語句,読み,意味,詳細解説,関連事項,関連分野,種別,source[,grade]
+
+pyarrow がインストールされている場合は load_table_arrow() で一括読み込みできます（任意）。
+
+使用例:
+    from vocab_csv import iter_records
+
+    for record in iter_records(csv_path):
+        print(record.word, record.reading)
+
+    python3 scripts/vocab_csv.py                # public/data 以下の全CSVを読み込み
+    python3 scripts/vocab_csv.py --benchmark    # csv.DictReader との比較
+"""
+
+import argparse
+import csv
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+try:
+    import pyarrow.csv as pa_csv
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_DIR = BASE_DIR / 'public' / 'data'
+
+# 日本語ヘッダー → レコードの属性名
+FIELD_NAMES = {
+    '語句': 'word',
+    '読み': 'reading',
+    '意味': 'meaning',
+    '語源等解説': 'etymology',
+    '関連語': 'related_words',
+    '関連分野': 'related_fields',
+    '難易度': 'difficulty',
+    '解説': 'explanation',
+    '詳細解説': 'detail',
+    '関連事項': 'related_items',
+    '例文1': 'example1',
+    '例文2': 'example2',
+    '種別': 'kind',
+    'source': 'source',
+    'grade': 'grade',
+}
+
+
+class Schema(NamedTuple):
+    """CSVスキーマ（必須列。末尾に追加列があってもよい）"""
+
+    name: str
+    columns: Tuple[str, ...]
+
+
+VOCABULARY = Schema('vocabulary', ('語句', '読み', '意味', '語源等解説', '関連語', '関連分野', '難易度'))
+CLASSICAL_JAPANESE = Schema('classical-japanese', ('語句', '読み', '意味', '解説', '関連事項', '例文1', '例文2'))
+SOCIAL_STUDIES = Schema('social-studies', ('語句', '読み', '意味', '詳細解説', '関連事項', '関連分野', '種別', 'source'))
+
+SCHEMAS = (VOCABULARY, CLASSICAL_JAPANESE, SOCIAL_STUDIES)
+
+
+def detect_schema(header: Sequence[str]) -> Optional[Schema]:
+    """ヘッダーから既知のスキーマを判定（該当なしはNone）"""
+    header = tuple(header)
+    for schema in SCHEMAS:
+        if header[:len(schema.columns)] == schema.columns:
+            return schema
+    return None
+
+
+def _record_get(self, column: str, default: str = '') -> str:
+    """日本語ヘッダー名で列の値を取得"""
+    index = self.column_index.get(column)
+    return default if index is None else self[index]
+
+
+def _record_as_dict(self) -> Dict[str, str]:
+    """csv.DictReader と同じ形式の辞書に変換"""
+    return dict(zip(self.columns, self))
+
+
+@lru_cache(maxsize=None)
+def record_class(header: Tuple[str, ...]):
+    """
+    ヘッダーに対応するレコードクラスを生成（同じヘッダーには同じクラスを返す）
+
+    Args:
+        header: CSVヘッダー（タプル）
+
+    Returns:
+        type: namedtuple のサブクラス（__slots__ = ()）
+    """
+    attrs = [FIELD_NAMES.get(column, f'col{i}') for i, column in enumerate(header)]
+    schema = detect_schema(header)
+    class_name = ''.join(part.capitalize() for part in (schema.name if schema else 'csv').split('-')) + 'Record'
+
+    base = namedtuple(class_name, attrs, rename=True)
+    return type(class_name, (base,), {
+        '__slots__': (),
+        'columns': header,
+        'column_index': {column: i for i, column in enumerate(header)},
+        'schema': schema,
+        'get': _record_get,
+        'as_dict': _record_as_dict,
+    })
+
+
+def _read_header(reader) -> Tuple[str, ...]:
+    header = next(reader, None)
+    if not header:
+        return ()
+    # BOM付きUTF-8の先頭列を正規化
+    header[0] = header[0].lstrip('﻿')
+    return tuple(header)
+
+
+def _iter_rows(reader, width: int) -> Iterator[List[str]]:
+    """空行を除き、列数をヘッダーに揃えた行を返す"""
+    padding = [''] * width
+    return (row if len(row) == width else (row + padding)[:width] for row in reader if row)
+
+
+def iter_records(csv_path: Path) -> Iterator[tuple]:
+    """
+    CSVを1行ずつ型付きレコードとして読み込み
+
+    列数が足りない行は空文字で補い、多い行は切り詰めます。
+    """
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = _read_header(reader)
+        if not header:
+            return
+        # namedtuple._make の長さ検査を省き、tuple.__new__ を直接 map する
+        make = partial(tuple.__new__, record_class(header))
+        yield from map(make, _iter_rows(reader, len(header)))
+
+
+def load_records(csv_path: Path) -> List[tuple]:
+    """CSV全体をレコードのリストとして読み込み"""
+    return list(iter_records(csv_path))
+
+
+def read_records(csv_path: Path) -> Tuple[Tuple[str, ...], List[tuple]]:
+    """
+    CSVをヘッダーとレコードのリストとして読み込み（データ行がなくてもヘッダーを返す）
+
+    Returns:
+        tuple: (ヘッダー, レコードのリスト)
+    """
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = _read_header(reader)
+        if not header:
+            return (), []
+        make = partial(tuple.__new__, record_class(header))
+        return header, list(map(make, _iter_rows(reader, len(header))))
+
+
+def read_table(csv_path: Path) -> Tuple[Dict[str, int], List[List[str]]]:
+    """
+    CSVを列インデックスと素の行リストとして読み込み（最小メモリ版）
+
+    Returns:
+        tuple: (ヘッダー名 → 列番号, 行リスト)
+    """
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = _read_header(reader)
+        rows = [row for row in reader if row]
+    return {column: i for i, column in enumerate(header)}, rows
+
+
+def load_table_arrow(csv_path: Path):
+    """
+    pyarrow で CSV を一括読み込み（全列を文字列として扱う）
+
+    Raises:
+        ImportError: pyarrow が未インストールの場合
+    """
+    if not HAS_PYARROW:
+        raise ImportError("pyarrow が未インストールです。実行: pip install pyarrow")
+
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        header = _read_header(csv.reader(f))
+    convert_options = pa_csv.ConvertOptions(
+        column_types={column: 'string' for column in header},
+        strings_can_be_null=False,
+    )
+    return pa_csv.read_csv(str(csv_path), convert_options=convert_options)
+
+
+def find_csv_files(data_dir: Path = DATA_DIR) -> List[Path]:
+    """データディレクトリ以下のCSV（archive配下を除く）"""
+    return sorted(p for p in data_dir.rglob('*.csv') if 'archive' not in p.relative_to(data_dir).parts)
+
+
+def load_all(data_dir: Path = DATA_DIR, use_arrow: bool = False) -> Dict[Path, object]:
+    """
+    データディレクトリ以下の全CSVを読み込み
+
+    Args:
+        data_dir: public/data などのディレクトリ
+        use_arrow: True の場合 pyarrow.Table、False の場合レコードのリストを返す
+
+    Returns:
+        dict: CSVパス → 読み込み結果
+    """
+    loader = load_table_arrow if use_arrow else load_records
+    return {path: loader(path) for path in find_csv_files(data_dir)}
+
+
+def _measure(label: str, func) -> Tuple[float, int]:
+    # 時間はtracemallocなしで計測し、メモリは別途ピークを計測する
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    rows = sum(len(v) if isinstance(v, list) else v.num_rows for v in result.values())
+    del result
+
+    tracemalloc.start()
+    result = func()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(f"  {label:16s}: {elapsed * 1000:8.1f} ms  保持メモリ {current / 1024 / 1024:6.1f} MB  ({rows}行)")
+    return elapsed, current
+
+
+def _load_all_dictreader(data_dir: Path) -> Dict[Path, list]:
+    result = {}
+    for path in find_csv_files(data_dir):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            result[path] = list(csv.DictReader(f))
+    return result
+
+
+def main():
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='語彙データ用のCSVローダー（型付き行レコード）')
+    parser.add_argument('--data-dir', type=str, help='データディレクトリ（既定: public/data）')
+    parser.add_argument('--benchmark', action='store_true', help='csv.DictReader との速度・メモリの比較（参考値）')
+    parser.add_argument('--arrow', action='store_true', help='pyarrow で読み込み')
+
+    args = parser.parse_args()
+    data_dir = Path(args.data_dir) if args.data_dir else DATA_DIR
+
+    if args.benchmark:
+        print(f"📊 ベンチマーク: {data_dir}")
+        base_time, base_peak = _measure('csv.DictReader', lambda: _load_all_dictreader(data_dir))
+        fast_time, fast_peak = _measure('records', lambda: load_all(data_dir))
+        if HAS_PYARROW:
+            _measure('pyarrow', lambda: load_all(data_dir, use_arrow=True))
+        print(f"  速度: {base_time / fast_time:.1f}倍 / メモリ: {base_peak / fast_peak:.1f}分の1")
+        return 0
+
+    if args.arrow and not HAS_PYARROW:
+        print("❌ pyarrow が未インストールです。実行: pip install pyarrow", file=sys.stderr)
+        return 1
+
+    for path, data in load_all(data_dir, use_arrow=args.arrow).items():
+        count = data.num_rows if args.arrow else len(data)
+        if args.arrow:
+            schema = detect_schema(data.column_names)
+        else:
+            schema = data[0].schema if data else None
+        print(f"  {path.relative_to(data_dir)}: {count}行 [{schema.name if schema else '不明'}]")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
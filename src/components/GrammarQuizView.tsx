@@ -3,6 +3,7 @@ import './GrammarQuizView.css';
 import ScoreBoard from './ScoreBoard';
 import { useSessionStats } from '../hooks/useSessionStats';
 import { logger } from '@/utils/logger';
+import { expandGrammarUnit } from '@/utils/grammarExplanationTemplates';
 import { useAdaptiveLearning } from '../hooks/useAdaptiveLearning';
 import { useAdaptiveNetwork } from '../hooks/useAdaptiveNetwork';
 import { QuestionCategory } from '../strategies/memoryAcquisitionAlgorithm';
@@ -456,7 +457,7 @@ function GrammarQuizView(_props: GrammarQuizViewProps) {
           try {
             const res = await fetch(`/data/grammar/grade${g}/unit${unitIdx}.json`);
             if (res.ok) {
-              const data = await res.json();
+              const data = expandGrammarUnit(await res.json());
 
               // enabledフラグをチェック (デフォルトはtrue)
               if (data.enabled === false) {
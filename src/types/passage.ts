@@ -65,6 +65,36 @@ export interface DependencyParsedPassage {
   sentences: DependencyParsedSentence[];
 }
 
+/**
+ * 依存構造解析の列指向形式（scripts/passage_parse_store.py で生成）
+ * - 文ごとにトークンの並列配列を持ち、原形・品詞タグは表のインデックスで参照
+ * - 値なしは -1、トークンの text は原則として文字列 text[start:end]
+ */
+export interface ColumnarDependencyParsedSentence {
+  id?: number;
+  text: string;
+  offsets: number[];
+  lemma: number[];
+  upos: number[];
+  xpos: number[];
+  deprel: number[];
+  head: number[];
+  texts?: Record<string, string>;
+  ids?: number[];
+}
+
+export interface ColumnarDependencyParsedPassage {
+  passageId: string;
+  generatedAt?: string;
+  format: 'columnar';
+  version: number;
+  lemmas: string[];
+  upos: string[];
+  xpos: string[];
+  deprel: string[];
+  sentences: ColumnarDependencyParsedSentence[];
+}
+
 /**
  * 文データ
  */
@@ -38,4 +38,6 @@ export interface ReadingSegment {
   relatedWords?: string; // 関連語（熟語・派生語と読みと意味）
   relatedFields?: string; // 関連分野
   difficulty?: string; // 難易度（beginner/intermediate/advanced）
+  upos?: string; // UD品詞（passage-parses から結合した場合のみ）
+  xpos?: string; // Penn Treebank品詞（passage-parses から結合した場合のみ）
 }
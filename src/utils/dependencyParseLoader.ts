@@ -1,5 +1,10 @@
 import { logger } from '@/utils/logger';
-import type { DependencyParsedPassage, DependencyParsedSentence } from '@/types/passage';
+import type {
+  ColumnarDependencyParsedPassage,
+  DependencyParsedPassage,
+  DependencyParsedSentence,
+  DependencyToken,
+} from '@/types/passage';
 
 function normalizeSentenceKey(text: string): string {
   return text
@@ -8,6 +13,43 @@ function normalizeSentenceKey(text: string): string {
     .trim();
 }
 
+function isColumnarParse(
+  data: DependencyParsedPassage | ColumnarDependencyParsedPassage
+): data is ColumnarDependencyParsedPassage {
+  return (data as ColumnarDependencyParsedPassage).format === 'columnar';
+}
+
+/**
+ * 列指向形式の依存解析JSONを従来形式（トークンオブジェクトの配列）に展開
+ */
+export function decodeColumnarParse(data: ColumnarDependencyParsedPassage): DependencyParsedPassage {
+  const pick = (table: string[], code: number): string | undefined =>
+    code < 0 ? undefined : table[code];
+
+  return {
+    passageId: data.passageId,
+    generatedAt: data.generatedAt,
+    sentences: data.sentences.map((sentence) => {
+      const tokens: DependencyToken[] = sentence.head.map((head, i) => {
+        const start = sentence.offsets[2 * i];
+        const end = sentence.offsets[2 * i + 1];
+        return {
+          id: sentence.ids ? sentence.ids[i] : i + 1,
+          text: sentence.texts?.[String(i)] ?? sentence.text.slice(start, end),
+          lemma: pick(data.lemmas, sentence.lemma[i]),
+          upos: pick(data.upos, sentence.upos[i]),
+          xpos: pick(data.xpos, sentence.xpos[i]),
+          head: head < 0 ? undefined : head,
+          deprel: pick(data.deprel, sentence.deprel[i]),
+          start,
+          end,
+        };
+      });
+      return { id: sentence.id, text: sentence.text, tokens };
+    }),
+  };
+}
+
 export async function loadDependencyParsedPassage(
   passageId: string
 ): Promise<DependencyParsedPassage | null> {
@@ -16,7 +58,8 @@ export async function loadDependencyParsedPassage(
     if (!res.ok) {
       return null;
     }
-    return (await res.json()) as DependencyParsedPassage;
+    const data = (await res.json()) as DependencyParsedPassage | ColumnarDependencyParsedPassage;
+    return isColumnarParse(data) ? decodeColumnarParse(data) : data;
   } catch (err) {
     logger.warn(`[UD] Failed to load dependency parse for ${passageId}:`, err);
     return null;
@@ -0,0 +1,78 @@
+/**
+ * 文法単元JSONのテンプレート圧縮された explanation を展開
+ *
+ * 圧縮形式（scripts/explanation_templates.py）では explanation が
+ * 「段落文字列」と「[テンプレート番号, スロットの参照先フィールド...]」のリストになり、
+ * テンプレートは単元の explanationTemplates に一度だけ保存されます。
+ */
+
+type ExplanationPart = string | [number, ...string[]];
+
+type GrammarQuestionRecord = Record<string, unknown> & {
+  explanation?: string | ExplanationPart[];
+};
+
+type GrammarUnitRecord = Record<string, unknown> & {
+  explanationTemplates?: string[];
+  questions?: GrammarQuestionRecord[];
+};
+
+const PARAGRAPH_SEPARATOR = '\n\n';
+const PLACEHOLDER_RE = /\{\{|\}\}|\{(\d+)\}/g;
+
+function resolveSlot(question: GrammarQuestionRecord, ref: string): string {
+  const [field, index] = ref.split('.');
+  const value = question[field];
+  if (index !== undefined && Array.isArray(value)) {
+    return String(value[Number(index)] ?? '');
+  }
+  return String(value ?? '');
+}
+
+function renderTemplate(template: string, values: string[]): string {
+  return template.replace(PLACEHOLDER_RE, (match, slot?: string) =>
+    slot !== undefined ? values[Number(slot)] : match[0]
+  );
+}
+
+/**
+ * 圧縮形式の explanation を文字列に展開（文字列の場合はそのまま）
+ */
+export function expandGrammarExplanation(
+  question: GrammarQuestionRecord,
+  templates: string[]
+): string | undefined {
+  const parts = question.explanation;
+  if (!Array.isArray(parts)) {
+    return parts;
+  }
+  return parts
+    .map((part) => {
+      if (typeof part === 'string') return part;
+      const [number, ...refs] = part;
+      return renderTemplate(
+        templates[number] ?? '',
+        refs.map((ref) => resolveSlot(question, ref))
+      );
+    })
+    .join(PARAGRAPH_SEPARATOR);
+}
+
+/**
+ * テンプレート圧縮された単元を従来形式（explanation が文字列）に戻す
+ */
+export function expandGrammarUnit<T extends GrammarUnitRecord>(data: T): T {
+  const templates = data.explanationTemplates;
+  if (!Array.isArray(templates)) {
+    return data;
+  }
+  const { explanationTemplates: _templates, ...rest } = data;
+  return {
+    ...rest,
+    questions: (data.questions ?? []).map((question) =>
+      Array.isArray(question.explanation)
+        ? { ...question, explanation: expandGrammarExplanation(question, templates) }
+        : question
+    ),
+  } as unknown as T;
+}
@@ -416,6 +416,94 @@ export async function convertPassageToReadingFormat(
   return readingPassage;
 }
 
+type DictionaryShardManifest = {
+  sourceSha256: string;
+  shards: Record<string, { file: string; sha256: string; count: number }>;
+};
+
+// scripts/dictionary_shards.py の shard_for_key と同じ規則
+function shardForKey(key: string, shards: Record<string, unknown>): string {
+  const head = key.slice(0, 1).toLowerCase();
+  if (!(head >= 'a' && head <= 'z')) return '_';
+  const prefix = key.slice(0, 2).toLowerCase();
+  return prefix in shards ? prefix : head;
+}
+
+/**
+ * 共有辞書から必要なエントリだけを取得
+ * シャード（<辞書名>/manifest.json）の sourceSha256 がパッセージの記録した辞書ハッシュと
+ * 一致すれば該当シャードのみ、一致しない・シャードがなければ辞書全体を読み込む
+ */
+async function loadSharedDictionaryEntries(
+  dictionaryFile: string,
+  dictionarySha256: string | undefined,
+  keys: Set<string>
+): Promise<Record<string, unknown>> {
+  const shardBase = `/data/dictionaries/${dictionaryFile.replace(/\.json$/, '')}`;
+  const manifestRes = dictionarySha256 ? await fetch(`${shardBase}/manifest.json`) : null;
+  const manifest: DictionaryShardManifest | null = manifestRes?.ok
+    ? await manifestRes.json().catch(() => null)
+    : null;
+  if (manifest && manifest.sourceSha256 === dictionarySha256) {
+    const names = new Set([...keys].map((key) => shardForKey(key, manifest.shards)));
+    const shards = await Promise.all(
+      [...names]
+        .filter((name) => manifest.shards[name])
+        .map(async (name) => {
+          const res = await fetch(`${shardBase}/${manifest.shards[name].file}`);
+          return res.ok ? ((await res.json()) as Record<string, unknown>) : {};
+        })
+    );
+    return Object.assign({}, ...shards);
+  }
+
+  const res = await fetch(`/data/dictionaries/${dictionaryFile}`);
+  return res.ok ? await res.json() : {};
+}
+
+type NormalizedSegment = { word: string; key?: string; meaning?: unknown; isUnknown: boolean };
+
+/**
+ * 辞書参照形式（format: "normalized"）のフレーズ学習JSONを従来形式に復元
+ * セグメントの key を entries テーブル（なければ共有辞書）のエントリに置き換える
+ * scripts/phrase_json.py の denormalize_passage と同じ結果になる
+ */
+async function rehydratePhraseLearningJSON(data: any): Promise<any> {
+  if (data?.format !== 'normalized') return data;
+
+  const entries: Record<string, unknown> = data.entries ?? {};
+  let shared: Record<string, unknown> = {};
+  if (data.dictionary) {
+    const keys = new Set<string>();
+    for (const phrase of data.phrases || []) {
+      for (const segment of phrase.segments || []) {
+        if (segment.key !== undefined && !(segment.key in entries)) keys.add(segment.key);
+      }
+    }
+    shared = await loadSharedDictionaryEntries(data.dictionary, data.dictionarySha256, keys);
+  }
+
+  const {
+    format: _format,
+    dictionary: _dictionary,
+    dictionarySha256: _dictionarySha256,
+    entries: _entries,
+    ...rest
+  } = data;
+  return {
+    ...rest,
+    phrases: (data.phrases || []).map((phrase: any) => ({
+      ...phrase,
+      segments: (phrase.segments || []).map((segment: NormalizedSegment) => {
+        if ('meaning' in segment) return segment;
+        const { key, ...fields } = segment;
+        const meaning = key === undefined ? '' : (entries[key] ?? shared[key] ?? '');
+        return { ...fields, meaning };
+      }),
+    })),
+  };
+}
+
 /**
  * フレーズ学習用JSONファイルを読み込み（新形式）
  * public/data/passages-phrase-learning/*.json
@@ -440,7 +528,7 @@ export async function loadPhraseLearningJSON(passageId: string): Promise<Reading
       logger.log(`No phrase learning JSON found for ${passageId}, will use .txt conversion`);
       return null;
     }
-    const data = await response.json();
+    const data = await rehydratePhraseLearningJSON(await response.json());
     logger.log(
       `Loaded phrase learning JSON for ${passageId}, phrases: ${data.phrases?.length || 0}`
     );
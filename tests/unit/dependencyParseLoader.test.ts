@@ -2,8 +2,9 @@ import { describe, it, expect, vi, afterEach } from 'vitest';
 import {
   loadDependencyParsedPassage,
   findDependencySentenceByText,
+  decodeColumnarParse,
 } from '@/utils/dependencyParseLoader';
-import type { DependencyParsedPassage } from '@/types/passage';
+import type { ColumnarDependencyParsedPassage, DependencyParsedPassage } from '@/types/passage';
 
 type MockResponse = {
   ok: boolean;
@@ -73,4 +74,50 @@ describe('dependencyParseLoader', () => {
     expect(found).not.toBeNull();
     expect(found!.id).toBe(1);
   });
+
+  it('loadDependencyParsedPassage expands the columnar format into token objects', async () => {
+    const payload: ColumnarDependencyParsedPassage = {
+      passageId: 'x',
+      format: 'columnar',
+      version: 1,
+      lemmas: ['I', 'wake', 'up'],
+      upos: ['PRON', 'VERB', 'ADP'],
+      xpos: ['PRP', 'VBP', 'RP'],
+      deprel: ['nsubj', 'root', 'compound:prt'],
+      sentences: [
+        {
+          id: 1,
+          text: 'I wake up',
+          offsets: [0, 1, 2, 6, 7, 9],
+          lemma: [0, 1, 2],
+          upos: [0, 1, 2],
+          xpos: [0, 1, 2],
+          deprel: [0, 1, 2],
+          head: [2, 0, 2],
+        },
+      ],
+    };
+
+    const fetchMock = vi.fn(async (): Promise<MockResponse> => ({
+      ok: true,
+      json: async () => payload,
+    }));
+    // @ts-expect-error test override
+    globalThis.fetch = fetchMock;
+
+    const parsed = await loadDependencyParsedPassage('x');
+
+    expect(parsed).toEqual(decodeColumnarParse(payload));
+    expect(parsed!.sentences[0].tokens[1]).toEqual({
+      id: 2,
+      text: 'wake',
+      lemma: 'wake',
+      upos: 'VERB',
+      xpos: 'VBP',
+      head: 0,
+      deprel: 'root',
+      start: 2,
+      end: 6,
+    });
+  });
 });
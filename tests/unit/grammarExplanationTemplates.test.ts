@@ -0,0 +1,42 @@
+import { describe, it, expect } from 'vitest';
+import { expandGrammarUnit } from '@/utils/grammarExplanationTemplates';
+
+describe('grammarExplanationTemplates', () => {
+  it('expandGrammarUnit restores template-compressed explanations', () => {
+    const compact = {
+      unit: 0,
+      title: 'be動詞',
+      explanationTemplates: [
+        '✅ 【{0}】 ← 正解\n  ✓ 正解理由: 日本語訳「{1}」から、この形が適切です。\n\n' +
+          '❌ 【{2}】 ← 不正解\n  ✗ 不正解理由: 日本語訳「{1}」に合いません。',
+        '{{例}} 【{0}】',
+      ],
+      questions: [
+        {
+          japanese: '私は学生です。',
+          choices: ['am', 'is'],
+          correctAnswer: 'am',
+          explanation: ['主語Iにはamです。', [0, 'correctAnswer', 'japanese', 'choices.1'], [1, 'choices.0']],
+        },
+        { japanese: 'そのまま', explanation: '通常の解説' },
+      ],
+    };
+
+    const expanded = expandGrammarUnit(compact);
+
+    expect(expanded).not.toHaveProperty('explanationTemplates');
+    expect(expanded.questions[0].explanation).toBe(
+      '主語Iにはamです。\n\n' +
+        '✅ 【am】 ← 正解\n  ✓ 正解理由: 日本語訳「私は学生です。」から、この形が適切です。\n\n' +
+        '❌ 【is】 ← 不正解\n  ✗ 不正解理由: 日本語訳「私は学生です。」に合いません。\n\n' +
+        '{例} 【am】'
+    );
+    expect(expanded.questions[1].explanation).toBe('通常の解説');
+  });
+
+  it('expandGrammarUnit returns units without templates unchanged', () => {
+    const data = { unit: 1, questions: [{ explanation: '解説' }] };
+
+    expect(expandGrammarUnit(data)).toBe(data);
+  });
+});